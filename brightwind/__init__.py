@@ -1,7 +1,41 @@
-from .load.load import *
-from .analyse import correlation as correl
-from .analyse.analyse import *
-from .analyse.plot import *
-from .transform.transform import *
-from .export.export import *
-from . import datasets
+"""
+The public functions and classes of brightwind are imported from their modules the first time they are used, e.g.
+bw.load_csv imports brightwind.load.load, so that importing brightwind stays quick and heavy dependencies such as
+matplotlib, scipy and scikit-learn are only loaded by the parts of the library that need them.
+"""
+import importlib
+
+_MODULES = {
+    '.load.load': ['load_csv', 'load_campbell_scientific', 'load_excel', 'load_nrg_txt', 'load_brightdata',
+                   'BrightdataClient'],
+    '.analyse.analyse': ['concurrent_coverage', 'monthly_means', 'momm', 'distribution', 'distribution_by_wind_speed',
+                         'distribution_by_dir_sector', 'freq_table', 'time_continuity_gaps', 'coverage', 'basic_stats',
+                         'twelve_by_24', 'TI', 'SectorRatio', 'Shear'],
+    '.analyse.plot': ['plot_timeseries'],
+    '.transform.transform': ['average_data_by_period', 'StreamingAverager', 'TimePyramid', 'adjust_slope_offset',
+                             'apply_calibrations', 'scale_wind_speed', 'offset_wind_direction', 'selective_avg'],
+    '.export.export': ['export_tab_file'],
+}
+_ATTRIBUTES = {name: module for module, names in _MODULES.items() for name in names}
+_SUBMODULES = {'correl': '.analyse.correlation', 'datasets': '.datasets', 'load': '.load.load',
+               'analyse': '.analyse.analyse', 'transform': '.transform.transform', 'export': '.export.export',
+               'utils': '.utils.utils'}
+
+__all__ = list(_ATTRIBUTES) + ['correl', 'datasets']
+
+
+def __getattr__(name):
+    if name in _ATTRIBUTES:
+        value = getattr(importlib.import_module(_ATTRIBUTES[name], __name__), name)
+    elif name in _SUBMODULES:
+        module = importlib.import_module(_SUBMODULES[name], __name__)
+        # Subpackages such as bw.load are returned as the package, with their module loaded, as before.
+        value = module if name in ('correl', 'datasets') else importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -61,7 +61,7 @@ def calc_target_value_by_linear_model(ref_value: float, slope: float, offset: fl
     return (ref_value*slope) + offset
 
 
-def monthly_means(wdspds, return_data=False, return_coverage=False):
+def monthly_means(wdspds, return_data=False, return_coverage=False, pyramid=None):
     """
     Plots means for calendar months in a timeseries plot. Input can be a series or a dataframe. Can
     also return data of monthly means with a plot.
@@ -71,6 +71,9 @@ def monthly_means(wdspds, return_data=False, return_coverage=False):
     :type : bool
     :param return_coverage: To return monthly coverage along with the data and plot.
     :type : bool
+    :param pyramid: (Optional) A TimePyramid of wdspds to look the monthly means up in rather than resampling
+           wdspds, for when they are needed for the same data again and again.
+    :type pyramid: TimePyramid or None
     :return: A plot of monthly means for the input data. If return data is true it returns a tuple where
     the first element is plot and second is data pertaining to monthly means.
 
@@ -98,15 +101,24 @@ def monthly_means(wdspds, return_data=False, return_coverage=False):
     # if not isinstance(wdspds, list):
     #     wdspds = [wdspds]
     # data = tf.average_data_by_period(pd.concat(wdspds, axis=1, join='outer'), period='1MS')
-    data = tf.average_data_by_period(wdspds, period='1MS')
+    data = tf._pyramid_average(wdspds, period='1MS', pyramid=pyramid)
     if return_data and not return_coverage:
         return plt.plot_timeseries(data), data
     if return_coverage:
         return plt.plot_timeseries(data), \
-               pd.concat([data, coverage(wdspds, period='1M', aggregation_method='mean')], axis=1)
+               pd.concat([data, coverage(wdspds, period='1M', aggregation_method='mean', pyramid=pyramid)], axis=1)
     return plt.plot_timeseries(data)
 
 
+def _all_float32(data):
+    """
+    Returns True if all the columns of data are float32, e.g. loaded with compact=True, so statistics of the columns
+    can be returned as float32 rather than upcast.
+    """
+    dtypes = [data.dtype] if isinstance(data, pd.Series) else list(data.dtypes)
+    return len(dtypes) > 0 and all(dtype == np.float32 for dtype in dtypes)
+
+
 def _mean_of_monthly_means_basic_method(df: pd.DataFrame) -> pd.DataFrame:
     """
     Return a dataframe of mean of monthly means for each column in the dataframe with timestamp as the index.
@@ -117,7 +129,20 @@ def _mean_of_monthly_means_basic_method(df: pd.DataFrame) -> pd.DataFrame:
     return monthly_df
 
 
-def momm(data: pd.DataFrame, date_from: str='', date_to: str=''):
+def _mean_of_monthly_means_from_pyramid(pyramid) -> pd.DataFrame:
+    """
+    As _mean_of_monthly_means_basic_method but from the monthly sums and counts of a time pyramid of the data.
+    """
+    sums, counts = pyramid.average('1MS', 'sum'), pyramid.average('1MS', 'count')
+    if isinstance(sums, pd.Series):
+        sums, counts = sums.to_frame(), counts.to_frame()
+    monthly_df: pd.DataFrame = (sums.groupby(sums.index.month).sum() /
+                                counts.groupby(counts.index.month).sum()).mean().to_frame()
+    monthly_df.columns = ['MOMM']
+    return monthly_df
+
+
+def momm(data: pd.DataFrame, date_from: str='', date_to: str='', pyramid=None):
     """
     Calculates and returns long term reference speed. Accepts a dataframe
     with timestamps as index column and another column with wind-speed. You can also specify
@@ -125,14 +150,21 @@ def momm(data: pd.DataFrame, date_from: str='', date_to: str=''):
     :param: data: Pandas dataframe with timestamp as index and a column with wind-speed
     :param: date_from: Start date as string in format YYYY-MM-DD
     :param: date_to: End date as string in format YYYY-MM-DD
-    :returns: Long term reference speed
+    :param: pyramid: Optional TimePyramid of data with a 1MS level to take the monthly means from rather than
+            resampling data. Not used if date_from or date_to are set.
+    :returns: Long term reference speed, float32 if all of data is float32
     """
-    if isinstance(data, pd.Series):
-        momm_data = data.to_frame()
+    if pyramid is not None and not date_from and not date_to and pyramid.has_level('1MS'):
+        output = _mean_of_monthly_means_from_pyramid(pyramid)
     else:
-        momm_data = data.copy()
-    sliced_data = utils._slice_data(momm_data, date_from, date_to)
-    output = _mean_of_monthly_means_basic_method(sliced_data)
+        if isinstance(data, pd.Series):
+            momm_data = data.to_frame()
+        else:
+            momm_data = data.copy()
+        sliced_data = utils._slice_data(momm_data, date_from, date_to)
+        output = _mean_of_monthly_means_basic_method(sliced_data)
+    if _all_float32(data):
+        output = output.astype(np.float32)
     if output.shape == (1, 1):
         return output.values[0][0]
     return output
@@ -148,18 +180,6 @@ def _get_direction_bin_labels(sectors, direction_bins, zero_centred=True):
     return mapper.values()
 
 
-def _map_direction_bin(wdir, bins, sectors):
-    kwargs = {}
-    if wdir == max(bins):
-        kwargs['right'] = True
-    else:
-        kwargs['right'] = False
-    bin_num = np.digitize([wdir], bins, **kwargs)[0]
-    if bin_num == sectors+1:
-        bin_num = 1
-    return bin_num
-
-
 def distribution(var1_series, var2_series, var2_bin_array=np.arange(-0.5, 41, 1), var2_bin_labels=None,
                  aggregation_method='%frequency'):
     """
@@ -213,7 +233,14 @@ def _binned_direction_series(direction_series, sectors, direction_bin_array=None
     """
     if direction_bin_array is None:
         direction_bin_array = utils.get_direction_bin_array(sectors)
-    return direction_series.apply(_map_direction_bin, bins=direction_bin_array, sectors=sectors)
+    directions = direction_series.values
+    # A direction equal to the last bin edge, e.g. 360, falls in the last bin rather than beyond it.
+    bin_nums = np.where(directions == max(direction_bin_array),
+                        np.digitize(directions, direction_bin_array, right=True),
+                        np.digitize(directions, direction_bin_array))
+    # With the default bins the sector either side of 0 is split in two, so both halves are sector 1.
+    bin_nums[bin_nums == sectors+1] = 1
+    return pd.Series(bin_nums, index=direction_series.index, name=direction_series.name)
 
 
 def distribution_by_dir_sector(var_series, direction_series, sectors=12, aggregation_method='%frequency',
@@ -326,7 +353,7 @@ def time_continuity_gaps(data):
     return continuity[continuity['Days Lost'] != (tf._get_data_resolution(indexes) / pd.Timedelta('1 days'))]
 
 
-def coverage(data, period='1M', aggregation_method='mean'):
+def coverage(data, period='1M', aggregation_method='mean', pyramid=None):
     """
     Get the data coverage over the period specified
 
@@ -344,26 +371,33 @@ def coverage(data, period='1M', aggregation_method='mean'):
     :param aggregation_method: (Optional) Calculates mean of the data for the given averaging_prd by default. Can be
             changed to 'sum', 'std', 'max', 'min', etc. or a user defined function
     :type aggregation_method: str
+    :param pyramid: (Optional) A TimePyramid of data to look the coverage up in rather than resampling data, for
+            when it is needed for the same data again and again.
+    :type pyramid: TimePyramid or None
     :return: A dataframe with coverage and resolution of the new data. The columns with coverage are named as
-            <column name>_Coverage
+            <column name>_Coverage and are float32 for float32 columns, e.g. loaded with compact=True.
     """
 
-    return tf.average_data_by_period(data, period=period, aggregation_method=aggregation_method,
-                                     filter_by_coverage_threshold=False, return_coverage=True)[1]
+    return tf._keep_float32_dtypes(tf._pyramid_average(data, period=period, aggregation_method=aggregation_method,
+                                                       filter_by_coverage_threshold=False, return_coverage=True,
+                                                       pyramid=pyramid)[1],
+                                   data, by_position=True)
 
 
 def basic_stats(data):
     """
-    Gives basic statistics like mean, standard deviation, count, etc. of data,  excluding NaN values
+    Gives basic statistics like mean, standard deviation, count, etc. of data,  excluding NaN values. If all of data
+    is float32, e.g. loaded with compact=True, the statistics are float32 too.
 
     :param data: Meteorological data
     :type data: pandas.Series or pandas.DataFrame
     :rtype: A dataframe or series containing statistics
     """
     if isinstance(data, pd.DataFrame):
-        return data.describe(percentiles=[0.5]).T.drop(['50%'], axis=1)
+        stats = data.describe(percentiles=[0.5]).T.drop(['50%'], axis=1)
     else:
-        return data.to_frame().describe(percentiles=[0.5]).T.drop(['50%'], axis=1)
+        stats = data.to_frame().describe(percentiles=[0.5]).T.drop(['50%'], axis=1)
+    return stats.astype(np.float32) if _all_float32(data) else stats
 
 
 def twelve_by_24(var_series, aggregation_method='mean', return_data=False):
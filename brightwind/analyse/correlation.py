@@ -20,11 +20,7 @@ from typing import List
 from ..transform import transform as tf
 from ..utils import utils
 from ..analyse.plot import _scatter_plot
-from scipy.odr import ODR, RealData, Model
-from scipy.linalg import lstsq
 from ..analyse.analyse import momm, _binned_direction_series
-from sklearn.svm import SVR as sklearn_SVR
-from sklearn.model_selection import cross_val_score as sklearn_cross_val_score
 
 
 # def _preprocess_data_for_correlations(ref: pd.DataFrame, target: pd.DataFrame, averaging_prd, coverage_threshold):
@@ -163,6 +159,7 @@ class OrdinaryLeastSquares(CorrelBase):
         return 'Ordinary Least Squares Model' + str(self.params)
 
     def run(self):
+        from scipy.linalg import lstsq
         p, res = lstsq(np.nan_to_num(self.data['ref_spd'].values.flatten()[:, np.newaxis] ** [1, 0]),
                        np.nan_to_num(self.data['target_spd'].values.flatten()))[0:2]
 
@@ -209,6 +206,8 @@ class OrthogonalLeastSquares(CorrelBase):
         return 'Orthogonal Least Squares Model ' + str(self.params)
 
     def run(self):
+        from scipy.odr import ODR, RealData, Model
+        from scipy.linalg import lstsq
         fit_data = RealData(self.data['ref_spd'].values.flatten(), self.data['target_spd'].values.flatten())
         p, res = lstsq(np.nan_to_num(fit_data.x[:, np.newaxis] ** [1, 0]), np.nan_to_num(np.asarray(fit_data.y)
                                                                                          [:, np.newaxis]))[0:2]
@@ -248,6 +247,7 @@ class MultipleLinearRegression(CorrelBase):
         return 'Multiple Linear Regression Model ' + str(self.params)
 
     def run(self):
+        from scipy.linalg import lstsq
         p, res = lstsq(np.column_stack((self.data.iloc[:, :len(self.data.columns) - 1].values,
                                         np.ones(len(self.data)))), self.data['target_spd'].values.flatten())[0:2]
         self.params = {'slope': p[:-1], 'offset': p[-1]}
@@ -393,8 +393,7 @@ class SpeedSort(CorrelBase):
     def _adjust_low_reference_speed_dir(self):
         idxs = self.data[(self.data['ref_spd'] < 2) & (self.data['target_spd'] > (self.data['ref_spd'] + 4))].index
 
-        self.data.loc[idxs, 'ref_dir'] = (self.data.loc[idxs, 'target_dir'] - self.overall_veer).apply(
-            utils._range_0_to_360)
+        self.data.loc[idxs, 'ref_dir'] = utils._offset_direction(self.data.loc[idxs, 'target_dir'], -self.overall_veer)
 
     @staticmethod
     def _get_veer_cutoff(speed_col):
@@ -402,16 +401,7 @@ class SpeedSort(CorrelBase):
 
     @staticmethod
     def _get_veer(ref_d, target_d):
-        def change_range(veer):
-            if veer > 180:
-                return veer - 360.0
-            elif veer < -180:
-                return veer + 360.0
-            else:
-                return veer
-
-        v = target_d - ref_d
-        return v.apply(change_range)
+        return utils._direction_difference(target_d, ref_d)
 
     def _avg_veer(self, sector_data):
         sector_data = sector_data[(sector_data['ref_spd'] >= self.ref_veer_cutoff) & (sector_data['target_spd'] >=
@@ -475,7 +465,9 @@ class SpeedSort(CorrelBase):
             output = self._predict(tf.average_data_by_period(self.ref_spd, self.averaging_prd,
                                                              filter_by_coverage_threshold=False, return_coverage=False),
                                    tf.average_data_by_period(self.ref_dir, self.averaging_prd,
-                                                             filter_by_coverage_threshold=False, return_coverage=False))
+                                                             aggregation_method='vector_mean',
+                                                             filter_by_coverage_threshold=False, return_coverage=False,
+                                                             wind_speed=self.ref_spd))
             output = tf.average_data_by_period(self.target_spd, self.averaging_prd, filter_by_coverage_threshold=False,
                                                return_coverage=False).combine_first(output)
         else:
@@ -497,6 +489,7 @@ class SVR(CorrelBase):
     def __init__(self, ref_spd, target_spd, averaging_prd, coverage_threshold, bw_model=0, preprocess=True,
                  **sklearn_args):
         CorrelBase.__init__(self, ref_spd, target_spd, averaging_prd, coverage_threshold, preprocess=preprocess)
+        from sklearn.svm import SVR as sklearn_SVR
         bw_models = [{'kernel': 'rbf', 'C': 30, 'gamma': 0.01}, {'kernel': 'linear', 'C': 10}]
         self.model = sklearn_SVR(**{**bw_models[bw_model], **sklearn_args})
         self.params = 'not run yet'
@@ -505,6 +498,7 @@ class SVR(CorrelBase):
         return 'Support Vector Regression Model ' + str(self.params)
 
     def run(self):
+        from sklearn.model_selection import cross_val_score as sklearn_cross_val_score
         if len(self.data['ref_spd'].values.shape) == 1:
             x = self.data['ref_spd'].values.reshape(-1, 1)
         else:
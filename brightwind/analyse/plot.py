@@ -14,7 +14,6 @@
 #     You should have received a copy of the GNU Lesser General Public License
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import matplotlib.pyplot as plt
 import calendar
 import numpy as np
 import pandas as pd
@@ -24,7 +23,17 @@ import os
 
 __all__ = ['plot_timeseries']
 
-plt.style.use(os.path.join(os.path.dirname(__file__), 'bw.mplstyle'))
+
+def _pyplot():
+    """
+    Import matplotlib.pyplot and apply the brightwind style the first time a plot is made, rather than when brightwind
+    is imported, so scripts that don't plot don't pay for loading matplotlib.
+    """
+    import matplotlib.pyplot as plt
+    if not getattr(_pyplot, 'style_applied', False):
+        plt.style.use(os.path.join(os.path.dirname(__file__), 'bw.mplstyle'))
+        _pyplot.style_applied = True
+    return plt
 
 
 def bw_colors(bw_color):
@@ -61,11 +70,13 @@ def plot_timeseries(data, date_from='', date_to=''):
     :type date_to: str
     :return: Timeseries plot
     """
+    _pyplot()
     sliced_data = utils._slice_data(data, date_from, date_to)
     return sliced_data.plot().get_figure()
 
 
 def _scatter_plot(x, y, predicted_y=None, x_label="Reference", y_label="Target", title="", prediction_marker='k-'):
+    plt = _pyplot()
     fig, ax = plt.subplots()
     ax.set_xlabel(x_label)
     ax.set_ylabel(y_label)
@@ -82,6 +93,7 @@ def _scatter_plot(x, y, predicted_y=None, x_label="Reference", y_label="Target",
 def plot_freq_distribution(data, max_speed=30, plot_colors=[bw_colors('light_green_for_gradient'),
                                                             bw_colors('dark_green_for_gradient'),
                                                             bw_colors('darkgreen')]):
+    plt = _pyplot()
     from matplotlib.ticker import PercentFormatter
     fig = plt.figure(figsize=(15, 8))
     ax = fig.add_axes([0.1, 0.1, 0.8, 0.8])
@@ -109,6 +121,7 @@ def plot_wind_rose(ext_data, freq_table=False):
     """
     Plot a wind rose from a frequency table.
     """
+    plt = _pyplot()
     data = ext_data.copy()
     if freq_table:
         sectors = data.shape[1]
@@ -129,6 +142,7 @@ def plot_wind_rose(ext_data, freq_table=False):
 
 def plot_wind_rose_with_gradient(freq_table, gradient_colors=['#f5faea', '#d6ebad', '#b8dc6f',
                                                               '#9acd32', '#7ba428', '#5c7b1e'], percent_symbol=True):
+    plt = _pyplot()
     table = freq_table.copy()
     import matplotlib as mpl
     sectors = len(table.columns)
@@ -195,6 +209,7 @@ def plot_TI_by_speed(wdspd, wdspd_std, ti, IEC_class=None):
         This may need to be placed in a separate function when updated IEC standard is released
     :return: Plots turbulence intensity distribution by wind speed
     """
+    plt = _pyplot()
 
     # IEC Class 2005
 
@@ -225,6 +240,7 @@ def plot_TI_by_speed(wdspd, wdspd_std, ti, IEC_class=None):
 
 
 def plot_TI_by_sector(turbulence, wddir, ti):
+    plt = _pyplot()
     radians = np.radians(utils._get_dir_sector_mid_pts(ti.index))
     fig = plt.figure(figsize=(10, 10))
     ax = fig.add_axes([0.1, 0.1, 0.8, 0.8], polar=True)
@@ -244,6 +260,7 @@ def plot_TI_by_sector(turbulence, wddir, ti):
 
 
 def plot_shear_by_sector(shear, wddir, shear_dist):
+    plt = _pyplot()
     radians = np.radians(utils._get_dir_sector_mid_pts(shear_dist.index))
     fig = plt.figure(figsize=(10, 10))
     ax = fig.add_axes([0.1, 0.1, 0.8, 0.8], polar=True)
@@ -267,6 +284,7 @@ def plot_12x24_contours(tab_12x24, title='Variable'):
     :param title: Title of the plot
     :return: 12x24 figure
     """
+    plt = _pyplot()
 
     max_v = math.ceil(tab_12x24.max().max() * 100) / 100
     min_v = math.floor(tab_12x24.min().min() * 100) / 100
@@ -299,6 +317,7 @@ def plot_sector_ratio(sec_ratio, wddir, sec_ratio_dist, col_names, boom_dir_1=-1
     :param col_names: A list of strings containing column names of wind speeds
     :returns A speed ratio plot showing average speed ratio by sector and scatter of individual datapoints.
     """
+    plt = _pyplot()
     radians = np.radians(utils._get_dir_sector_mid_pts(sec_ratio_dist.index))
     fig = plt.figure(figsize=(10, 10))
     ax = fig.add_axes([0.1, 0.1, 0.8, 0.8], polar=True)
@@ -333,6 +352,7 @@ def plot_sector_ratio(sec_ratio, wddir, sec_ratio_dist, col_names, boom_dir_1=-1
 
 
 def plot_shear(avg_alpha, avg_c, wdspds, heights):
+    plt = _pyplot()
     plot_heights = np.linspace(0, max(heights), num=100)
     speeds = avg_c*(plot_heights**avg_alpha)
     fig, ax = plt.subplots()
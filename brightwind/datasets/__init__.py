@@ -8,11 +8,18 @@ shell_flats_80m_csv = bw.load_csv(bw.datasets.shell_flats_80m_csv)
 shell_flats_50m_csv = bw.load_csv(bw.datasets.shell_flats_50m_csv)
 shell_flats_merra = bw.load_csv(bw.datasets.shell_flats_merra)
 
+Or to get the loaded data directly, parsed only the first time it is used in the process:
+
+shell_flats_80m = bw.datasets.load_shell_flats_80m()
+demo_data = bw.datasets.load_demo_site_data()
+
 """
 import os
+import threading
 
 __all__ = ['demo_site_data', 'demo_merra2_NW', 'demo_merra2_NE', 'demo_merra2_SE', 'demo_merra2_SW',
-           'shell_flats_80m_csv', 'shell_flats_50m_csv', 'shell_flats_merra']
+           'shell_flats_80m_csv', 'shell_flats_50m_csv', 'shell_flats_merra', 'load_demo_site_data',
+           'load_demo_merra2', 'load_shell_flats_80m', 'load_shell_flats_50m', 'load_shell_flats_merra']
 
 shell_flats_80m_csv = os.path.join(os.path.dirname(__file__), 'offshore-CREYAP-2-data-pack', 'Shell_Flats_1_80mHAT.csv')
 shell_flats_50m_csv = os.path.join(os.path.dirname(__file__), 'offshore-CREYAP-2-data-pack', 'Shell_Flats_2_50mHAT.csv')
@@ -23,3 +30,100 @@ demo_merra2_NW = os.path.join(os.path.dirname(__file__), 'demo', 'MERRA-2_NW_200
 demo_merra2_NE = os.path.join(os.path.dirname(__file__), 'demo', 'MERRA-2_NE_2000-01-01_2017-06-30.csv')
 demo_merra2_SE = os.path.join(os.path.dirname(__file__), 'demo', 'MERRA-2_SE_2000-01-01_2017-06-30.csv')
 demo_merra2_SW = os.path.join(os.path.dirname(__file__), 'demo', 'MERRA-2_SW_2000-01-01_2017-06-30.csv')
+
+# Datasets already loaded in this process, keyed by file path and loader.
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def _cache_folder():
+    """
+    The folder the parsed datasets are cached in between processes. Set the BRIGHTWIND_DATASETS_CACHE environment
+    variable to change it.
+    """
+    return os.environ.get('BRIGHTWIND_DATASETS_CACHE',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'brightwind', 'datasets'))
+
+
+def _load_dataset(file_path, loader='load_csv', copy=True):
+    """
+    Return a dataset loaded with one of the brightwind loaders. The dataset is only loaded the first time it is asked
+    for in the process and kept in memory after that. The first load in a process reads the dataset from the binary
+    cache of the loader, see load_csv, so the csv file is only parsed once.
+
+    :param file_path: The path of the dataset.
+    :type file_path: str
+    :param loader: The name of the brightwind loader, e.g. 'load_csv' or 'load_campbell_scientific'.
+    :type loader: str
+    :param copy: Return a copy of the dataset so changes to it don't affect later calls.
+    :type copy: bool
+    :return: The dataset.
+    :rtype: pandas.DataFrame
+    """
+    from ..load import load
+    key = (file_path, loader)
+    with _datasets_lock:
+        if key not in _datasets:
+            _datasets[key] = getattr(load, loader)(file_path, cache_folder=_cache_folder())
+    return _datasets[key].copy() if copy else _datasets[key]
+
+
+def load_demo_site_data(copy=True):
+    """
+    Return the demo site data, a Campbell Scientific file, as a dataframe.
+
+    :param copy: If False, the dataframe kept in memory is returned rather than a copy of it. Quicker, but any changes
+           made to it will be seen by later calls.
+    :type copy: bool, default True
+    :rtype: pandas.DataFrame
+    """
+    return _load_dataset(demo_site_data, 'load_campbell_scientific', copy)
+
+
+def load_demo_merra2(location='NW', copy=True):
+    """
+    Return one of the four MERRA-2 datasets around the demo site as a dataframe.
+
+    :param location: Location of the MERRA-2 node relative to the site, one of 'NW', 'NE', 'SE' or 'SW'.
+    :type location: str, default 'NW'
+    :param copy: If False, the dataframe kept in memory is returned rather than a copy of it.
+    :type copy: bool, default True
+    :rtype: pandas.DataFrame
+    """
+    merra2_files = {'NW': demo_merra2_NW, 'NE': demo_merra2_NE, 'SE': demo_merra2_SE, 'SW': demo_merra2_SW}
+    if location not in merra2_files:
+        raise ValueError("location must be one of 'NW', 'NE', 'SE' or 'SW'.")
+    return _load_dataset(merra2_files[location], 'load_csv', copy)
+
+
+def load_shell_flats_80m(copy=True):
+    """
+    Return the Shell Flats 80m mast data from the CREYAP 2 data pack as a dataframe.
+
+    :param copy: If False, the dataframe kept in memory is returned rather than a copy of it.
+    :type copy: bool, default True
+    :rtype: pandas.DataFrame
+    """
+    return _load_dataset(shell_flats_80m_csv, 'load_csv', copy)
+
+
+def load_shell_flats_50m(copy=True):
+    """
+    Return the Shell Flats 50m mast data from the CREYAP 2 data pack as a dataframe.
+
+    :param copy: If False, the dataframe kept in memory is returned rather than a copy of it.
+    :type copy: bool, default True
+    :rtype: pandas.DataFrame
+    """
+    return _load_dataset(shell_flats_50m_csv, 'load_csv', copy)
+
+
+def load_shell_flats_merra(copy=True):
+    """
+    Return the MERRA data for Shell Flats from the CREYAP 2 data pack as a dataframe.
+
+    :param copy: If False, the dataframe kept in memory is returned rather than a copy of it.
+    :type copy: bool, default True
+    :rtype: pandas.DataFrame
+    """
+    return _load_dataset(shell_flats_merra, 'load_csv', copy)
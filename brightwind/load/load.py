@@ -15,14 +15,21 @@
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import pandas as pd
-import requests
+import numpy as np
 from typing import List, Dict
 import errno
 import os
 import shutil
 import json
+import hashlib
+import threading
+import io
 
-__all__ = ['load_csv', 'load_campbell_scientific', 'load_excel', 'load_brightdata']
+__all__ = ['load_csv', 'load_campbell_scientific', 'load_excel', 'load_nrg_txt', 'load_brightdata',
+           'BrightdataClient']
+
+_CACHE_SIZE_LIMIT = 2 * 1024 ** 3
+_BRIGHTDATA_URL = 'http://api.brightwindanalysis.com/brightdata'
 
 
 def _list_files(folder_path, file_type):
@@ -50,11 +57,573 @@ def _list_files(folder_path, file_type):
     return files_list
 
 
-def _assemble_df_from_folder(source_folder, file_type, function_to_get_df, print_progress=False, **kwargs):
+def _check_for_duplicate_timestamps(df):
+    """
+    Raise an error if any timestamp appears more than once in the index of the dataframe. This is done in a single
+    vectorized pass over the index rather than each time a file is appended.
+
+    :param df: The assembled dataframe with timestamps as it's index.
+    :type df: pandas.DataFrame
+    :return: None
+    """
+    duplicated = df.index.duplicated(keep=False)
+    if duplicated.any():
+        raise ValueError('Indexes have overlapping values: {0}'.format(df.index[duplicated].unique().tolist()))
+
+
+def _cache_key(filepath, function_to_get_df, **kwargs):
+    """
+    Return a key identifying a parsed file in the cache. The key is built from the full path, size and modified time
+    of the file along with the function and key word arguments used to read it, so any change to the file or to the
+    way it is read gives a new key.
+
+    :param filepath: The file to read.
+    :type filepath: str
+    :param function_to_get_df: The function used to read the file into a dataframe.
+    :type function_to_get_df: python function
+    :param kwargs: The key word arguments sent to function_to_get_df.
+    :return: A hex string to use as the name of the cache entry.
+    :rtype: str
+    """
+    file_stat = os.stat(filepath)
+    fingerprint = repr((os.path.abspath(filepath), file_stat.st_size, file_stat.st_mtime_ns,
+                        function_to_get_df.__name__, sorted(kwargs.items(), key=lambda item: item[0])))
+    return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+
+def _save_array(file_path, values):
+    """
+    Save an array to a .npy file. Numeric and datetime arrays are saved as raw binary so they can be memory-mapped when
+    read back, anything else is pickled.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'biufcmM':
+        np.save(file_path, values, allow_pickle=False)
+        return True
+    np.save(file_path, values.astype(object), allow_pickle=True)
+    return False
+
+
+def _load_array(file_path, mmap):
+    if mmap:
+        # copy-on-write so the dataframe can be changed without changing the cache
+        return np.load(file_path, mmap_mode='c')
+    return np.load(file_path, allow_pickle=True)
+
+
+def _json_attrs(attrs):
+    """
+    Return the items of a dataframe's attrs that can be stored as json, e.g. the site metadata of load_nrg_txt.
+    """
+    json_attrs = {}
+    for name, value in attrs.items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        json_attrs[name] = value
+    return json_attrs
+
+
+def _write_to_cache(cache_folder, key, df, extra_meta=None):
+    """
+    Write a dataframe to the cache as one .npy file per column plus the index and a json file describing them, along
+    with the attrs of the dataframe that can be stored as json. The entry is written to a temporary folder first and
+    then renamed so a partially written entry is never read.
+
+    :param cache_folder: The folder holding the cache.
+    :type cache_folder: str
+    :param key: The key returned by _cache_key.
+    :type key: str
+    :param df: The dataframe to store.
+    :type df: pandas.DataFrame
+    :param extra_meta: Extra json serializable information to store with the entry, see _read_cache_meta.
+    :type extra_meta: dict
+    :return: None
+    """
+    entry_folder = os.path.join(cache_folder, key)
+    temp_folder = entry_folder + '.tmp{0}'.format(os.getpid())
+    os.makedirs(temp_folder, exist_ok=True)
+    index = df.index
+    meta = {'index_name': index.name, 'index_tz': None, 'columns': [], 'extra': extra_meta,
+            'attrs': _json_attrs(df.attrs)}
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        meta['index_tz'] = str(index.tz)
+        index = index.tz_convert(None)
+    meta['index_mmap'] = _save_array(os.path.join(temp_folder, 'index.npy'), index.values)
+    for i, column in enumerate(df.columns):
+        is_category = str(df.iloc[:, i].dtype) == 'category'
+        values = df.iloc[:, i].astype(object).values if is_category else df.iloc[:, i].values
+        meta['columns'].append({'name': column, 'category': is_category,
+                                'mmap': _save_array(os.path.join(temp_folder, 'col_{0}.npy'.format(i)), values)})
+    with open(os.path.join(temp_folder, 'meta.json'), 'w') as file:
+        json.dump(meta, file)
+    try:
+        os.rename(temp_folder, entry_folder)
+    except OSError:
+        # another process wrote the same entry first
+        shutil.rmtree(temp_folder, ignore_errors=True)
+
+
+def _read_from_cache(cache_folder, key):
+    """
+    Read a dataframe back from the cache, memory-mapping the numeric columns. Each column is kept in its own block so
+    pandas doesn't copy them into memory when the dataframe is built. Returns None if the entry is not in the cache.
+
+    :param cache_folder: The folder holding the cache.
+    :type cache_folder: str
+    :param key: The key returned by _cache_key.
+    :type key: str
+    :return: The cached dataframe or None.
+    :rtype: pandas.DataFrame or None
+    """
+    entry_folder = os.path.join(cache_folder, key)
+    meta_file = os.path.join(entry_folder, 'meta.json')
+    try:
+        with open(meta_file, 'r') as file:
+            meta = json.load(file)
+        index_values = _load_array(os.path.join(entry_folder, 'index.npy'), meta['index_mmap'])
+        columns = [_load_array(os.path.join(entry_folder, 'col_{0}.npy'.format(i)), column['mmap'])
+                   for i, column in enumerate(meta['columns'])]
+    except (OSError, ValueError, KeyError):
+        return None
+    index = pd.Index(index_values, name=meta['index_name'])
+    if meta['index_tz'] is not None:
+        index = index.tz_localize('UTC').tz_convert(meta['index_tz'])
+    df = pd.DataFrame({i: pd.Categorical(values) if column['category'] else values
+                       for i, (values, column) in enumerate(zip(columns, meta['columns']))}, index=index, copy=False)
+    df.columns = [column['name'] for column in meta['columns']]
+    df.attrs.update(meta.get('attrs', {}))
+    # touch the entry so eviction removes the least recently used entries first
+    os.utime(meta_file, None)
+    return df
+
+
+def _read_cache_meta(cache_folder, key):
+    """
+    Return the extra_meta stored with an entry by _write_to_cache, or None if the entry is not in the cache.
+    """
+    try:
+        with open(os.path.join(cache_folder, key, 'meta.json'), 'r') as file:
+            return json.load(file).get('extra')
+    except (OSError, ValueError):
+        return None
+
+
+def _evict_from_cache(cache_folder, size_limit=_CACHE_SIZE_LIMIT):
+    """
+    Remove the least recently used entries from the cache until its total size is below size_limit.
+
+    :param cache_folder: The folder holding the cache.
+    :type cache_folder: str
+    :param size_limit: The maximum size of the cache in bytes.
+    :type size_limit: int
+    :return: None
+    """
+    entries = []
+    total_size = 0
+    for entry in os.listdir(cache_folder):
+        entry_folder = os.path.join(cache_folder, entry)
+        meta_file = os.path.join(entry_folder, 'meta.json')
+        if not os.path.isfile(meta_file):
+            continue
+        entry_size = sum(os.path.getsize(os.path.join(entry_folder, file)) for file in os.listdir(entry_folder))
+        entries.append((os.path.getmtime(meta_file), entry_size, entry_folder))
+        total_size += entry_size
+    for last_used, entry_size, entry_folder in sorted(entries):
+        if total_size <= size_limit:
+            break
+        shutil.rmtree(entry_folder, ignore_errors=True)
+        total_size -= entry_size
+
+
+def _read_file(filepath, function_to_get_df, cache_folder=None, **kwargs):
+    """
+    Read a file into a dataframe using function_to_get_df. If a cache_folder is given the parsed dataframe is taken
+    from the cache when the file has been read before with the same arguments, otherwise it is parsed and stored in
+    the cache.
+
+    :param filepath: The file to read.
+    :type filepath: str
+    :param function_to_get_df: The function to call to read the data file into a dataframe.
+    :type function_to_get_df: python function
+    :param cache_folder: The folder holding the cache. If None, no cache is used.
+    :type cache_folder: str or None
+    :param kwargs: All the kwargs that can be passed to function_to_get_df.
+    :return: A pandas dataframe.
+    :rtype: pandas.DataFrame
+    """
+    if cache_folder is None:
+        return function_to_get_df(filepath, **kwargs)
+    key = _cache_key(filepath, function_to_get_df, **kwargs)
+    df = _read_from_cache(cache_folder, key)
+    if df is None:
+        df = function_to_get_df(filepath, **kwargs)
+        os.makedirs(cache_folder, exist_ok=True)
+        _write_to_cache(cache_folder, key, df)
+    return df
+
+
+def _read_files(files_list, function_to_get_df, print_progress=False, workers=1, cache_folder=None,
+                cache_size_limit=_CACHE_SIZE_LIMIT, **kwargs):
+    """
+    Read each file in a list of files using a specific function, in a pool of processes if more than one worker is
+    requested. The dataframes are returned in the same order as files_list.
+
+    :param files_list: List of file names with the full folder path.
+    :type files_list: List[str]
+    :param function_to_get_df: The function to call to read each data file into a dataframe. Must be a module level
+           function so it can be sent to the worker processes.
+    :type function_to_get_df: python function
+    :param print_progress: If you want print out statements of the files been processed set to true. Default is False.
+    :type print_progress: bool, default False
+    :param workers: The number of processes used to read the files. If None, the number of processors on the machine
+           is used. Default is 1, i.e. the files are read one after the other.
+    :type workers: int or None, default 1
+    :param cache_folder: The folder to cache the parsed files in. If None, no cache is used.
+    :type cache_folder: str or None, default None
+    :param cache_size_limit: The maximum size of the cache in bytes.
+    :type cache_size_limit: int
+    :param kwargs: All the kwargs that can be passed to function_to_get_df.
+    :return: List of dataframes, one for each file.
+    :rtype: List[pandas.DataFrame]
+    """
+    df_list = []
+    if workers == 1 or len(files_list) < 2:
+        for file_name in files_list:
+            df_list.append(_read_file(file_name, function_to_get_df, cache_folder, **kwargs))
+            if print_progress:
+                print("{0} file read".format(file_name))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        read_fn = partial(_read_file, function_to_get_df=function_to_get_df, cache_folder=cache_folder, **kwargs)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for file_name, df in zip(files_list, executor.map(read_fn, files_list)):
+                df_list.append(df)
+                if print_progress:
+                    print("{0} file read".format(file_name))
+    if cache_folder is not None and os.path.isdir(cache_folder):
+        _evict_from_cache(cache_folder, cache_size_limit)
+    return df_list
+
+
+def _first_timestamp(filepath, function_to_get_df, **kwargs):
+    """
+    Return the first timestamp in a file by only reading the first row of data.
+    """
+    return function_to_get_df(filepath, **{**kwargs, 'nrows': 1}).index[0]
+
+
+def _stream_df_from_files(files_list, chunksize, function_to_get_df, print_progress=False, **kwargs):
+    """
+    Generator yielding the data in a list of files as time ordered dataframes of chunksize rows each. The files are
+    ordered by their first timestamp and read chunksize rows at a time so only one chunk is held in memory. Chunks
+    span file boundaries so every chunk, except the last, has exactly chunksize rows.
+
+    :param files_list: List of file names with the full folder path.
+    :type files_list: List[str]
+    :param chunksize: The number of rows in each chunk.
+    :type chunksize: int
+    :param function_to_get_df: The function to call to read each data file. It must accept the pandas chunksize
+           argument and return an iterator of dataframes.
+    :type function_to_get_df: python function
+    :param print_progress: If you want print out statements of the files been processed set to true. Default is False.
+    :type print_progress: bool, default False
+    :param kwargs: All the kwargs that can be passed to function_to_get_df.
+    :return: Generator of dataframes with timestamps as their index.
+    :rtype: Generator[pandas.DataFrame]
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize must be a positive integer.')
+    files_list = sorted(files_list, key=lambda file_name: _first_timestamp(file_name, function_to_get_df, **kwargs))
+    last_timestamp = None
+    leftover = None
+    for file_name in files_list:
+        for df in function_to_get_df(file_name, chunksize=chunksize, **kwargs):
+            if df.empty:
+                continue
+            if not df.index.is_monotonic_increasing or \
+                    (last_timestamp is not None and df.index[0] <= last_timestamp):
+                raise ValueError('Timestamps in {0} are duplicated or not in time order.'.format(file_name))
+            last_timestamp = df.index[-1]
+            if leftover is not None:
+                df = pd.concat([leftover, df], axis=0, sort=False)
+            start = 0
+            while len(df) - start >= chunksize:
+                yield df.iloc[start:start + chunksize]
+                start += chunksize
+            leftover = df.iloc[start:] if start < len(df) else None
+        if print_progress:
+            print("{0} file read".format(file_name))
+    if leftover is not None:
+        yield leftover
+
+
+def _file_hash(filepath, block_size=1024 * 1024):
+    """
+    Return the sha1 hash of the contents of a file, reading it in blocks.
+
+    :param filepath: The file to hash.
+    :type filepath: str
+    :param block_size: The number of bytes read at a time.
+    :type block_size: int
+    :return: The hex digest of the file contents.
+    :rtype: str
+    """
+    file_hash = hashlib.sha1()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+_STORE_MAX_SEGMENTS = 16
+
+
+def _assemble_df_incrementally(files_list, function_to_get_df, store_folder, print_progress=False, workers=1,
+                               **kwargs):
+    """
+    Assemble a dataframe from a list of files keeping the data already read in a store along with a manifest of the
+    files in it. Only files which are new or whose contents have changed since the last call are read.
+
+    The store is made of segments, each holding the files read in one call, so new files are added by writing one new
+    segment instead of rewriting the whole store. Files that have been removed or changed have their timestamp range
+    dropped from the segment holding them, and only that segment is rewritten. When there are more than
+    _STORE_MAX_SEGMENTS segments they are merged into one. Segments are always written under a new name before the
+    manifest is updated, so an interrupted call leaves the last store as it was.
+
+    The manifest records the path, size, modified time, hash, first and last timestamp and segment of each file. A
+    file whose size or modified time has changed is hashed to check if its contents really changed. If the arguments
+    used to read the files change the store is rebuilt.
+
+    :param files_list: List of file names with the full folder path.
+    :type files_list: List[str]
+    :param function_to_get_df: The function to call to read each data file into a dataframe.
+    :type function_to_get_df: python function
+    :param store_folder: The folder holding the segments and manifest.
+    :type store_folder: str
+    :param print_progress: If you want print out statements of the files been processed set to true. Default is False.
+    :type print_progress: bool, default False
+    :param workers: The number of processes used to read the new files. Default is 1.
+    :type workers: int or None, default 1
+    :param kwargs: All the kwargs that can be passed to function_to_get_df.
+    :return: A dataframe with timestamps as it's index
+    :rtype: pandas.DataFrame
+    """
+    manifest_file = os.path.join(store_folder, 'manifest.json')
+    reader = repr((function_to_get_df.__name__, sorted(kwargs.items(), key=lambda item: item[0])))
+    manifest = {'reader': reader, 'files': {}, 'next_segment': 0}
+    segments = {}
+    if os.path.isfile(manifest_file):
+        with open(manifest_file, 'r') as file:
+            stored_manifest = json.load(file)
+        manifest['next_segment'] = stored_manifest.get('next_segment', 0)
+        if stored_manifest.get('reader') == reader and \
+                all('segment' in entry for entry in stored_manifest['files'].values()):
+            segment_names = {entry['segment'] for entry in stored_manifest['files'].values()} - {None}
+            stored_segments = {name: _read_from_cache(store_folder, name) for name in segment_names}
+            if all(segment is not None for segment in stored_segments.values()):
+                manifest = stored_manifest
+                segments = stored_segments
+
+    entries = {}
+    files_to_read = []
+    for file_name in files_list:
+        path = os.path.abspath(file_name)
+        file_stat = os.stat(path)
+        entry = manifest['files'].get(path)
+        if entry is not None and entry['size'] == file_stat.st_size and entry['mtime'] == file_stat.st_mtime_ns:
+            entries[path] = entry
+            continue
+        file_hash = _file_hash(path)
+        if entry is not None and entry['hash'] == file_hash:
+            entries[path] = {**entry, 'size': file_stat.st_size, 'mtime': file_stat.st_mtime_ns}
+            continue
+        files_to_read.append(path)
+        entries[path] = {'size': file_stat.st_size, 'mtime': file_stat.st_mtime_ns, 'hash': file_hash}
+
+    changed_segments = set()
+    for path, entry in manifest['files'].items():
+        if (path in entries and path not in files_to_read) or entry['segment'] not in segments:
+            continue
+        segment = segments[entry['segment']]
+        segments[entry['segment']] = segment[(segment.index < pd.Timestamp(entry['first'])) |
+                                             (segment.index > pd.Timestamp(entry['last']))]
+        changed_segments.add(entry['segment'])
+
+    df_list = _read_files(files_to_read, function_to_get_df, print_progress, workers, **kwargs)
+    for path, df in zip(files_to_read, df_list):
+        entries[path]['first'] = str(df.index.min()) if len(df) else None
+        entries[path]['last'] = str(df.index.max()) if len(df) else None
+        entries[path]['segment'] = 'new' if len(df) else None
+    if print_progress and files_to_read:
+        print('Processed {0} new or changed files'.format(str(len(df_list))))
+    df_list = [df for df in df_list if len(df)]
+    if df_list:
+        segments['new'] = pd.concat(df_list, axis=0, sort=False)
+        changed_segments.add('new')
+    segments = {name: segment for name, segment in segments.items() if len(segment)}
+
+    if segments:
+        assembled_df = pd.concat(sorted(segments.values(), key=lambda segment: segment.index.min()), axis=0,
+                                 sort=False)
+        _check_for_duplicate_timestamps(assembled_df)
+        assembled_df = assembled_df.sort_index()
+    else:
+        assembled_df = pd.DataFrame()
+    if len(segments) > _STORE_MAX_SEGMENTS:
+        segments = {'merged': assembled_df}
+        changed_segments = {'merged'}
+        for entry in entries.values():
+            entry['segment'] = 'merged' if entry['segment'] is not None else None
+    if not changed_segments:
+        if manifest['files'] != entries:
+            manifest['files'] = entries
+            _write_manifest(manifest_file, manifest)
+        return assembled_df
+
+    os.makedirs(store_folder, exist_ok=True)
+    segment_names = {}
+    for name in sorted(changed_segments & set(segments)):
+        segment_names[name] = 'segment_{0}'.format(manifest['next_segment'])
+        manifest['next_segment'] += 1
+        shutil.rmtree(os.path.join(store_folder, segment_names[name]), ignore_errors=True)
+        _write_to_cache(store_folder, segment_names[name], segments[name])
+    for entry in entries.values():
+        if entry['segment'] not in segments:
+            entry['segment'] = None
+        entry['segment'] = segment_names.get(entry['segment'], entry['segment'])
+    manifest['files'] = entries
+    _write_manifest(manifest_file, manifest)
+    # remove the segments replaced, only once the manifest no longer refers to them
+    in_use = {entry['segment'] for entry in entries.values()}
+    for name in os.listdir(store_folder):
+        if name.startswith('segment_') and name not in in_use:
+            shutil.rmtree(os.path.join(store_folder, name), ignore_errors=True)
+    return assembled_df
+
+
+def _write_manifest(manifest_file, manifest):
+    temp_file = manifest_file + '.tmp'
+    with open(temp_file, 'w') as file:
+        json.dump(manifest, file, indent=1)
+    os.replace(temp_file, manifest_file)
+
+
+_TIME_INDEX_FILE = '.brightwind_time_index.json'
+
+
+def _file_time_range(filepath, function_to_get_df, **kwargs):
+    """
+    Return the first and last timestamp in a file. The first row is read with function_to_get_df and the last
+    timestamp is parsed from the tail of the file, so the file isn't read in full unless the tail can't be parsed, e.g.
+    for binary files. Returns (None, None) for a file with no data.
+    """
+    first_row = function_to_get_df(filepath, **{**kwargs, 'nrows': 1})
+    if len(first_row) == 0:
+        return None, None
+    first_timestamp = first_row.index[0]
+    last_field = _last_field_in_text_file(filepath)
+    timestamp_format = kwargs.get('timestamp_format')
+    last_timestamp = None
+    if last_field:
+        if timestamp_format is not None:
+            parsed = _try_timestamp_formats(pd.Index([last_field]), [timestamp_format])
+            last_timestamp = parsed[0] if parsed is not None else None
+        else:
+            last_timestamp = _last_timestamp_in_text_file(filepath, dayfirst=kwargs.get('dayfirst', False))
+    if last_timestamp is None or pd.isnull(last_timestamp) or last_timestamp < first_timestamp:
+        last_timestamp = function_to_get_df(filepath, **kwargs).index.max()
+    return first_timestamp, last_timestamp
+
+
+def _files_in_date_range(source_folder, files_list, function_to_get_df, date_from='', date_to='', **kwargs):
+    """
+    Return the files in files_list with data between date_from and date_to, so files outside the window don't need to
+    be read. The first and last timestamp of each file is kept in a small index file in source_folder, which is
+    updated for files that are new or whose size or modified time has changed. If the arguments used to read the
+    files change the index is rebuilt. If source_folder is read only the index is not saved.
+
+    :param source_folder: The folder the files are in.
+    :type source_folder: str
+    :param files_list: List of file names with the full folder path.
+    :type files_list: List[str]
+    :param function_to_get_df: The function to call to read each data file into a dataframe.
+    :type function_to_get_df: python function
+    :param date_from: Start of the window, inclusive. If '' there is no start.
+    :type date_from: str or datetime
+    :param date_to: End of the window, inclusive. If '' there is no end.
+    :type date_to: str or datetime
+    :param kwargs: All the kwargs that can be passed to function_to_get_df.
+    :return: The files with data in the window.
+    :rtype: List[str]
+    """
+    index_file = os.path.join(source_folder, _TIME_INDEX_FILE)
+    reader = repr((function_to_get_df.__name__, sorted(kwargs.items(), key=lambda item: item[0])))
+    time_index = {'reader': reader, 'files': {}}
+    if os.path.isfile(index_file):
+        try:
+            with open(index_file, 'r') as file:
+                stored_index = json.load(file)
+            if stored_index.get('reader') == reader:
+                time_index = stored_index
+        except ValueError:
+            pass
+
+    entries = {}
+    files_in_range = []
+    for file_name in files_list:
+        path = os.path.relpath(file_name, source_folder)
+        file_stat = os.stat(file_name)
+        entry = time_index['files'].get(path)
+        if entry is None or entry['size'] != file_stat.st_size or entry['mtime'] != file_stat.st_mtime_ns:
+            first_timestamp, last_timestamp = _file_time_range(file_name, function_to_get_df, **kwargs)
+            entry = {'size': file_stat.st_size, 'mtime': file_stat.st_mtime_ns,
+                     'first': None if first_timestamp is None else str(first_timestamp),
+                     'last': None if last_timestamp is None else str(last_timestamp)}
+        entries[path] = entry
+        if entry['first'] is None:
+            continue
+        if (date_from and pd.Timestamp(entry['last']) < pd.Timestamp(date_from)) or \
+                (date_to and pd.Timestamp(entry['first']) > pd.Timestamp(date_to)):
+            continue
+        files_in_range.append(file_name)
+
+    if entries != time_index['files']:
+        time_index['files'] = entries
+        try:
+            _write_manifest(index_file, time_index)
+        except OSError:
+            pass
+    return files_in_range
+
+
+def _slice_to_date_range(df, date_from='', date_to=''):
+    """
+    Return the rows of df with timestamps from date_from up to and including date_to. Either can be '' to leave that
+    end of the window open.
+    """
+    if not date_from and not date_to:
+        return df
+    in_range = np.ones(len(df), dtype=bool)
+    if date_from:
+        in_range &= df.index >= pd.Timestamp(date_from)
+    if date_to:
+        in_range &= df.index <= pd.Timestamp(date_to)
+    return df[in_range]
+
+
+def _assemble_df_from_folder(source_folder, file_type, function_to_get_df, print_progress=False, workers=1,
+                             cache_folder=None, store_folder=None, date_from='', date_to='',
+                             cache_size_limit=_CACHE_SIZE_LIMIT, **kwargs):
     """
     Assemble a dataframe from from multiple data files scattered in subfolders filtering for a
     specific list of file types and reading those files with a specific function.
 
+    The files are all read first, optionally in parallel, and then concatenated together once. Duplicate timestamps
+    are checked for after the concatenation.
+
     :param source_folder: Is the main folder to search through.
     :type source_folder: str
     :param file_type: Is a list of file extensions to filter for e.g. ['.csv', '.txt']
@@ -63,22 +632,89 @@ def _assemble_df_from_folder(source_folder, file_type, function_to_get_df, print
     :type function_to_get_df: python function
     :param print_progress: If you want print out statements of the files been processed set to true. Default is False.
     :type print_progress: bool, default False
+    :param workers: The number of processes used to read the files. If None, the number of processors on the machine
+           is used. Default is 1.
+    :type workers: int or None, default 1
+    :param cache_folder: The folder to cache the parsed files in. If None, no cache is used.
+    :type cache_folder: str or None, default None
+    :param store_folder: The folder to keep a consolidated store of the files already read in. If set, only new or
+           changed files are read, see _assemble_df_incrementally.
+    :type store_folder: str or None, default None
+    :param date_from: Only return data from this timestamp onwards. Files ending before it aren't read, see
+           _files_in_date_range. Not used to skip files when store_folder is set as the store holds the whole folder.
+    :type date_from: str or datetime, default ''
+    :param date_to: Only return data up to and including this timestamp. Files starting after it aren't read.
+    :type date_to: str or datetime, default ''
+    :param cache_size_limit: The maximum size of the cache in bytes.
+    :type cache_size_limit: int
     :param kwargs: All the kwargs that can be passed to this function.
     :return: A dataframe with timestamps as it's index
     :rtype: pandas.DataFrame
     """
     files_list = _list_files(source_folder, file_type)
-    ctr = 0
-    assembled_df = pd.DataFrame()
-    for file_name in files_list:
-        df = function_to_get_df(file_name, **kwargs)
-        assembled_df = assembled_df.append(df, verify_integrity=True)
-        if print_progress:
-            print("{0} file read and appended".format(file_name))
-        ctr = ctr + 1
+    if store_folder is not None:
+        return _slice_to_date_range(_assemble_df_incrementally(files_list, function_to_get_df, store_folder,
+                                                               print_progress, workers, **kwargs), date_from, date_to)
+    if date_from or date_to:
+        files_list = _files_in_date_range(source_folder, files_list, function_to_get_df, date_from, date_to, **kwargs)
+    df_list = _read_files(files_list, function_to_get_df, print_progress, workers, cache_folder, cache_size_limit,
+                          **kwargs)
+    if print_progress:
+        print('Processed {0} files'.format(str(len(df_list))))
+    if not df_list:
+        return pd.DataFrame()
+    assembled_df = pd.concat(df_list, axis=0, sort=False)
+    _check_for_duplicate_timestamps(assembled_df)
+    return _slice_to_date_range(assembled_df.sort_index(), date_from, date_to)
+
+
+def _compact_df(df, category_ratio=0.5):
+    """
+    Reduce the memory used by a dataframe. float64 columns are downcast to float32, integer columns to the smallest
+    integer type that holds their values and string columns with repeated values, e.g. status flags, are converted to
+    categoricals.
+
+    :param df: The dataframe to compact.
+    :type df: pandas.DataFrame
+    :param category_ratio: A string column is converted to a categorical if its number of unique values is less than
+           this fraction of its number of values.
+    :type category_ratio: float
+    :return: The compacted dataframe and a dataframe reporting the bytes used by each column before and after.
+    :rtype: (pandas.DataFrame, pandas.DataFrame)
+    """
+    report = pd.DataFrame(index=df.columns, columns=['Original Bytes', 'Compact Bytes', 'Saved Bytes'], dtype=np.int64)
+    compact_columns = []
+    for i, column in enumerate(df.columns):
+        series = df.iloc[:, i]
+        if series.dtype == np.float64:
+            compact_series = series.astype(np.float32)
+        elif series.dtype.kind in 'iu':
+            compact_series = pd.to_numeric(series, downcast='integer' if series.dtype.kind == 'i' else 'unsigned')
+        elif series.dtype == object and series.nunique() < category_ratio * series.count():
+            compact_series = series.astype('category')
+        else:
+            compact_series = series
+        compact_columns.append(compact_series)
+        report.iloc[i, :2] = [series.memory_usage(index=False, deep=True),
+                              compact_series.memory_usage(index=False, deep=True)]
+    report['Saved Bytes'] = report['Original Bytes'] - report['Compact Bytes']
+    compact_df = pd.concat(compact_columns, axis=1) if compact_columns else df.copy()
+    compact_df.columns = df.columns
+    compact_df.attrs = dict(df.attrs)
+    return compact_df, report
+
+
+def _load_compact(df, print_progress=False):
+    """
+    Compact a loaded dataframe with _compact_df, storing the report of the memory saved per column in
+    df.attrs['memory_saved'] and printing it if print_progress is True.
+    """
+    df, report = _compact_df(df)
+    df.attrs['memory_saved'] = report
     if print_progress:
-        print('Processed {0} files'.format(str(ctr)))
-    return assembled_df.sort_index()
+        print('Memory saved per column in bytes:')
+        print(report)
+    return df
 
 
 def _is_file(file_or_folder):
@@ -96,24 +732,177 @@ def _is_file(file_or_folder):
         raise FileNotFoundError("File or folder doesn't seem to exist.")
 
 
-def _pandas_read_csv(filepath, **kwargs):
+_TIMESTAMP_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S',
+                      '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S.%f', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M',
+                      '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M',
+                      '%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M',
+                      '%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%d/%m/%Y']
+_DIGIT_TIMESTAMP_FORMATS = {8: '%Y%m%d', 12: '%Y%m%d%H%M', 14: '%Y%m%d%H%M%S'}
+
+# Timestamp formats already detected, keyed by the file family, see _add_timestamp_format.
+_timestamp_formats = {}
+
+
+def _matching_timestamp_formats(timestamps, dayfirst=False):
+    """
+    Find the formats that match a sample of timestamps from a file, in order of preference. The formats are format
+    strings for datetime.strptime, or 'epoch_s', 'epoch_ms', 'epoch_us' or 'epoch_ns' for integer seconds,
+    milliseconds etc. since 1970-01-01. More than one format matches when the day and month are ambiguous, e.g.
+    01/02/2018, in which case month first is preferred as pandas does, or day first if dayfirst is True.
+    """
+    from datetime import datetime
+    timestamps = [str(timestamp).strip() for timestamp in timestamps if not pd.isnull(timestamp)]
+    if not timestamps:
+        return []
+    is_digits = all(timestamp.isdigit() for timestamp in timestamps)
+    if is_digits:
+        candidate_formats = [_DIGIT_TIMESTAMP_FORMATS[length] for length in {len(timestamp) for timestamp in timestamps}
+                             if length in _DIGIT_TIMESTAMP_FORMATS]
+        candidate_formats = candidate_formats if len(candidate_formats) == 1 else []
+    elif dayfirst:
+        candidate_formats = sorted(_TIMESTAMP_FORMATS, key=lambda timestamp_format: timestamp_format.startswith('%m'))
+    else:
+        candidate_formats = _TIMESTAMP_FORMATS
+    matching_formats = []
+    for timestamp_format in candidate_formats:
+        try:
+            for timestamp in timestamps:
+                datetime.strptime(timestamp, timestamp_format)
+            matching_formats.append(timestamp_format)
+        except ValueError:
+            continue
+    if is_digits and not matching_formats:
+        magnitude = int(timestamps[0])
+        units = [unit for unit, limit in [('s', 1e11), ('ms', 1e14), ('us', 1e17)] if magnitude < limit]
+        matching_formats.append('epoch_' + (units[0] if units else 'ns'))
+    return matching_formats
+
+
+def _infer_timestamp_format(timestamps, dayfirst=False):
+    """
+    Find the format of a sample of timestamps from a file, see _matching_timestamp_formats, or None if the format isn't
+    recognised.
+    """
+    matching_formats = _matching_timestamp_formats(timestamps, dayfirst)
+    return matching_formats[0] if matching_formats else None
+
+
+def _try_timestamp_formats(timestamps, timestamp_formats):
+    """
+    Convert an index of timestamps to a DatetimeIndex with the first of timestamp_formats they all match, or return
+    None if they don't match any of them.
+    """
+    for timestamp_format in timestamp_formats:
+        try:
+            if timestamp_format.startswith('epoch_'):
+                return pd.DatetimeIndex(pd.to_datetime(np.asarray(timestamps, dtype=np.int64),
+                                                       unit=timestamp_format[6:]), name=timestamps.name)
+            return pd.DatetimeIndex(pd.to_datetime(timestamps, format=timestamp_format), name=timestamps.name)
+        except (ValueError, TypeError, OverflowError):
+            continue
+    return None
+
+
+def _parse_timestamps(timestamps, timestamp_format, dayfirst=False):
+    """
+    Convert an index of timestamps to a DatetimeIndex using a format found by _infer_timestamp_format. If the
+    timestamps don't match the format, the other formats matching the first and last timestamps are tried, and
+    failing that pandas infers the format.
+    """
+    parsed = _try_timestamp_formats(timestamps, [timestamp_format])
+    if parsed is None:
+        parsed = _try_timestamp_formats(timestamps, _matching_timestamp_formats(list(timestamps[:20]) +
+                                                                                list(timestamps[-1:]), dayfirst))
+    if parsed is None:
+        parsed = pd.DatetimeIndex(pd.to_datetime(timestamps, dayfirst=dayfirst), name=timestamps.name)
+    return parsed
+
+
+def _parse_timestamp_index(df, timestamp_format, dayfirst=False):
+    df.index = _parse_timestamps(df.index, timestamp_format, dayfirst)
+    return df
+
+
+def _detect_timestamp_format(filepath, function_to_get_df, **kwargs):
+    """
+    Detect the timestamp format of a file by reading its first rows, and the last row, without parsing the
+    timestamps. If the day and month are still ambiguous, the timestamp column of the whole file is read to find the
+    format that matches all of it.
+
+    :return: The timestamp format, see _matching_timestamp_formats, or None if the file's index isn't parsed from text
+             or the format isn't recognised.
+    :rtype: str or None
+    """
+    kwargs = {**kwargs, 'timestamp_format': None, 'parse_dates': False}
+    sample = function_to_get_df(filepath, **{**kwargs, 'nrows': 20})
+    if isinstance(sample.index, pd.DatetimeIndex):
+        return None
+    matching_formats = _matching_timestamp_formats(list(sample.index) + [_last_field_in_text_file(filepath)],
+                                                   kwargs.get('dayfirst', False))
+    if len(matching_formats) > 1:
+        timestamps = function_to_get_df(filepath, **{**kwargs, 'usecols': [0]}).index
+        for timestamp_format in matching_formats:
+            if _try_timestamp_formats(timestamps, [timestamp_format]) is not None:
+                return timestamp_format
+    return matching_formats[0] if matching_formats else None
+
+
+def _add_timestamp_format(files_list, function_to_get_df, timestamp_format, fn_arguments):
+    """
+    Add the timestamp format to the arguments for function_to_get_df so every file is parsed with an explicit format
+    rather than pandas inferring it row by row. The format is only used when the timestamps are the first column and
+    parse_dates is True.
+
+    If timestamp_format is None it is detected from the first file and remembered for the file family, i.e. files in
+    the same folder with the same first line, e.g. the same column headings or logger details, read by the same
+    function with the same arguments, so later loads don't detect it again. Day first formats are preferred for
+    ambiguous timestamps if dayfirst is set, and a date_parser sent is always used instead.
+    """
+    if fn_arguments.get('parse_dates', True) is not True or fn_arguments.get('index_col', 0) != 0 or \
+            fn_arguments.get('date_parser') is not None:
+        return fn_arguments
+    if timestamp_format is None and files_list:
+        with open(files_list[0], 'rb') as file:
+            first_line = file.readline(1024)
+        family = (function_to_get_df.__name__, os.path.dirname(os.path.abspath(files_list[0])), first_line,
+                  repr(sorted(fn_arguments.items(), key=lambda item: item[0])))
+        if family not in _timestamp_formats:
+            _timestamp_formats[family] = _detect_timestamp_format(files_list[0], function_to_get_df, **fn_arguments)
+        timestamp_format = _timestamp_formats[family]
+    return {**fn_arguments, 'timestamp_format': timestamp_format}
+
+
+def _pandas_read_csv(filepath, timestamp_format=None, **kwargs):
     """
     Wrapper function around the Pandas read_csv function.
     :param filepath: The file to read.
     :type filepath: str
+    :param timestamp_format: The format of the timestamps in the first column, see _infer_timestamp_format. If None
+           the timestamps are parsed as set by parse_dates.
+    :type timestamp_format: str or None
     :param kwargs: Extra key word arguments to be applied.
     :return: A pandas dataframe.
     :rtype: pandas.DataFrame
     """
+    if timestamp_format is not None:
+        kwargs['parse_dates'] = False
     try:
-        return pd.read_csv(filepath, **kwargs)
+        df = pd.read_csv(filepath, **kwargs)
     except FileNotFoundError:
         raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), filepath)
     except Exception as error:
         raise error
+    if timestamp_format is None:
+        return df
+    dayfirst = kwargs.get('dayfirst', False)
+    if isinstance(df, pd.DataFrame):
+        return _parse_timestamp_index(df, timestamp_format, dayfirst)
+    return (_parse_timestamp_index(chunk, timestamp_format, dayfirst) for chunk in df)
 
 
-def load_csv(filepath_or_folder, search_by_file_type=['.csv'], print_progress=False, **kwargs):
+def load_csv(filepath_or_folder, search_by_file_type=['.csv'], print_progress=False, workers=1, cache_folder=None,
+             store_folder=None, compact=False, timestamp_format=None, date_from='', date_to='',
+             cache_size_limit=_CACHE_SIZE_LIMIT, **kwargs):
     """
     Load timeseries data from a csv file, or group of files in a folder, into a dataframe.
     The format of the csv file should be column headings in the first row with the timestamp column as the first
@@ -127,6 +916,39 @@ def load_csv(filepath_or_folder, search_by_file_type=['.csv'], print_progress=Fa
     :type search_by_file_type: List[str], default .csv
     :param print_progress: If you want to print out statements of the file been processed set to True. Default is False.
     :type print_progress: bool, default False
+    :param workers: The number of processes used to read the files when a folder is sent. If None, the number of
+           processors on the machine is used. Default is 1.
+    :type workers: int or None, default 1
+    :param cache_folder: (Optional) A folder to cache the parsed files in. When a file is loaded again with the same
+           arguments, and it hasn't changed, the data is memory-mapped from the cache instead of being parsed. When a
+           single file is sent the numeric columns of the returned dataframe stay memory-mapped, copy-on-write, until
+           they are changed, when a folder is sent the files are copied into memory as they are joined together.
+    :type cache_folder: str or None, default None
+    :param cache_size_limit: (Optional) The maximum size of the cache in bytes. The least recently used entries are
+           removed when the cache grows over this. Default is 2 GB.
+    :type cache_size_limit: int
+    :param store_folder: (Optional) When a folder is sent, a folder to keep a consolidated store of the data along
+           with a manifest of the files already loaded. Each call then only reads files which are new or have changed
+           since the last call, which suits folders that have a new file added each day.
+    :type store_folder: str or None, default None
+    :param compact: (Optional) If True, reduce the memory used by the dataframe by downcasting measurement channels
+           to float32, integers to the smallest type that holds them and repeated strings, e.g. status flags, to
+           categoricals. The bytes saved per column are stored in df.attrs['memory_saved'] and printed if
+           print_progress is True.
+    :type compact: bool, default False
+    :param timestamp_format: (Optional) The format of the timestamps, e.g. '%d/%m/%Y %H:%M', or 'epoch_s' for
+           seconds since 1970-01-01. If None, the format is detected from the first rows of the first file and every
+           file is then parsed with it, which is much faster than pandas inferring the format row by row. The format
+           used is stored in df.attrs['timestamp_format'].
+    :type timestamp_format: str or None, default None
+    :param date_from: (Optional) Only load data from this date onwards, e.g. '2018-01-01'. When a folder is sent,
+           files that end before it aren't read. The first and last timestamp of each file are kept in a small index
+           file, '.brightwind_time_index.json', created in the folder the first time it is loaded with date_from or
+           date_to set, so each file is only checked once. No index file is created when a single file is sent.
+    :type date_from: str or datetime, default ''
+    :param date_to: (Optional) Only load data up to and including this timestamp, e.g. '2018-12-31 23:50'. When a
+           folder is sent, files that start after it aren't read.
+    :type date_to: str or datetime, default ''
     :param kwargs: All the kwargs from pandas.read_csv can be passed to this function.
     :return: A dataframe with timestamps as it's index.
     :rtype: pandas.DataFrame
@@ -146,6 +968,18 @@ def load_csv(filepath_or_folder, search_by_file_type=['.csv'], print_progress=Fa
         folder = r'C:\\some\\folder\\with\\txt\\files'
         df = bw.load_csv(folder, search_by_file_type=['.txt'], print_progress=True)
 
+    To parse the files only the first time they are loaded and read them from a binary cache afterwards::
+
+        df = bw.load_csv(folder, cache_folder=r'C:\\some\\folder\\for\\the\\cache')
+
+    To only read the files with data in 2018 from a folder of several years of data::
+
+        df = bw.load_csv(folder, date_from='2018-01-01', date_to='2018-12-31 23:59')
+
+    To only read the files added to the folder since the last time it was loaded::
+
+        df = bw.load_csv(folder, store_folder=r'C:\\some\\folder\\for\\the\\store')
+
     If you want to load something that is different from a standard file where the column headings are not in the first
     row, the pandas.read_csv key word arguments (kwargs) can be used::
 
@@ -155,28 +989,211 @@ def load_csv(filepath_or_folder, search_by_file_type=['.csv'], print_progress=Fa
 
     is_file = _is_file(filepath_or_folder)
     fn_arguments = {'header': 0, 'index_col': 0, 'parse_dates': True}
-    merged_fn_args = {**fn_arguments, **kwargs}
+    files_list = [filepath_or_folder] if is_file else _list_files(filepath_or_folder, search_by_file_type)
+    merged_fn_args = _add_timestamp_format(files_list, _pandas_read_csv, timestamp_format, {**fn_arguments, **kwargs})
     if is_file:
-        return _pandas_read_csv(filepath_or_folder, **merged_fn_args)
-    elif not is_file:
-        return _assemble_df_from_folder(filepath_or_folder, search_by_file_type, _pandas_read_csv, print_progress,
-                                        **merged_fn_args)
+        df = _read_files([filepath_or_folder], _pandas_read_csv, cache_folder=cache_folder,
+                         cache_size_limit=cache_size_limit, **merged_fn_args)[0]
+        df = _slice_to_date_range(df, date_from, date_to)
+    else:
+        df = _assemble_df_from_folder(filepath_or_folder, search_by_file_type, _pandas_read_csv, print_progress,
+                                      workers, cache_folder, store_folder, date_from, date_to, cache_size_limit,
+                                      **merged_fn_args)
+    df.attrs['timestamp_format'] = merged_fn_args.get('timestamp_format')
+    if compact:
+        df = _load_compact(df, print_progress)
+    return df
+
+
+_TOB1_DTYPES = {'IEEE4': '<f4', 'IEEE4L': '<f4', 'IEEE8': '<f8', 'IEEE8L': '<f8', 'FP2': '>u2', 'ULONG': '<u4',
+                'LONG': '<i4', 'UINT2': '<u2', 'UINT4': '<u4', 'INT2': '<i2', 'INT4': '<i4', 'BOOL': '<i4',
+                'BOOL2': '<i2', 'BOOL4': '<i4', 'BOOL8': 'u1',
+                'SecNano': [('seconds', '<u4'), ('nanoseconds', '<u4')]}
+
+
+def _decode_fp2(raw):
+    """
+    Decode Campbell Scientific FP2 values to float. FP2 is a 2 byte big-endian format where bit 15 is the sign, bits
+    14 and 13 are a negative decimal exponent and the remaining 13 bits are the mantissa.
+
+    :param raw: Array of FP2 values.
+    :type raw: numpy.array
+    :return: Array of floats.
+    :rtype: numpy.array
+    """
+    raw = np.asarray(raw, dtype=np.uint16)
+    mantissa = (raw & 0x1FFF).astype(np.float32)
+    exponent = (raw >> 13) & 0x3
+    values = np.where(raw & 0x8000, -mantissa, mantissa) / np.array([1, 10, 100, 1000], dtype=np.float32)[exponent]
+    values[raw == 0x1FFF] = np.inf
+    values[raw == 0x9FFF] = -np.inf
+    values[raw == 0x9FFE] = np.nan
+    return values
+
+
+def _read_tob1_header(file):
+    """
+    Read the five ASCII header lines of a TOB1 file and return the field names, field data types and the number of
+    bytes taken up by the header.
+    """
+    import csv
+    header = [next(csv.reader([file.readline().decode('ascii').strip()])) for _ in range(5)]
+    if header[0][0] != 'TOB1':
+        raise TypeError('{0} is not a TOB1 file.'.format(file.name))
+    return header[1], header[4], file.tell()
 
 
-def load_campbell_scientific(filepath_or_folder, print_progress=False, **kwargs):
+def _tob1_timestamps(seconds, nanoseconds):
+    """
+    Convert the seconds and nanoseconds since 1990 of TOB1 timestamps to an array of datetime64.
+    """
+    nanoseconds = np.asarray(seconds).astype(np.int64) * 1000000000 + np.asarray(nanoseconds).astype(np.int64)
+    return (pd.Timestamp('1990-01-01') + pd.to_timedelta(nanoseconds, unit='ns')).values
+
+
+def _read_tob1(filepath, nrows=None, chunksize=None, **kwargs):
+    """
+    Read a Campbell Scientific TOB1 binary file into a dataframe. The ASCII header is decoded into a numpy structured
+    dtype and the records are memory-mapped, so no text parsing is done. The SECONDS and NANOSECONDS fields are
+    converted to a 'TIMESTAMP' index, FP2 fields are decoded to float and 8 byte SecNano fields to timestamps, giving
+    the same layout as a TOA5 file loaded by load_campbell_scientific.
+
+    :param filepath: The file to read.
+    :type filepath: str
+    :param nrows: Number of records to read from the start of the file.
+    :type nrows: int
+    :param chunksize: If set, return an iterator of dataframes of chunksize records each.
+    :type chunksize: int
+    :param kwargs: Key word arguments meant for pandas.read_csv are ignored.
+    :return: A dataframe with timestamps as it's index or an iterator of dataframes if chunksize is set.
+    :rtype: pandas.DataFrame
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            field_names, field_types, header_size = _read_tob1_header(file)
+    except FileNotFoundError:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), filepath)
+    dtype = []
+    for name, field_type in zip(field_names, field_types):
+        if field_type.startswith('ASCII('):
+            dtype.append((name, 'S' + field_type[6:-1]))
+        elif field_type in _TOB1_DTYPES:
+            dtype.append((name, _TOB1_DTYPES[field_type]))
+        else:
+            raise TypeError('TOB1 data type {0} of field {1} is not supported.'.format(field_type, name))
+    dtype = np.dtype(dtype)
+    num_records = (os.path.getsize(filepath) - header_size) // dtype.itemsize
+    if nrows is not None:
+        num_records = min(num_records, nrows)
+    if num_records == 0:
+        records = np.zeros(0, dtype=dtype)
+    else:
+        records = np.memmap(filepath, dtype=dtype, mode='r', offset=header_size, shape=(num_records,))
+
+    def _records_to_df(records):
+        columns = {}
+        index = None
+        for name, field_type in zip(field_names, field_types):
+            if name == 'SECONDS':
+                index = _tob1_timestamps(records['SECONDS'],
+                                         records['NANOSECONDS'] if 'NANOSECONDS' in field_names else 0)
+            elif name == 'NANOSECONDS':
+                continue
+            elif field_type == 'FP2':
+                columns[name] = _decode_fp2(records[name])
+            elif field_type == 'SecNano':
+                columns[name] = _tob1_timestamps(records[name]['seconds'], records[name]['nanoseconds'])
+            elif field_type.startswith('ASCII('):
+                columns[name] = np.char.decode(np.char.rstrip(records[name], b'\x00'), 'ascii')
+            else:
+                columns[name] = records[name].astype(records[name].dtype.newbyteorder('='))
+        if index is None:
+            return pd.DataFrame(columns, columns=list(columns))
+        index = pd.DatetimeIndex(index, name='TIMESTAMP')
+        return pd.DataFrame(columns, index=index, columns=list(columns))
+
+    if chunksize is not None:
+        return (_records_to_df(records[start:start + chunksize]) for start in range(0, num_records, chunksize))
+    return _records_to_df(records)
+
+
+def _read_campbell_scientific(filepath, **kwargs):
+    """
+    Read a Campbell Scientific file into a dataframe. TOB1 binary files are read with _read_tob1 and anything else,
+    e.g. TOA5 text files, with pandas.read_csv.
+
+    :param filepath: The file to read.
+    :type filepath: str
+    :param kwargs: Extra key word arguments to be applied to pandas.read_csv.
+    :return: A pandas dataframe.
+    :rtype: pandas.DataFrame
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            is_tob1 = file.read(6) == b'"TOB1"'
+    except FileNotFoundError:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), filepath)
+    if is_tob1:
+        return _read_tob1(filepath, **kwargs)
+    return _pandas_read_csv(filepath, **kwargs)
+
+
+def load_campbell_scientific(filepath_or_folder, print_progress=False, workers=1, cache_folder=None, chunksize=None,
+                             store_folder=None, compact=False, timestamp_format=None, date_from='', date_to='',
+                             calibrations=None, cache_size_limit=_CACHE_SIZE_LIMIT, **kwargs):
     """
     Load timeseries data from Campbell Scientific CR1000 formatted file, or group of files in a folder, into a
     dataframe. If the file format is slightly different your own key word arguments can be sent as this is a wrapper
     around the pandas.read_csv function. The pandas.read_csv documentation can be found at:
     https://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_csv.html
 
+    TOB1 binary files are also supported. These are identified from their header and read directly into the same
+    dataframe layout as the TOA5 text files without any text parsing. The pandas.read_csv key word arguments are not
+    used for TOB1 files.
+
     :param filepath_or_folder: Location of the file folder containing the timeseries data.
     :type filepath_or_folder: str
     :param print_progress: If you want to print out statements of the file been processed set to True. Default is False.
     :type print_progress: bool, default False
+    :param workers: The number of processes used to read the files when a folder is sent. If None, the number of
+           processors on the machine is used. Default is 1.
+    :type workers: int or None, default 1
+    :param cache_folder: (Optional) A folder to cache the parsed files in. When a file is loaded again with the same
+           arguments, and it hasn't changed, the data is memory-mapped from the cache instead of being parsed. When a
+           single file is sent the numeric columns of the returned dataframe stay memory-mapped, copy-on-write, until
+           they are changed, when a folder is sent the files are copied into memory as they are joined together.
+    :type cache_folder: str or None, default None
+    :param cache_size_limit: (Optional) The maximum size of the cache in bytes. The least recently used entries are
+           removed when the cache grows over this. Default is 2 GB.
+    :type cache_size_limit: int
+    :param chunksize: (Optional) If set, a generator is returned instead of a dataframe. It yields time ordered
+           dataframes of chunksize rows each across all the files in the folder, so the data can be processed without
+           loading it all into memory. workers and cache_folder are not used in this mode.
+    :type chunksize: int or None, default None
+    :param store_folder: (Optional) When a folder is sent, a folder to keep a consolidated store of the data along
+           with a manifest of the files already loaded. Each call then only reads files which are new or have changed
+           since the last call, which suits folders that have a new file added each day.
+    :type store_folder: str or None, default None
+    :param compact: (Optional) If True, reduce the memory used by the dataframe by downcasting measurement channels
+           to float32, integers to the smallest type that holds them and repeated strings, e.g. status flags, to
+           categoricals. The bytes saved per column are stored in df.attrs['memory_saved'] and printed if
+           print_progress is True.
+    :type compact: bool, default False
+    :param timestamp_format: (Optional) The format of the timestamps in text files, see load_csv. If None, it is
+           detected from the first file. The format used is stored in df.attrs['timestamp_format'].
+    :type timestamp_format: str or None, default None
+    :param date_from: (Optional) Only load data from this date onwards. When a folder is sent, files that end before
+           it aren't read, see load_csv.
+    :type date_from: str or datetime, default ''
+    :param date_to: (Optional) Only load data up to and including this timestamp. When a folder is sent, files that
+           start after it aren't read. With chunksize set, the first and last chunks of the window may be shorter.
+    :type date_to: str or datetime, default ''
+    :param calibrations: (Optional) A table of calibrations to adjust the wind speeds with as they are loaded, see
+           apply_calibrations. With chunksize set, they are applied to each chunk.
+    :type calibrations: pandas.DataFrame or list or None, default None
     :param kwargs: All the kwargs from pandas.read_csv can be passed to this function.
-    :return: A dataframe with timestamps as it's index
-    :rtype: pandas.DataFrame
+    :return: A dataframe with timestamps as it's index or, if chunksize is set, a generator of dataframes.
+    :rtype: pandas.DataFrame or Generator[pandas.DataFrame]
 
     When assembling files from folders into a single dataframe with timestamp as the index it automatically checks for
     duplicates and throws an error if any found.
@@ -192,16 +1209,49 @@ def load_campbell_scientific(filepath_or_folder, print_progress=False, **kwargs)
 
         folder = r'C:\\some\\folder\\with\\CR1000\\files'
         df = bw.load_campbell_scientific(folder, print_progress=True)
+
+    To process a large archive one chunk at a time::
+
+        for chunk in bw.load_campbell_scientific(folder, chunksize=100000):
+            print(chunk.mean())
     """
+    if calibrations is not None:
+        from ..transform.transform import _calibration_table, apply_calibrations
+        calibrations = _calibration_table(calibrations)
 
     is_file = _is_file(filepath_or_folder)
     fn_arguments = {'header': 0, 'index_col': 0, 'parse_dates': True, 'skiprows': [0, 2, 3]}
-    merged_fn_args = {**fn_arguments, **kwargs}
+    files_list = [filepath_or_folder] if is_file else _list_files(filepath_or_folder, ['.dat', '.csv'])
+    merged_fn_args = _add_timestamp_format(files_list, _read_campbell_scientific, timestamp_format,
+                                           {**fn_arguments, **kwargs})
+    if chunksize is not None:
+        if (date_from or date_to) and not is_file:
+            files_list = _files_in_date_range(filepath_or_folder, files_list, _read_campbell_scientific, date_from,
+                                              date_to, **merged_fn_args)
+        chunks = _stream_df_from_files(files_list, chunksize, _read_campbell_scientific, print_progress,
+                                       **merged_fn_args)
+        if date_from or date_to:
+            chunks = (chunk for chunk in (_slice_to_date_range(chunk, date_from, date_to) for chunk in chunks)
+                      if not chunk.empty)
+        if calibrations is not None:
+            chunks = (apply_calibrations(chunk, calibrations) for chunk in chunks)
+        if compact:
+            return (_compact_df(chunk)[0] for chunk in chunks)
+        return chunks
     if is_file:
-        return _pandas_read_csv(filepath_or_folder, **merged_fn_args)
-    elif not is_file:
-        return _assemble_df_from_folder(filepath_or_folder, ['.dat', '.csv'], _pandas_read_csv, print_progress,
-                                        **merged_fn_args)
+        df = _read_files([filepath_or_folder], _read_campbell_scientific, cache_folder=cache_folder,
+                         cache_size_limit=cache_size_limit, **merged_fn_args)[0]
+        df = _slice_to_date_range(df, date_from, date_to)
+    else:
+        df = _assemble_df_from_folder(filepath_or_folder, ['.dat', '.csv'], _read_campbell_scientific,
+                                      print_progress, workers, cache_folder, store_folder, date_from, date_to,
+                                      cache_size_limit, **merged_fn_args)
+    df.attrs['timestamp_format'] = merged_fn_args.get('timestamp_format')
+    if calibrations is not None:
+        df = apply_calibrations(df, calibrations)
+    if compact:
+        df = _load_compact(df, print_progress)
+    return df
 
 
 def _pandas_read_excel(filepath, **kwargs):
@@ -221,7 +1271,9 @@ def _pandas_read_excel(filepath, **kwargs):
         raise error
 
 
-def load_excel(filepath_or_folder, search_by_file_type=['.xlsx'], print_progress=False, sheet_name=0, **kwargs):
+def load_excel(filepath_or_folder, search_by_file_type=['.xlsx'], print_progress=False, sheet_name=0, workers=1,
+               cache_folder=None, store_folder=None, compact=False, date_from='', date_to='',
+               cache_size_limit=_CACHE_SIZE_LIMIT, **kwargs):
     """
     Load timeseries data from an Excel file, or group of files in a folder, into a dataframe.
     The format of the Excel file should be column headings in the first row with the timestamp column as the first
@@ -237,6 +1289,33 @@ def load_excel(filepath_or_folder, search_by_file_type=['.xlsx'], print_progress
     :type print_progress: bool, default False
     :param sheet_name: The Excel file sheet name you want to read from.
     :type sheet_name: string, int, mixed list of strings/ints, or None, default 0
+    :param workers: The number of processes used to read the files when a folder is sent. If None, the number of
+           processors on the machine is used. Default is 1.
+    :type workers: int or None, default 1
+    :param cache_folder: (Optional) A folder to cache the parsed files in. When a file is loaded again with the same
+           arguments, and it hasn't changed, the data is memory-mapped from the cache instead of being parsed. When a
+           single file is sent the numeric columns of the returned dataframe stay memory-mapped, copy-on-write, until
+           they are changed, when a folder is sent the files are copied into memory as they are joined together.
+    :type cache_folder: str or None, default None
+    :param cache_size_limit: (Optional) The maximum size of the cache in bytes. The least recently used entries are
+           removed when the cache grows over this. Default is 2 GB.
+    :type cache_size_limit: int
+    :param store_folder: (Optional) When a folder is sent, a folder to keep a consolidated store of the data along
+           with a manifest of the files already loaded. Each call then only reads files which are new or have changed
+           since the last call, which suits folders that have a new file added each day.
+    :type store_folder: str or None, default None
+    :param compact: (Optional) If True, reduce the memory used by the dataframe by downcasting measurement channels
+           to float32, integers to the smallest type that holds them and repeated strings, e.g. status flags, to
+           categoricals. The bytes saved per column are stored in df.attrs['memory_saved'] and printed if
+           print_progress is True.
+    :type compact: bool, default False
+    :param date_from: (Optional) Only load data from this date onwards. When a folder is sent, files that end before
+           it aren't read, see load_csv. As Excel files can't be read from the end, each file is read in full the
+           first time it is checked.
+    :type date_from: str or datetime, default ''
+    :param date_to: (Optional) Only load data up to and including this timestamp. When a folder is sent, files that
+           start after it aren't read.
+    :type date_to: str or datetime, default ''
     :param kwargs: All the kwargs from pandas.read_excel can be passed to this function.
     :return: A dataframe with timestamps as it's index.
     :rtype: pandas.DataFrame
@@ -267,88 +1346,466 @@ def load_excel(filepath_or_folder, search_by_file_type=['.xlsx'], print_progress
     fn_arguments = {'index_col': 0, 'parse_dates': True, 'sheet_name': sheet_name}
     merged_fn_args = {**fn_arguments, **kwargs}
     if is_file:
-        return _pandas_read_excel(filepath_or_folder, **merged_fn_args)
-    elif not is_file:
-        return _assemble_df_from_folder(filepath_or_folder, search_by_file_type, _pandas_read_excel, print_progress,
-                                        **merged_fn_args)
+        df = _read_files([filepath_or_folder], _pandas_read_excel, cache_folder=cache_folder,
+                         cache_size_limit=cache_size_limit, **merged_fn_args)[0]
+        df = _slice_to_date_range(df, date_from, date_to)
+    else:
+        df = _assemble_df_from_folder(filepath_or_folder, search_by_file_type, _pandas_read_excel, print_progress,
+                                      workers, cache_folder, store_folder, date_from, date_to, cache_size_limit,
+                                      **merged_fn_args)
+    if compact:
+        df = _load_compact(df, print_progress)
+    return df
+
 
+_NRG_NUMERIC_METADATA = ['Latitude', 'Longitude', 'Elevation', 'Height', 'Scale Factor', 'Offset']
 
-def load_nrg_txt():
-    return 'not yet implemented'
 
+def _read_nrg_header(filepath):
+    """
+    Read the header of an NRG SymphoniePRO text export, returning the site metadata and the number of lines before
+    the row of column headings of the data section.
+
+    The header is made up of 'key:<tab>value' lines grouped into sections such as 'Site Properties', 'Logger History'
+    and 'Sensor History'. Each sensor in the 'Sensor History' section starts with a 'Channel:' line.
 
-def _assemble_files_to_folder(source_folder, destination_folder, file_type, print_filename=False):
+    :param filepath: The file to read.
+    :type filepath: str
+    :return: The metadata as a dict with 'site', 'logger' and 'sensors' keys, and the number of header lines.
+    :rtype: (dict, int)
+    """
+    metadata = {'site': {}, 'logger': {}, 'sensors': []}
+    section = 'site'
+    try:
+        file = open(filepath, 'r', encoding='utf-8-sig', errors='replace')
+    except FileNotFoundError:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), filepath)
+    with file:
+        for line_num, line in enumerate(file):
+            line = line.rstrip('\r\n')
+            if line.startswith('Timestamp\t') or line.startswith('Date & Time Stamp\t'):
+                return metadata, line_num
+            if not line.strip():
+                continue
+            key, _, value = line.partition('\t')
+            if not key.endswith(':'):
+                if key.strip() == 'Site Properties':
+                    section = 'site'
+                elif key.strip() == 'Logger History':
+                    section = 'logger'
+                elif key.strip() == 'Sensor History':
+                    section = 'sensors'
+                elif key.strip() != 'Data':
+                    section = None
+                continue
+            key, value = key[:-1].strip(), value.strip()
+            if key in _NRG_NUMERIC_METADATA:
+                try:
+                    value = float(value)
+                except ValueError:
+                    pass
+            if section == 'sensors':
+                if key == 'Channel' or not metadata['sensors']:
+                    metadata['sensors'].append({})
+                metadata['sensors'][-1][key] = value
+            elif section is not None:
+                metadata[section][key] = value
+    raise TypeError('Data section not found in {0}, is it an NRG text export?'.format(filepath))
+
+
+def _read_nrg_txt(filepath, **kwargs):
+    """
+    Read an NRG SymphoniePRO text export into a dataframe. The header is scanned to find the start of the data section
+    which is then read with a single call to pandas.read_csv, with all channels read as float64. The site metadata is
+    stored in the attrs of the returned dataframe.
+
+    :param filepath: The file to read.
+    :type filepath: str
+    :param kwargs: Extra key word arguments to be applied to pandas.read_csv.
+    :return: A pandas dataframe.
+    :rtype: pandas.DataFrame
+    """
+    metadata, header_lines = _read_nrg_header(filepath)
+    with open(filepath, 'r', encoding='utf-8-sig', errors='replace') as file:
+        for _ in range(header_lines):
+            next(file)
+        column_names = file.readline().rstrip('\r\n').split('\t')
+    fn_arguments = {'sep': '\t', 'skiprows': header_lines, 'header': 0, 'index_col': 0, 'parse_dates': True,
+                    'encoding': 'utf-8-sig', 'skip_blank_lines': False,
+                    'dtype': {column_name: np.float64 for column_name in column_names[1:]}}
+    df = _pandas_read_csv(filepath, **{**fn_arguments, **kwargs})
+    if isinstance(df, pd.DataFrame):
+        df.attrs.update(metadata)
+    return df
+
+
+def load_nrg_txt(filepath_or_folder, search_by_file_type=['.txt'], print_progress=False, workers=1, cache_folder=None,
+                 store_folder=None, compact=False, timestamp_format=None, date_from='', date_to='',
+                 cache_size_limit=_CACHE_SIZE_LIMIT, **kwargs):
+    """
+    Load timeseries data from an NRG SymphoniePRO text export, or group of files in a folder, into a dataframe. The data
+    section of the export is found from the header and read in one pass with all the channels as float64. As this is a
+    wrapper around the pandas.read_csv function your own key word arguments can also be sent. The pandas.read_csv
+    documentation can be found at:
+    https://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_csv.html
+
+    The site metadata in the header is stored in the attrs of the returned dataframe as:
+
+        * df.attrs['site'] the site properties e.g. 'Latitude', 'Longitude', 'Elevation',
+        * df.attrs['logger'] the logger details e.g. 'Model', 'Serial Number',
+        * df.attrs['sensors'] a list with a dict for each channel e.g. 'Channel', 'Description', 'Serial Number',
+          'Height', 'Units', 'Scale Factor', 'Offset'.
+
+    When a folder is loaded the metadata is taken from the file with the latest data.
+
+    :param filepath_or_folder: Location of the file folder containing the timeseries data.
+    :type filepath_or_folder: str
+    :param search_by_file_type: Is a list of file extensions to search for e.g. ['.txt'] if a folder is sent.
+    :type search_by_file_type: List[str], default .txt
+    :param print_progress: If you want to print out statements of the file been processed set to True. Default is False.
+    :type print_progress: bool, default False
+    :param workers: The number of processes used to read the files when a folder is sent. If None, the number of
+           processors on the machine is used. Default is 1.
+    :type workers: int or None, default 1
+    :param cache_folder: (Optional) A folder to cache the parsed files in, see load_csv.
+    :type cache_folder: str or None, default None
+    :param cache_size_limit: (Optional) The maximum size of the cache in bytes, see load_csv.
+    :type cache_size_limit: int
+    :param store_folder: (Optional) A folder to keep a consolidated store of the data so only new or changed files are
+           read, see load_csv.
+    :type store_folder: str or None, default None
+    :param compact: (Optional) If True, reduce the memory used by the dataframe by downcasting measurement channels
+           to float32, integers to the smallest type that holds them and repeated strings, e.g. status flags, to
+           categoricals. The bytes saved per column are stored in df.attrs['memory_saved'] and printed if
+           print_progress is True.
+    :type compact: bool, default False
+    :param timestamp_format: (Optional) The format of the timestamps, see load_csv. If None, it is detected from the
+           first file. The format used is stored in df.attrs['timestamp_format'].
+    :type timestamp_format: str or None, default None
+    :param date_from: (Optional) Only load data from this date onwards. When a folder is sent, files that end before
+           it aren't read, see load_csv.
+    :type date_from: str or datetime, default ''
+    :param date_to: (Optional) Only load data up to and including this timestamp. When a folder is sent, files that
+           start after it aren't read.
+    :type date_to: str or datetime, default ''
+    :param kwargs: All the kwargs from pandas.read_csv can be passed to this function.
+    :return: A dataframe with timestamps as it's index.
+    :rtype: pandas.DataFrame
+
+    When assembling files from folders into a single dataframe with timestamp as the index it automatically checks for
+    duplicates and throws an error if any found.
+
+    **Example usage**
+    ::
+        import brightwind as bw
+        filepath = r'C:\\some\\folder\\some_SymphoniePRO_export.txt'
+        df = bw.load_nrg_txt(filepath)
+        print(df.attrs['sensors'])
+
+    To load a group of files from a folder::
+
+        folder = r'C:\\some\\folder\\with\\SymphoniePRO\\exports'
+        df = bw.load_nrg_txt(folder, print_progress=True)
+    """
+
+    is_file = _is_file(filepath_or_folder)
+    files_list = [filepath_or_folder] if is_file else _list_files(filepath_or_folder, search_by_file_type)
+    kwargs = _add_timestamp_format(files_list, _read_nrg_txt, timestamp_format, kwargs)
+    if is_file:
+        df = _read_files([filepath_or_folder], _read_nrg_txt, cache_folder=cache_folder,
+                         cache_size_limit=cache_size_limit, **kwargs)[0]
+        df = _slice_to_date_range(df, date_from, date_to)
+    else:
+        df = _assemble_df_from_folder(filepath_or_folder, search_by_file_type, _read_nrg_txt, print_progress, workers,
+                                      cache_folder, store_folder, date_from, date_to, cache_size_limit, **kwargs)
+        if files_list:
+            latest_file = max(files_list, key=lambda file_name: _first_timestamp(file_name, _read_nrg_txt, **kwargs))
+            df.attrs.update(_read_nrg_header(latest_file)[0])
+    df.attrs['timestamp_format'] = kwargs.get('timestamp_format')
+    if compact:
+        df = _load_compact(df, print_progress)
+    return df
+
+
+def _last_field_in_text_file(file_name, block_size=64 * 1024):
+    """
+    Return the text in the first column of the last row of a text file, only reading the end of the file, or None if
+    the file is empty or isn't a text file, e.g. an Excel or TOB1 file.
+    """
+    with open(file_name, 'rb') as file:
+        file.seek(max(0, os.fstat(file.fileno()).st_size - block_size))
+        tail = file.read()
+    if b'\x00' in tail:
+        return None
+    rows = tail.decode('utf-8', errors='replace').splitlines()
+    rows = [row for row in rows if row.strip()]
+    if not rows:
+        return None
+    return rows[-1].replace('\t', ',').split(',')[0].strip().strip('"')
+
+
+def _last_timestamp_in_text_file(file_name, block_size=64 * 1024, dayfirst=False):
+    """
+    Return the timestamp in the first column of the last row of a text file, only reading the end of the file, or
+    None if it can't be parsed.
+    """
+    last_timestamp = _parse_text_timestamps([_last_field_in_text_file(file_name, block_size)], dayfirst)
+    return last_timestamp[0] if last_timestamp is not None else None
+
+
+def _parse_text_timestamps(fields, dayfirst=False):
+    """
+    Parse timestamps read as text straight from files, e.g. the first field of their first row, with the first format
+    that matches them all, see _matching_timestamp_formats, so the day and month are read the same way in each.
+    Ambiguous timestamps are read month first, as pandas does, unless dayfirst is True. Returns a DatetimeIndex, or
+    None if a field is missing or can't be parsed.
+    """
+    if not fields or any(field is None or field == '' for field in fields):
+        return None
+    parsed = _try_timestamp_formats(pd.Index(fields), _matching_timestamp_formats(fields, dayfirst))
+    if parsed is None:
+        try:
+            parsed = pd.DatetimeIndex(pd.to_datetime(fields, dayfirst=dayfirst))
+        except (ValueError, TypeError, OverflowError):
+            return None
+    return parsed
+
+
+_LINK_TYPES = [None, 'hard', 'reflink']
+
+
+def _link_or_copy(source_file, destination_file, link=None):
+    """
+    Put a copy of source_file at destination_file. With link='hard' a hard link is created and with link='reflink' a
+    copy-on-write clone is made, neither of which copies the bytes of the file. If the link can't be made, e.g. the
+    folders are on different drives, the file is copied.
+
+    The copy is made to a temporary file next to destination_file and then moved into its place, so if anything goes
+    wrong a file already at destination_file is left as it was.
+    """
+    import uuid
+    temp_file = '{0}.{1}.tmp'.format(destination_file, uuid.uuid4().hex)
+    try:
+        linked = False
+        if link == 'hard':
+            try:
+                os.link(source_file, temp_file)
+                linked = True
+            except OSError:
+                pass
+        elif link == 'reflink':
+            try:
+                import fcntl
+                with open(source_file, 'rb') as source, open(temp_file, 'wb') as destination:
+                    fcntl.ioctl(destination.fileno(), 0x40049409, source.fileno())  # FICLONE
+                linked = True
+            except (ImportError, OSError):
+                pass
+        if not linked:
+            shutil.copyfile(source_file, temp_file)
+        os.replace(temp_file, destination_file)
+    finally:
+        if os.path.lexists(temp_file):
+            os.remove(temp_file)
+
+
+def _assemble_files_to_folder(source_folder, destination_folder, file_type, print_filename=False, link=None,
+                              header_lines=1, workers=4, dayfirst=False):
     """
     Assemble files scattered in subfolders of a certain directory and copy them to a single folder filtering for a
-    specific list of file types. If there are duplicates, the largest file will be kept.
+    specific list of file types.
+
+    If there are files with the same name, those with identical contents are only copied once, found by hashing the
+    files in a pool of threads. Of the files with the same name but different contents, the one covering the longest
+    timestamp range is kept, found by reading the first and last row of the files. If the timestamps can't be read,
+    or the ranges are the same, the largest file is kept.
 
     :param source_folder: Is the main folder to search through.
     :type source_folder: str
-    :param destination_folder: Is where you want all the files found to be copied to. If there are duplicates, the
-           largest file will be kept.
+    :param destination_folder: Is where you want all the files found to be copied to.
     :type destination_folder: str
     :param file_type: Is a list of file extensions to filter for e.g. ['.csv', '.txt']
     :type file_type: List[str]
     :param print_filename: If you want all the file names found to be printed set to true. Default is False.
     :type print_filename: bool, default False
-    :return: None
+    :param link: Set to 'hard' to hard link the files into destination_folder, or 'reflink' to make copy-on-write
+           clones where the file system supports it, instead of copying the bytes of the files.
+    :type link: str or None, default None
+    :param header_lines: Number of header lines at the top of each file, used to find the first row of data.
+    :type header_lines: int, default 1
+    :param workers: Number of threads used to hash and copy the files.
+    :type workers: int, default 4
+    :param dayfirst: Read timestamps where the day and month are ambiguous, e.g. 01/02/2018, as day first when
+           finding the timestamp range of the files. By default they are read month first, as pandas does.
+    :type dayfirst: bool, default False
+    :return: A summary of each file found with the action taken, 'copied', 'replaced' or 'skipped', and the reason.
+    :rtype: pandas.DataFrame
 
     """
+    from concurrent.futures import ThreadPoolExecutor
+    if link not in _LINK_TYPES:
+        raise ValueError('link must be one of {0}.'.format(_LINK_TYPES))
+    if not os.path.isdir(destination_folder):
+        raise NotADirectoryError('Destination folder is not valid folder.')
     files_list = _list_files(source_folder, file_type)
-    x: int = 0
+    existing_files = {entry.name: entry.path for entry in os.scandir(destination_folder) if entry.is_file()}
+    summary = []
+    files_by_name: Dict[str, List[str]] = {}
     for file in files_list:
-        filename = os.path.split(file)[1]
-        filepath = os.path.split(file)[0]
-        new_file: str = os.path.join(destination_folder, filename)
-        if print_filename:
-            print(new_file)
-        if filepath == destination_folder:
-            if print_filename:
-                print('File to be moved is itself. Skipping.')
-        elif os.path.exists(new_file):
-            new_file_size = os.path.getsize(new_file)
-            current_file_size = os.path.getsize(file)
-            if new_file_size <= current_file_size:
-                if print_filename:
-                    print('File from source_folder is greater size than an existing one in destination_folder. File '
-                          'in destination_folder will be overwritten.')
-                os.remove(new_file)
-                shutil.copyfile(file, new_file)
+        filepath, filename = os.path.split(file)
+        if os.path.abspath(filepath) == os.path.abspath(destination_folder):
+            summary.append([file, file, 'skipped', 'file is in destination_folder'])
         else:
-            try:
-                shutil.copyfile(file, new_file)
-            except FileNotFoundError:
-                if not os.path.isdir(destination_folder):
-                    raise NotADirectoryError('Destination folder is not valid folder.')
-            except Exception as error:
-                raise error
-            x = x + 1
+            files_by_name.setdefault(filename, []).append(file)
+
+    files_to_hash = [file for filename, files in files_by_name.items()
+                     for file in files + [existing_files.get(filename)]
+                     if file is not None and (len(files) > 1 or filename in existing_files)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        file_hashes = dict(zip(files_to_hash, executor.map(_file_hash, files_to_hash)))
+
+    def _rank(file):
+        timestamps = _parse_text_timestamps([_first_field_in_text_file(file, header_lines),
+                                             _last_field_in_text_file(file)], dayfirst)
+        if timestamps is None or timestamps.isnull().any():
+            return pd.Timedelta(0), os.path.getsize(file)
+        return timestamps[1] - timestamps[0], os.path.getsize(file)
+
+    to_copy = []
+    for filename, files in files_by_name.items():
+        new_file = os.path.join(destination_folder, filename)
+        existing_file = existing_files.get(filename)
+        candidates = ([existing_file] if existing_file is not None else []) + files
+        unique_files = {}
+        for file in candidates:
+            if file in file_hashes and file_hashes[file] in unique_files:
+                summary.append([file, new_file, 'skipped', 'identical to ' + unique_files[file_hashes[file]]])
+            else:
+                unique_files[file_hashes.get(file, file)] = file
+        unique_files = list(unique_files.values())
+        best_file = unique_files[0] if len(unique_files) == 1 else max(unique_files, key=_rank)
+        for file in unique_files:
+            if file == best_file or file == existing_file:
+                continue
+            summary.append([file, new_file, 'skipped', 'shorter timestamp range or smaller than ' + best_file])
+        if best_file == existing_file:
+            continue
+        if existing_file is not None:
+            summary.append([best_file, new_file, 'replaced', 'longer timestamp range or larger than ' + existing_file])
+        else:
+            summary.append([best_file, new_file, 'copied', ''])
+        to_copy.append((best_file, new_file))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda files: _link_or_copy(files[0], files[1], link), to_copy))
+
+    summary = pd.DataFrame(summary, columns=['Source', 'Destination', 'Action', 'Reason'])
     if print_filename:
-        print('Number of files processed: ' + str(len(files_list)) + '. Number of files moved: ' + str(x))
+        for row in summary.itertuples(index=False):
+            print('{0} {1} {2}'.format(row.Source, row.Action, row.Reason).strip())
+        print('Number of files processed: ' + str(len(files_list)) + '. Number of files moved: ' + str(len(to_copy)))
+    return summary
+
+
+def _first_field_in_text_file(file_name, header_lines):
+    """
+    Return the text in the first column of the first data row of a text file, or None if the file has no data.
+    """
+    with open(file_name, 'rb') as file:
+        for _ in range(header_lines):
+            file.readline()
+        first_row = file.readline().decode('utf-8', errors='replace')
+    if not first_row.strip():
+        return None
+    return first_row.replace('\t', ',').split(',')[0].strip().strip('"')
+
+
+def _copy_file_contents(source_file, destination_file, offset, block_size=16 * 1024 * 1024):
+    """
+    Copy the contents of source_file from offset onwards to the end of destination_file. os.sendfile is used where
+    available so the data is copied by the operating system without passing through python, otherwise the data is
+    copied in large blocks.
+    """
+    size = os.fstat(source_file.fileno()).st_size
+    if hasattr(os, 'sendfile') and isinstance(destination_file, io.BufferedWriter):
+        destination_file.flush()
+        while offset < size:
+            sent = os.sendfile(destination_file.fileno(), source_file.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    else:
+        source_file.seek(offset)
+        shutil.copyfileobj(source_file, destination_file, block_size)
 
 
-def _append_files_together(source_folder, assembled_file_name, file_type):
+_COMPRESSION_TYPES = [None, 'gzip', 'bz2']
+
+
+def _append_files_together(source_folder, assembled_file_name, file_type, header_lines=1, order_by_timestamp=True,
+                           compression=None, dayfirst=False):
     """
     Assemble files scattered in subfolders of a certain directory and copy them to a single file filtering for a
     specific list of file types.
 
+    The files are streamed into the new file in large blocks, so they are never read fully into memory, and the
+    header of only the first file is kept so the assembled file can be read in one pass. The files are ordered by the
+    timestamp in their first row of data.
+
     :param source_folder: Is the main folder to search through.
     :type source_folder: str
     :param assembled_file_name: Name of the newly created file with all the appended data.
     :type assembled_file_name: str
     :param file_type: Is a list of file extensions to filter for e.g. ['.csv', '.txt']
     :type file_type: List[str]
-    :return:
+    :param header_lines: Number of header lines at the top of each file e.g. 1 for a csv file with column headings and
+           4 for a Campbell Scientific TOA5 file. Only the header of the first file is written.
+    :type header_lines: int, default 1
+    :param order_by_timestamp: Order the files by the timestamp in their first row of data. If the timestamp can't be
+           read the files are ordered by their path.
+    :type order_by_timestamp: bool, default True
+    :param compression: Set to 'gzip' or 'bz2' to compress the assembled file.
+    :type compression: str or None, default None
+    :param dayfirst: Read timestamps where the day and month are ambiguous in all the files, e.g. 01/02/2018, as day
+           first when ordering the files. By default they are read month first, as pandas does.
+    :type dayfirst: bool, default False
+    :return: The path of the assembled file.
+    :rtype: str
     """
-    list_of_files = _list_files(source_folder, file_type)
-
-    file_handler = open(os.path.join(source_folder, assembled_file_name), 'a+')
-    for file in list_of_files:
-        file_handler2 = open(file, 'r')
-        file_handler.write(file_handler2.read())
-        file_handler2.close()
-    file_handler.close()
-    return
+    if compression not in _COMPRESSION_TYPES:
+        raise ValueError('compression must be one of {0}.'.format(_COMPRESSION_TYPES))
+    assembled_file_path = os.path.join(source_folder, assembled_file_name)
+    list_of_files = sorted(file for file in _list_files(source_folder, file_type)
+                           if os.path.abspath(file) != os.path.abspath(assembled_file_path))
+    if order_by_timestamp:
+        first_timestamps = _parse_text_timestamps([_first_field_in_text_file(file, header_lines)
+                                                   for file in list_of_files], dayfirst)
+        if first_timestamps is not None:
+            list_of_files = [file for timestamp, file in sorted(zip(first_timestamps, list_of_files))]
+
+    if compression is None:
+        file_handler = open(assembled_file_path, 'wb')
+    elif compression == 'gzip':
+        import gzip
+        file_handler = gzip.open(assembled_file_path, 'wb')
+    else:
+        import bz2
+        file_handler = bz2.open(assembled_file_path, 'wb')
+
+    with file_handler:
+        for file_num, file in enumerate(list_of_files):
+            with open(file, 'rb') as file_handler2:
+                header = b''.join(file_handler2.readline() for _ in range(header_lines))
+                if file_num == 0:
+                    file_handler.write(header)
+                offset = file_handler2.tell()
+                if offset == os.fstat(file_handler2.fileno()).st_size:
+                    continue
+                _copy_file_contents(file_handler2, file_handler, offset)
+                file_handler2.seek(-1, os.SEEK_END)
+                if file_handler2.read(1) != b'\n':
+                    file_handler.write(b'\n')
+    return assembled_file_path
 
 
 class Reanalysis:
@@ -379,53 +1836,378 @@ def _get_brightdata_credentials():
     return os.getenv('BRIGHTDATA_USERNAME'), os.getenv('BRIGHTDATA_PASSWORD')
 
 
-def _get_brightdata(dataset, lat, long, nearest, from_date, to_date):
+def _brightdata_node_to_df(node_data):
     """
-    Get era5 data from the brightdata platform and format it for use.
-    :param lat:
-    :param long:
-    :param nearest:
-    :param from_date:
-    :param to_date:
-    :return:
+    Build a dataframe directly from the already decoded json data of a brightdata node, which is a dict of records
+    keyed by timestamp e.g. {'2018-01-01 00:00:00': {'WS50m_ms': 5.5, 'WD50m_deg': 270.0}, ...}. The index is parsed
+    in one vectorized call and each column is built straight from the records, instead of writing the records back
+    out to a json string to be parsed again.
+
+    :param node_data: The 'data' of a node in the brightdata response.
+    :type node_data: dict
+    :return: A dataframe with timestamps as it's index.
+    :rtype: pandas.DataFrame
     """
-    username, password = _get_brightdata_credentials()
-    base_url = 'http://api.brightwindanalysis.com/brightdata'
-    # base_url = 'http://localhost:5000'
-    response = requests.get(base_url,  auth=(username, password), params={
-        'dataset': dataset,
-        'latitude': lat,
-        'longitude': long,
-        'nearest': nearest,
-        'from_date': from_date,
-        'to_date': to_date
-    })
-    try:
-        json_response = response.json()
-    except Exception:
-        if response.status_code == 401:
-            raise Exception('Please check your BRIGHTDATA_USERNAME and BRIGHTDATA_PASSWORD are correct.')
-        raise Exception('Http code {}, something is wrong with the server.'.format(str(response.status_code)))
-    reanalysis_list = []
+    if not node_data:
+        return pd.DataFrame()
+    records = list(node_data.values())
+    column_names = list(records[0])
+    if any(len(record) != len(column_names) for record in records):
+        column_names = list(dict.fromkeys(column_name for record in records for column_name in record))
+    columns = {}
+    for column_name in column_names:
+        values = [record.get(column_name) for record in records]
+        try:
+            columns[column_name] = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            columns[column_name] = pd.Series(values).values
+        else:
+            if not np.isnan(columns[column_name]).any() and \
+                    all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+                columns[column_name] = columns[column_name].astype(np.int64)
+    index = pd.to_datetime(list(node_data.keys()))
+    return pd.DataFrame(columns, index=index, columns=column_names)
+
 
+def _parse_brightdata_response(json_response, dataset):
+    """
+    Convert the json response from the brightdata platform into a list of Reanalysis objects.
+    """
+    reanalysis_list = []
     for node in json_response:
         temp_reanalysis = Reanalysis('', '', pd.DataFrame(), '')
         try:
             temp_reanalysis.latitude = node['latitude']
             temp_reanalysis.longitude = node['longitude']
             temp_reanalysis.source = dataset
-            temp_reanalysis.data = pd.read_json(json.dumps(node['data']), orient='index')
+            temp_reanalysis.data = _brightdata_node_to_df(node['data'])
         except Exception as error:
             if 'errors' in node:
                 raise TypeError(json_response)
             else:
                 raise error
         reanalysis_list.append(temp_reanalysis)
-
     return reanalysis_list
 
 
-def load_brightdata(dataset, lat, long, nearest, from_date=None, to_date=None):
+def _to_day(date, default):
+    """Convert a 'yyyy-mm-dd' date to a Timestamp, or return default if date is None."""
+    if date is None:
+        return default
+    return pd.Timestamp(date).normalize()
+
+
+def _from_day(day):
+    """Convert a Timestamp back to a 'yyyy-mm-dd' date, or None for the open ended Timestamp.min and max."""
+    if day == pd.Timestamp.min or day == pd.Timestamp.max:
+        return None
+    return day.strftime('%Y-%m-%d')
+
+
+def _day_after(day):
+    """Return the day after day, or Timestamp.max for the open ended Timestamp.max so it doesn't overflow."""
+    if day > pd.Timestamp.max - pd.Timedelta('1D'):
+        return pd.Timestamp.max
+    return day + pd.Timedelta('1D')
+
+
+def _missing_date_ranges(requested, covered):
+    """
+    Return the whole day date ranges within requested that are not in any of the covered date ranges. All ranges are
+    (start, end) Timestamp tuples inclusive of both ends.
+    """
+    start, end = requested
+    missing = []
+    for covered_start, covered_end in sorted(covered):
+        if covered_end < start or covered_start > end:
+            continue
+        if covered_start > start:
+            missing.append((start, covered_start - pd.Timedelta('1D')))
+        if covered_end >= end:
+            return missing
+        start = max(start, _day_after(covered_end))
+    missing.append((start, end))
+    return missing
+
+
+def _merge_date_ranges(date_ranges):
+    """
+    Merge overlapping or adjacent whole day date ranges, each a (start, end) Timestamp tuple inclusive of both ends.
+    """
+    merged = []
+    for start, end in sorted(date_ranges):
+        if merged and start <= _day_after(merged[-1][1]):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _brightdata_node_key(dataset, node_lat, node_long):
+    return hashlib.sha1(json.dumps([dataset, str(node_lat), str(node_long)]).encode('utf-8')).hexdigest()
+
+
+class BrightdataClient:
+    """
+    Client for retrieving datasets from the brightdata platform. The client keeps a pool of connections open between
+    requests, times out requests that hang, retries failed requests with an exponential backoff and can retrieve many
+    datasets or locations at the same time.
+
+    :param username: brightdata username. If None, the BRIGHTDATA_USERNAME environmental variable is used.
+    :type username: str
+    :param password: brightdata password. If None, the BRIGHTDATA_PASSWORD environmental variable is used.
+    :type password: str
+    :param base_url: The url of the brightdata platform.
+    :type base_url: str
+    :param timeout: Seconds to wait to connect to the server and then for it to send data. Can be a single number for
+                    both or a (connect, read) tuple.
+    :type timeout: float or tuple
+    :param max_retries: Number of times a request is retried after a connection error, timeout or server error.
+    :type max_retries: int
+    :param backoff_factor: Seconds to wait before the first retry, the wait is doubled for each retry after.
+    :type backoff_factor: float
+    :param max_workers: Number of requests sent at the same time by get_many(). Also sets the size of the
+                        connection pool.
+    :type max_workers: int
+    :param cache_folder: (Optional) A folder to cache the data of each node in. When a node is requested again only
+                         the parts of the date range that are not already cached are retrieved from the server. Dates
+                         are treated as whole days, inclusive of from_date and to_date.
+    :type cache_folder: str
+    :param cache_ttl: Seconds after which data in the cache is retrieved from the server again. Default is 30 days.
+    :type cache_ttl: float
+    :param cache_size_limit: Maximum size of the cache in bytes. The least recently used nodes are removed when the
+                             cache grows over this. Default is 2 GB.
+    :type cache_size_limit: int
+
+    **Example usage**
+    ::
+        import brightwind as bw
+        with bw.BrightdataClient(timeout=30, max_retries=5) as client:
+            nodes_by_site = client.get_many([('era5', 53.4, -7.2, 4), ('merra2', 53.4, -7.2, 4),
+                                             ('era5', 54.0, -3.3, 1, '2018-01-01', '2018-10-01')])
+        for nodes in nodes_by_site:
+            for node in nodes:
+                print(node.data)
+
+    """
+    retry_status_codes = (429, 500, 502, 503, 504)
+
+    def __init__(self, username=None, password=None, base_url=_BRIGHTDATA_URL, timeout=(10, 300), max_retries=3,
+                 backoff_factor=1.0, max_workers=4, cache_folder=None, cache_ttl=30 * 24 * 3600,
+                 cache_size_limit=_CACHE_SIZE_LIMIT):
+        if username is None or password is None:
+            username, password = _get_brightdata_credentials()
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_workers = max_workers
+        self.cache_folder = cache_folder
+        self.cache_ttl = cache_ttl
+        self.cache_size_limit = cache_size_limit
+        self._cache_lock = threading.Lock()
+        import requests
+        self.session = requests.Session()
+        self.session.auth = (username, password)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the connections in the pool."""
+        self.session.close()
+
+    def _request(self, params):
+        """
+        Send a GET request, retrying with an exponential backoff on connection errors, timeouts and server errors.
+        Returns the decoded json response.
+        """
+        import time
+        import requests
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in self.retry_status_codes or attempt == self.max_retries:
+                    break
+            time.sleep(self.backoff_factor * 2 ** attempt)
+        try:
+            return response.json()
+        except Exception:
+            if response.status_code == 401:
+                raise Exception('Please check your BRIGHTDATA_USERNAME and BRIGHTDATA_PASSWORD are correct.')
+            raise Exception('Http code {}, something is wrong with the server.'.format(str(response.status_code)))
+
+    def get(self, dataset, lat, long, nearest, from_date=None, to_date=None):
+        """
+        Retrieve a dataset from the brightdata platform. Takes the same arguments as load_brightdata.
+
+        :return: a list of Reanalysis objects in order of closest distance to the requested lat, long.
+        :rtype: List(Reanalysis)
+        """
+        if self.cache_folder is not None:
+            return self._get_cached(dataset, lat, long, nearest, from_date, to_date)
+        return self._get_from_server(dataset, lat, long, nearest, from_date, to_date)
+
+    def _get_from_server(self, dataset, lat, long, nearest, from_date=None, to_date=None):
+        json_response = self._request({
+            'dataset': dataset,
+            'latitude': lat,
+            'longitude': long,
+            'nearest': nearest,
+            'from_date': from_date,
+            'to_date': to_date
+        })
+        return _parse_brightdata_response(json_response, dataset)
+
+    def _get_cached(self, dataset, lat, long, nearest, from_date=None, to_date=None):
+        """
+        Retrieve a dataset using the cache. The nodes returned for a request are remembered so the next time the same
+        request is made the cached data of each node is used and only the missing date ranges are retrieved from the
+        server and merged into the cache.
+        """
+        query_key = json.dumps([dataset, str(lat), str(long), str(nearest)])
+        requested = (_to_day(from_date, pd.Timestamp.min), _to_day(to_date, pd.Timestamp.max))
+        with self._cache_lock:
+            nodes = self._read_cached_queries().get(query_key)
+            gaps = [requested]
+            if nodes is not None:
+                gaps = []
+                for node_lat, node_long in nodes:
+                    covered = self._read_cached_coverage(dataset, node_lat, node_long)
+                    if covered is None:
+                        gaps = [requested]
+                        break
+                    gaps += _missing_date_ranges(requested, covered)
+                gaps = _merge_date_ranges(gaps)
+
+        for gap_from, gap_to in gaps:
+            reanalysis_list = self._get_from_server(dataset, lat, long, nearest, _from_day(gap_from),
+                                                    _from_day(gap_to))
+            with self._cache_lock:
+                for node in reanalysis_list:
+                    self._update_cached_node(node, gap_from, gap_to)
+                nodes = [[str(node.latitude), str(node.longitude)] for node in reanalysis_list]
+                self._write_cached_query(query_key, nodes)
+
+        reanalysis_list = []
+        with self._cache_lock:
+            for node_lat, node_long in nodes:
+                data = _read_from_cache(self.cache_folder, _brightdata_node_key(dataset, node_lat, node_long))
+                if data is None:
+                    data = pd.DataFrame()
+                elif len(data.index):
+                    data = data.loc[_from_day(requested[0]):_from_day(requested[1])].copy()
+                reanalysis_list.append(Reanalysis(node_lat, node_long, data, dataset))
+            if gaps:
+                _evict_from_cache(self.cache_folder, self.cache_size_limit)
+        return reanalysis_list
+
+    def _read_cached_queries(self):
+        try:
+            with open(os.path.join(self.cache_folder, 'queries.json'), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cached_query(self, query_key, nodes):
+        os.makedirs(self.cache_folder, exist_ok=True)
+        queries = self._read_cached_queries()
+        queries[query_key] = nodes
+        _write_manifest(os.path.join(self.cache_folder, 'queries.json'), queries)
+
+    def _read_cached_coverage(self, dataset, node_lat, node_long):
+        """
+        Return the date ranges of a node held in the cache that have not expired, or None if the node isn't cached.
+        """
+        import time
+        meta = _read_cache_meta(self.cache_folder, _brightdata_node_key(dataset, node_lat, node_long))
+        if meta is None:
+            return None
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end, fetched in meta['covered']
+                if time.time() - fetched < self.cache_ttl]
+
+    def _update_cached_node(self, node, gap_from, gap_to):
+        """
+        Merge newly retrieved data for a node into the cache, the new data taking precedence over the cached data.
+        A gap is only recorded as covered up to the last day returned, whether or not it is open ended, so data
+        published after it is retrieved the next time it is requested.
+        """
+        import time
+        key = _brightdata_node_key(node.source, node.latitude, node.longitude)
+        meta = _read_cache_meta(self.cache_folder, key)
+        data = node.data
+        covered = []
+        if meta is not None:
+            cached_data = _read_from_cache(self.cache_folder, key)
+            if cached_data is not None:
+                data = data.combine_first(cached_data).sort_index()
+                covered = [item for item in meta['covered'] if time.time() - item[2] < self.cache_ttl]
+        gap_to = min(gap_to, node.data.index.max().normalize()) if len(node.data.index) else None
+        if gap_to is not None and gap_to >= gap_from:
+            covered.append([str(gap_from), str(gap_to), time.time()])
+        shutil.rmtree(os.path.join(self.cache_folder, key), ignore_errors=True)
+        _write_to_cache(self.cache_folder, key, data, extra_meta={'covered': covered})
+
+    def get_many(self, requests_list):
+        """
+        Retrieve many datasets from the brightdata platform at the same time using a pool of max_workers threads.
+
+        :param requests_list: List of requests, each one either a tuple of the arguments to get() in order i.e.
+                              (dataset, lat, long, nearest, from_date, to_date) with the dates being optional, or a dict
+                              of the arguments by name.
+        :type requests_list: List[tuple or dict]
+        :return: A list with the result of get() for each request, in the same order as requests_list.
+        :rtype: List[List(Reanalysis)]
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _get(request):
+            if isinstance(request, dict):
+                return self.get(**request)
+            return self.get(*request)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(_get, requests_list))
+
+
+# Clients shared between calls to load_brightdata, keyed by the credentials and cache folder they were created with.
+_default_brightdata_clients = {}
+_default_brightdata_clients_lock = threading.Lock()
+
+
+def _get_brightdata(dataset, lat, long, nearest, from_date, to_date, cache_folder=None):
+    """
+    Get era5 data from the brightdata platform and format it for use. Uses a BrightdataClient shared between calls so
+    the connection to the server is reused. The credentials are read each call, so a new client is made if they
+    change.
+    :param lat:
+    :param long:
+    :param nearest:
+    :param from_date:
+    :param to_date:
+    :param cache_folder:
+    :return:
+    """
+    username, password = _get_brightdata_credentials()
+    key = (username, password, cache_folder)
+    with _default_brightdata_clients_lock:
+        if key not in _default_brightdata_clients:
+            _default_brightdata_clients[key] = BrightdataClient(username, password, cache_folder=cache_folder)
+        client = _default_brightdata_clients[key]
+    return client.get(dataset, lat, long, nearest, from_date, to_date)
+
+
+def load_brightdata(dataset, lat, long, nearest, from_date=None, to_date=None, cache_folder=None):
     """
     Retrieve timeseries datasets available from the brightdata platform. Returns a list of Reanalysis objects in order
     of closest distance to the requested lat, long.
@@ -443,6 +2225,9 @@ def load_brightdata(dataset, lat, long, nearest, from_date=None, to_date=None):
     :type from_date: str
     :param to_date: date to in 'yyyy-mm-dd' format.
     :type to_date: str
+    :param cache_folder: (Optional) A folder to cache the data of each node in. When the same nodes are requested
+                         again only the parts of the date range not already cached are retrieved from the server.
+    :type cache_folder: str
     :return: a list of Reanalysis objects in order of closest distance to the requested lat, long.
     :rtype: List(Reanalysis)
 
@@ -459,15 +2244,20 @@ def load_brightdata(dataset, lat, long, nearest, from_date=None, to_date=None):
         for node in nodes:
             print(node.data)
 
+    To retrieve many datasets or locations at the same time, with control over timeouts and retries, use a
+    BrightdataClient.
+
     """
 
     handlers = [
         {'dataset': 'era5', 'process_fn': _get_brightdata, 'fn_arguments': {
-            'dataset': dataset, 'lat': lat, 'long': long, 'from_date': from_date, 'to_date': to_date, 'nearest': nearest
+            'dataset': dataset, 'lat': lat, 'long': long, 'from_date': from_date, 'to_date': to_date,
+            'nearest': nearest, 'cache_folder': cache_folder
             }
          },
         {'dataset': 'merra2', 'process_fn': _get_brightdata, 'fn_arguments': {
-            'dataset': dataset, 'lat': lat, 'long': long, 'from_date': from_date, 'to_date': to_date, 'nearest': nearest
+            'dataset': dataset, 'lat': lat, 'long': long, 'from_date': from_date, 'to_date': to_date,
+            'nearest': nearest, 'cache_folder': cache_folder
             }
          }
     ]
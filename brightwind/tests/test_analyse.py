@@ -1,5 +1,7 @@
 import pytest
-from ..analyse.analyse import monthly_means, SectorRatio
+import numpy as np
+import pandas as pd
+from ..analyse.analyse import monthly_means, SectorRatio, coverage, momm, basic_stats
 
 from ..load.load import load_csv
 import brightwind.datasets
@@ -19,4 +21,16 @@ def test_sector_ratio_by_sector():
     data = load_csv(brightwind.datasets.shell_flats_80m_csv)
     SectorRatio.by_sector(data['WS70mA100NW_Avg'], data['WS70mA100SE_Avg'], data['WD50mW200PNW_VAvg'],
                           sectors = 72, boom_dir_1 = 315, boom_dir_2 = 135,return_data=True)[1]
-    assert True
\ No newline at end of file
+    assert True
+
+
+def test_float32_data_is_not_upcast():
+    index = pd.date_range('2018-01-01', periods=6 * 24 * 90, freq='10min')
+    rng = np.random.default_rng(7)
+    data = pd.DataFrame({'Spd1': rng.random(len(index)), 'Spd2': rng.random(len(index))},
+                        index=index).astype(np.float32)
+    assert (coverage(data).dtypes == np.float32).all()
+    assert coverage(data['Spd1'], period='1D').dtype == np.float32
+    assert (momm(data).dtypes == np.float32).all()
+    assert isinstance(momm(data['Spd1']), np.float32)
+    assert (basic_stats(data).dtypes == np.float32).all()
@@ -8,3 +8,16 @@ def test_creyap():
     load_csv(brightwind.datasets.shell_flats_50m_csv)
     load_csv(brightwind.datasets.shell_flats_merra)
 
+
+def test_load_dataset(tmpdir, monkeypatch):
+    import pandas as pd
+    monkeypatch.setenv('BRIGHTWIND_DATASETS_CACHE', str(tmpdir.join('cache')))
+    pd.DataFrame({'Spd': [1.0, 2.0]}, index=pd.date_range('2018-01-01', periods=2, freq='10min')).rename_axis(
+        'Timestamp').to_csv(str(tmpdir.join('data.csv')))
+    df = brightwind.datasets._load_dataset(str(tmpdir.join('data.csv')))
+    assert tmpdir.join('cache').check()
+    df['Spd'] = 0.0
+    tmpdir.join('data.csv').remove()
+    assert list(brightwind.datasets._load_dataset(str(tmpdir.join('data.csv'))).Spd) == [1.0, 2.0]
+    assert brightwind.datasets._load_dataset(str(tmpdir.join('data.csv')), copy=False) is \
+        brightwind.datasets._load_dataset(str(tmpdir.join('data.csv')), copy=False)
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import os
+import brightwind as bw
+
+
+def _run(code):
+    package_folder = os.path.dirname(os.path.dirname(bw.__file__))
+    return subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE, universal_newlines=True,
+                          cwd=package_folder).stdout.strip()
+
+
+def test_public_names():
+    for module in [bw.load.load, bw.analyse.analyse, bw.transform.transform, bw.export.export]:
+        assert set(module.__all__) <= set(bw.__all__)
+        for name in module.__all__:
+            assert getattr(bw, name) is getattr(module, name)
+    assert bw.correl.SpeedSort is bw.analyse.correlation.SpeedSort
+
+
+def test_import_does_not_load_heavy_dependencies():
+    loaded = _run("import sys, brightwind as bw; bw.average_data_by_period; bw.load_csv; "
+                  "print([m for m in ['matplotlib', 'scipy', 'sklearn', 'requests'] if m in sys.modules])")
+    assert loaded == '[]'
+
+
+def test_import_time():
+    # Compared with the time to import pandas and numpy, rather than a fixed limit, so a slow machine doesn't fail it.
+    pandas_time, brightwind_time = map(float, _run(
+        "import time; start = time.perf_counter(); import pandas, numpy; middle = time.perf_counter(); "
+        "import brightwind; print(middle - start, time.perf_counter() - middle)").split())
+    assert brightwind_time < pandas_time
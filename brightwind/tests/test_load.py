@@ -0,0 +1,573 @@
+import pytest
+import functools
+import brightwind as bw
+import pandas as pd
+import numpy as np
+
+
+def _write_daily_files(folder, days, start='2018-01-01'):
+    timestamps = pd.date_range(start, periods=days * 144, freq='10min')
+    data = pd.DataFrame({'Spd80mN': np.arange(len(timestamps), dtype=float),
+                         'Dir78mS': np.arange(len(timestamps), dtype=float) % 360}, index=timestamps)
+    data.index.name = 'Timestamp'
+    for day, day_data in data.groupby(data.index.date):
+        day_data.to_csv(str(folder.join('{0}.csv'.format(day))))
+    return data
+
+
+def test_load_csv_folder(tmpdir):
+    data = _write_daily_files(tmpdir, 5)
+    assert np.allclose(bw.load_csv(str(tmpdir)).values, data.values)
+
+
+def test_load_csv_folder_workers(tmpdir):
+    _write_daily_files(tmpdir, 5)
+    assert bw.load_csv(str(tmpdir), workers=2).equals(bw.load_csv(str(tmpdir)))
+
+
+def test_load_csv_folder_duplicate_timestamps(tmpdir):
+    data = _write_daily_files(tmpdir, 2)
+    data.iloc[:10].to_csv(str(tmpdir.join('duplicate.csv')))
+    with pytest.raises(ValueError) as except_info:
+        bw.load_csv(str(tmpdir))
+    assert 'Indexes have overlapping values' in str(except_info.value)
+
+
+def test_load_csv_cache(tmpdir):
+    data_folder = tmpdir.mkdir('data')
+    cache_folder = str(tmpdir.join('cache'))
+    _write_daily_files(data_folder, 3)
+    df = bw.load_csv(str(data_folder))
+    assert bw.load_csv(str(data_folder), cache_folder=cache_folder).equals(df)
+    assert len(tmpdir.join('cache').listdir()) == 3
+    # second load is read from the cache
+    assert bw.load_csv(str(data_folder), cache_folder=cache_folder).equals(df)
+    assert len(tmpdir.join('cache').listdir()) == 3
+
+
+def test_load_csv_cache_memory_mapped(tmpdir):
+    cache_folder = tmpdir.join('cache')
+    _write_daily_files(tmpdir, 1)
+    file = str(tmpdir.join('2018-01-01.csv'))
+    df = bw.load_csv(file, cache_folder=str(cache_folder))
+    cached_df = bw.load_csv(file, cache_folder=str(cache_folder))
+    values = cached_df.Spd80mN.values
+    assert isinstance(values, np.memmap) and values.filename == str(cache_folder.listdir()[0].join('col_0.npy'))
+    # changes to the dataframe aren't written back to the cache
+    cached_df.iloc[0, 0] = -1.0
+    assert bw.load_csv(file, cache_folder=str(cache_folder)).equals(df)
+    # the least recently used entries are removed when the cache is over cache_size_limit
+    bw.load_csv(str(tmpdir.join('2018-01-01.csv')), cache_folder=str(cache_folder), cache_size_limit=0, nrows=10)
+    assert len(cache_folder.listdir()) == 0
+
+
+def test_load_csv_cache_file_changed(tmpdir):
+    cache_folder = str(tmpdir.join('cache'))
+    file = tmpdir.join('data.csv')
+    file.write('Timestamp,Spd\n2018-01-01 00:00:00,1.0\n2018-01-01 00:10:00,2.0\n')
+    assert list(bw.load_csv(str(file), cache_folder=cache_folder).Spd) == [1.0, 2.0]
+    file.write('Timestamp,Spd\n2018-01-01 00:00:00,3.0\n2018-01-01 00:10:00,4.0\n2018-01-01 00:20:00,5.0\n')
+    assert list(bw.load_csv(str(file), cache_folder=cache_folder).Spd) == [3.0, 4.0, 5.0]
+
+
+def _write_campbell_files(folder, days, start='2018-01-01'):
+    data = _write_daily_files(folder, days, start)
+    for file in folder.listdir():
+        lines = file.read().splitlines()
+        file.write('\n'.join(['"TOA5","Site","CR1000","1234","CR1000.Std.28","CPU:site.CR1","1234","Table1"',
+                              lines[0],
+                              '"TS","m/s","Deg"',
+                              '"","Avg","Smp"'] + lines[1:]) + '\n')
+        file.rename(str(file)[:-4] + '.dat')
+    return data
+
+
+def test_load_campbell_scientific_chunksize(tmpdir):
+    data = _write_campbell_files(tmpdir, 3)
+    chunks = list(bw.load_campbell_scientific(str(tmpdir), chunksize=100))
+    assert [len(chunk) for chunk in chunks] == [100] * 4 + [32]
+    assembled = pd.concat(chunks)
+    assert assembled.index.equals(data.index)
+    assert assembled.equals(bw.load_campbell_scientific(str(tmpdir)))
+    calibrations = [{'channel': 'Spd80mN', 'valid_from': '2018-01-02', 'valid_to': None, 'current_slope': 0.046,
+                     'current_offset': 0.235, 'new_slope': 0.045, 'new_offset': 0.24}]
+    calibrated = pd.concat(bw.load_campbell_scientific(str(tmpdir), chunksize=100, calibrations=calibrations))
+    assert calibrated.equals(bw.load_campbell_scientific(str(tmpdir), calibrations=calibrations))
+    assert calibrated.equals(bw.apply_calibrations(assembled, calibrations))
+
+
+def test_load_campbell_scientific_chunksize_date_range(tmpdir):
+    data = _write_campbell_files(tmpdir, 3)
+    chunks = bw.load_campbell_scientific(str(tmpdir), chunksize=100, date_from='2018-01-02', date_to='2018-01-02 23:50')
+    assert pd.concat(chunks).index.equals(data.loc['2018-01-02'].index)
+    assert tmpdir.join('.brightwind_time_index.json').check()
+    # the index file is only created when a folder is sent
+    tmpdir.join('.brightwind_time_index.json').remove()
+    chunks = bw.load_campbell_scientific(str(tmpdir.join('2018-01-02.dat')), chunksize=100, date_to='2018-01-02 00:10')
+    assert pd.concat(chunks).index.equals(data.index[144:146])
+    assert not tmpdir.join('.brightwind_time_index.json').check()
+
+
+def test_load_csv_store_folder(tmpdir, monkeypatch):
+    data_folder = tmpdir.mkdir('data')
+    store_folder = str(tmpdir.join('store'))
+    _write_daily_files(data_folder, 3)
+    assert bw.load_csv(str(data_folder), store_folder=store_folder).equals(bw.load_csv(str(data_folder)))
+    segment_0 = tmpdir.join('store', 'segment_0', 'col_0.npy').stat().ino
+
+    files_read = []
+    read_csv = bw.load.load._pandas_read_csv
+
+    @functools.wraps(read_csv)
+    def _counting_read_csv(filepath, **kwargs):
+        files_read.append(filepath)
+        return read_csv(filepath, **kwargs)
+
+    monkeypatch.setattr(bw.load.load, '_pandas_read_csv', _counting_read_csv)
+    _write_daily_files(data_folder, 1, start='2018-01-04')
+    df = bw.load_csv(str(data_folder), store_folder=store_folder)
+    assert len(files_read) == 1
+    assert df.equals(bw.load_csv(str(data_folder)))
+    # the new file is written to a new segment and the first segment is left as it was
+    assert sorted(path.basename for path in tmpdir.join('store').listdir()) == \
+        ['manifest.json', 'segment_0', 'segment_1']
+    assert tmpdir.join('store', 'segment_0', 'col_0.npy').stat().ino == segment_0
+
+    # a changed file replaces its rows in the store
+    data_folder.join('2018-01-04.csv').write('Timestamp,Spd80mN,Dir78mS\n2018-01-04 00:00:00,1.0,2.0\n')
+    del files_read[:]
+    df = bw.load_csv(str(data_folder), store_folder=store_folder)
+    assert len(files_read) == 1
+    assert len(df) == 3 * 144 + 1
+    assert df.equals(bw.load_csv(str(data_folder)))
+    # only the segment holding the changed file is rewritten
+    assert sorted(path.basename for path in tmpdir.join('store').listdir()) == \
+        ['manifest.json', 'segment_0', 'segment_2']
+    assert tmpdir.join('store', 'segment_0', 'col_0.npy').stat().ino == segment_0
+    del files_read[:]
+    assert bw.load_csv(str(data_folder), store_folder=store_folder).equals(df)
+    assert len(files_read) == 0
+
+
+def _fp2(value, exponent):
+    raw = (exponent << 13) | int(round(abs(value) * 10 ** exponent))
+    return raw | 0x8000 if value < 0 else raw
+
+
+def test_load_campbell_scientific_tob1(tmpdir):
+    import struct
+    header = ['"TOB1","Site","CR1000","1234","CR1000.Std.28","CPU:site.CR1","1234","Table1"',
+              '"SECONDS","NANOSECONDS","RECORD","Spd80mN","Dir78mS","Status"',
+              '"SECONDS","NANOSECONDS","RN","m/s","Deg",""',
+              '"","","","Avg","Smp","Smp"',
+              '"ULONG","ULONG","ULONG","IEEE4","FP2","ASCII(4)"']
+    seconds_1990_to_2018 = int((pd.Timestamp('2018-01-01') - pd.Timestamp('1990-01-01')).total_seconds())
+    records = b''.join(struct.pack('<III', seconds_1990_to_2018 + i * 600, 0, i) + struct.pack('<f', 2.5 * i) +
+                       struct.pack('>H', _fp2(value, 1)) + b'OK\x00\x00'
+                       for i, value in enumerate([123.4, -5.5, 359.0]))
+    file = tmpdir.join('tob1.dat')
+    file.write_binary(('\r\n'.join(header) + '\r\n').encode('ascii') + records)
+
+    df = bw.load_campbell_scientific(str(file))
+    assert df.index.name == 'TIMESTAMP'
+    assert df.index.equals(pd.date_range('2018-01-01', periods=3, freq='10min'))
+    assert list(df.columns) == ['RECORD', 'Spd80mN', 'Dir78mS', 'Status']
+    assert list(df.RECORD) == [0, 1, 2]
+    assert np.allclose(df.Spd80mN, [0, 2.5, 5.0])
+    assert np.allclose(df.Dir78mS, [123.4, -5.5, 359.0])
+    assert list(df.Status) == ['OK', 'OK', 'OK']
+
+
+def test_load_campbell_scientific_tob1_secnano(tmpdir):
+    import struct
+    header = ['"TOB1","Site","CR1000","1234","CR1000.Std.28","CPU:site.CR1","1234","Table1"',
+              '"SECONDS","NANOSECONDS","RECORD","Spd80mN","LastReset"', '"SECONDS","NANOSECONDS","RN","m/s",""',
+              '"","","","Avg","Smp"', '"ULONG","ULONG","ULONG","IEEE4","SecNano"']
+    seconds_1990_to_2018 = int((pd.Timestamp('2018-01-01') - pd.Timestamp('1990-01-01')).total_seconds())
+    records = b''.join(struct.pack('<IIIfII', seconds_1990_to_2018 + i * 600, 0, i, 2.5 * i,
+                                   seconds_1990_to_2018 - 3600, 500000000) for i in range(3))
+    file = tmpdir.join('tob1.dat')
+    file.write_binary(('\r\n'.join(header) + '\r\n').encode('ascii') + records)
+
+    df = bw.load_campbell_scientific(str(file))
+    assert df.index.equals(pd.date_range('2018-01-01', periods=3, freq='10min'))
+    assert np.allclose(df.Spd80mN, [0, 2.5, 5.0])
+    assert list(df.LastReset) == [pd.Timestamp('2017-12-31 23:00:00.5')] * 3
+
+
+def test_decode_fp2():
+    raw = np.array([_fp2(1.234, 3), _fp2(-81.91, 2), 0x1FFF, 0x9FFF, 0x9FFE], dtype=np.uint16)
+    decoded = bw.load.load._decode_fp2(raw)
+    assert np.allclose(decoded[:4], [1.234, -81.91, np.inf, -np.inf])
+    assert np.isnan(decoded[4])
+
+
+def _write_nrg_txt(file, start, periods):
+    header = ['Export Version:\t8', 'File Format:\tNRG Systems Text Export', 'Site Number:\t002', '',
+              'Site Properties', 'Site Description:\tTest mast', 'Latitude:\t53.4', 'Longitude:\t-7.2',
+              'Elevation:\t110', '', 'Logger History', 'Model:\t8206', 'Serial Number:\t820600001', '',
+              'Sensor History', 'Channel:\t1', 'Description:\tNRG S1', 'Serial Number:\t179500001', 'Height:\t80',
+              'Scale Factor:\t0.0911', 'Offset:\t0.4', 'Units:\tm/s', '', 'Channel:\t13', 'Description:\tNRG 200M',
+              'Serial Number:\t', 'Height:\t78', 'Units:\tDeg', '', 'Data',
+              'Timestamp\tCh1_Anem_80.00m_N_Avg_m/s\tCh1_Anem_80.00m_N_SD_m/s\tCh13_Vane_78.00m_N_Avg_Deg']
+    timestamps = pd.date_range(start, periods=periods, freq='10min')
+    rows = ['{0}\t{1}\t0.5\t{2}'.format(timestamp, i * 0.25, 90 + i) for i, timestamp in enumerate(timestamps)]
+    file.write('\r\n'.join(header + rows) + '\r\n')
+
+
+def test_load_nrg_txt(tmpdir):
+    file = tmpdir.join('002_2018-01-01.txt')
+    _write_nrg_txt(file, '2018-01-01', 6)
+    df = bw.load_nrg_txt(str(file))
+    assert df.index.equals(pd.date_range('2018-01-01', periods=6, freq='10min'))
+    assert list(df.columns) == ['Ch1_Anem_80.00m_N_Avg_m/s', 'Ch1_Anem_80.00m_N_SD_m/s', 'Ch13_Vane_78.00m_N_Avg_Deg']
+    assert (df.dtypes == np.float64).all()
+    assert list(df['Ch13_Vane_78.00m_N_Avg_Deg']) == [90, 91, 92, 93, 94, 95]
+    assert df.attrs['site']['Latitude'] == 53.4
+    assert df.attrs['logger']['Serial Number'] == '820600001'
+    assert [sensor['Height'] for sensor in df.attrs['sensors']] == [80, 78]
+    assert [sensor['Units'] for sensor in df.attrs['sensors']] == ['m/s', 'Deg']
+
+
+def test_load_nrg_txt_cache(tmpdir):
+    file = tmpdir.join('002_2018-01-01.txt')
+    _write_nrg_txt(file, '2018-01-01', 6)
+    cache_folder = str(tmpdir.join('cache'))
+    df = bw.load_nrg_txt(str(file), cache_folder=cache_folder)
+    cached_df = bw.load_nrg_txt(str(file), cache_folder=cache_folder)
+    assert cached_df.equals(df)
+    for name in ['site', 'logger', 'sensors', 'timestamp_format']:
+        assert cached_df.attrs[name] == df.attrs[name]
+
+
+def test_load_nrg_txt_folder(tmpdir):
+    _write_nrg_txt(tmpdir.join('002_2018-01-01.txt'), '2018-01-01', 6)
+    _write_nrg_txt(tmpdir.join('002_2018-01-02.txt'), '2018-01-02', 6)
+    df = bw.load_nrg_txt(str(tmpdir), workers=2)
+    assert len(df) == 12
+    assert df.index.is_monotonic_increasing
+    assert df.attrs['sensors'][0]['Serial Number'] == '179500001'
+
+
+def test_load_csv_compact(tmpdir):
+    file = tmpdir.join('data.csv')
+    file.write('Timestamp,Spd80mN,RECORD,Flag\n' +
+               ''.join('2018-01-01 {0:02d}:00:00,{1},{2},{3}\n'.format(i, i * 0.5, i, 'OK' if i % 4 else 'ICING')
+                       for i in range(24)))
+    df = bw.load_csv(str(file))
+    compact_df = bw.load_csv(str(file), compact=True)
+    assert compact_df.Spd80mN.dtype == np.float32
+    assert compact_df.RECORD.dtype == np.int8
+    assert str(compact_df.Flag.dtype) == 'category'
+    assert np.allclose(compact_df.Spd80mN, df.Spd80mN)
+    assert list(compact_df.Flag) == list(df.Flag)
+    memory_saved = compact_df.attrs['memory_saved']
+    assert list(memory_saved.index) == ['Spd80mN', 'RECORD', 'Flag']
+    assert (memory_saved['Saved Bytes'] > 0).all()
+
+
+class _BrightdataStandIn:
+    """
+    Local stand-in for the brightdata server, failing the first fail_first requests with a 503. Data is published up to
+    last_day.
+    """
+
+    def __init__(self, fail_first=0):
+        import http.server
+        import threading
+        import json
+        import urllib.parse
+        stand_in = self
+        self.fail_first = fail_first
+        self.last_day = '2018-01-10'
+        self.requests = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(self.path).query))
+                stand_in.requests.append(params)
+                if len(stand_in.requests) <= stand_in.fail_first:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                from_date = params.get('from_date', '2018-01-01')
+                to_date = min(params.get('to_date', stand_in.last_day), stand_in.last_day)
+                days = pd.date_range(from_date, to_date, freq='D')
+                body = json.dumps([{'latitude': str(float(params['latitude']) + node),
+                                    'longitude': params['longitude'],
+                                    'data': {str(day): {'WS50m_ms': day.day + 0.5, 'WD50m_deg': 270.0}
+                                             for day in days}}
+                                   for node in range(int(params['nearest']))])
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body.encode('utf-8'))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{0}/brightdata'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_brightdata_client_get_many():
+    stand_in = _BrightdataStandIn()
+    try:
+        with bw.BrightdataClient('user', 'password', base_url=stand_in.url, max_workers=3) as client:
+            results = client.get_many([('era5', 53.4, -7.2, 1), ('merra2', 54.0, -3.3, 1, '2018-01-01'),
+                                       {'dataset': 'era5', 'lat': 52.0, 'long': -9.0, 'nearest': 1}])
+    finally:
+        stand_in.close()
+    assert len(stand_in.requests) == 3
+    assert [nodes[0].latitude for nodes in results] == ['53.4', '54.0', '52.0']
+    assert [nodes[0].source for nodes in results] == ['era5', 'merra2', 'era5']
+    assert list(results[0][0].data['WS50m_ms']) == [day + 0.5 for day in range(1, 11)]
+
+
+def test_brightdata_client_retries():
+    stand_in = _BrightdataStandIn(fail_first=2)
+    try:
+        client = bw.BrightdataClient('user', 'password', base_url=stand_in.url, backoff_factor=0.01)
+        nodes = client.get('era5', 53.4, -7.2, 1)
+        client.close()
+    finally:
+        stand_in.close()
+    assert len(stand_in.requests) == 3
+    assert list(nodes[0].data['WD50m_deg']) == [270.0] * 10
+
+
+def test_brightdata_client_server_error():
+    stand_in = _BrightdataStandIn(fail_first=10)
+    try:
+        client = bw.BrightdataClient('user', 'password', base_url=stand_in.url, max_retries=1, backoff_factor=0.01)
+        with pytest.raises(Exception) as except_info:
+            client.get('era5', 53.4, -7.2, 1)
+    finally:
+        stand_in.close()
+    assert str(except_info.value) == 'Http code 503, something is wrong with the server.'
+
+
+def test_brightdata_client_cache(tmpdir):
+    stand_in = _BrightdataStandIn()
+    try:
+        client = bw.BrightdataClient('user', 'password', base_url=stand_in.url, cache_folder=str(tmpdir))
+        nodes = client.get('era5', 53.4, -7.2, 2, '2018-01-03', '2018-01-05')
+        assert [node.latitude for node in nodes] == ['53.4', '54.4']
+        assert len(nodes[1].data) == 3
+        # fully cached so no request is sent
+        nodes = client.get('era5', 53.4, -7.2, 2, '2018-01-04', '2018-01-05')
+        assert len(stand_in.requests) == 1
+        assert list(nodes[0].data['WS50m_ms']) == [4.5, 5.5]
+        # only the missing days either side are requested
+        nodes = client.get('era5', 53.4, -7.2, 2, '2018-01-01', '2018-01-08')
+        assert [(request['from_date'], request['to_date']) for request in stand_in.requests[1:]] == \
+            [('2018-01-01', '2018-01-02'), ('2018-01-06', '2018-01-08')]
+        assert nodes[1].data.index.equals(pd.date_range('2018-01-01', '2018-01-08', freq='D'))
+        assert list(nodes[0].data['WS50m_ms']) == [day + 0.5 for day in range(1, 9)]
+        client.close()
+    finally:
+        stand_in.close()
+
+
+def test_brightdata_client_cache_open_ended(tmpdir):
+    stand_in = _BrightdataStandIn()
+    try:
+        client = bw.BrightdataClient('user', 'password', base_url=stand_in.url, cache_folder=str(tmpdir))
+        client.get('era5', 53.4, -7.2, 2, '2018-01-03', '2018-01-05')
+        nodes = client.get('era5', 53.4, -7.2, 2, '2018-01-03', None)
+        assert nodes[1].data.index.equals(pd.date_range('2018-01-03', '2018-01-10', freq='D'))
+        # the open ended request is only covered up to the last day returned, so later days are asked for again
+        nodes = client.get('era5', 53.4, -7.2, 2, '2018-01-03', None)
+        assert [(request['from_date'], request.get('to_date')) for request in stand_in.requests] == \
+            [('2018-01-03', '2018-01-05'), ('2018-01-06', None), ('2018-01-11', None)]
+        assert nodes[0].data.index.equals(pd.date_range('2018-01-03', '2018-01-10', freq='D'))
+        client.close()
+    finally:
+        stand_in.close()
+
+
+def test_brightdata_client_cache_closed_range(tmpdir):
+    stand_in = _BrightdataStandIn()
+    try:
+        client = bw.BrightdataClient('user', 'password', base_url=stand_in.url, cache_folder=str(tmpdir))
+        client.get('era5', 53.4, -7.2, 1, '2018-01-08', '2018-01-12')
+        stand_in.last_day = '2018-01-12'
+        # the days after the last day returned are asked for again once they are published
+        nodes = client.get('era5', 53.4, -7.2, 1, '2018-01-08', '2018-01-12')
+        assert [(request['from_date'], request['to_date']) for request in stand_in.requests] == \
+            [('2018-01-08', '2018-01-12'), ('2018-01-11', '2018-01-12')]
+        assert nodes[0].data.index.equals(pd.date_range('2018-01-08', '2018-01-12', freq='D'))
+        client.close()
+    finally:
+        stand_in.close()
+
+
+def test_brightdata_client_cache_ttl(tmpdir):
+    stand_in = _BrightdataStandIn()
+    try:
+        client = bw.BrightdataClient('user', 'password', base_url=stand_in.url, cache_folder=str(tmpdir),
+                                     cache_ttl=0)
+        client.get('era5', 53.4, -7.2, 1, '2018-01-03', '2018-01-05')
+        client.get('era5', 53.4, -7.2, 1, '2018-01-03', '2018-01-05')
+        assert len(stand_in.requests) == 2
+        client.close()
+    finally:
+        stand_in.close()
+
+
+def test_default_brightdata_client(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    monkeypatch.setattr(bw.load.load, '_default_brightdata_clients', {})
+    monkeypatch.setattr(bw.BrightdataClient, 'get', lambda self, *args: self)
+    monkeypatch.setenv('BRIGHTDATA_USERNAME', 'user')
+    monkeypatch.setenv('BRIGHTDATA_PASSWORD', 'password')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: bw.load.load._get_brightdata('era5', 53.4, -7.2, 1, None, None),
+                                    range(8)))
+    assert all(client is clients[0] for client in clients)
+    # changed credentials get a new client
+    monkeypatch.setenv('BRIGHTDATA_PASSWORD', 'new password')
+    client = bw.load.load._get_brightdata('era5', 53.4, -7.2, 1, None, None)
+    assert client.session.auth == ('user', 'new password')
+    assert clients[0].session.auth == ('user', 'password')
+    for client in bw.load.load._default_brightdata_clients.values():
+        client.close()
+
+
+def test_brightdata_node_to_df():
+    node_data = {'2018-01-01 00:00:00': {'WS50m_ms': 5.5, 'WD50m_deg': 270, 'Flag': 'ok'},
+                 '2018-01-01 01:00:00': {'WS50m_ms': 6.5, 'WD50m_deg': 280, 'Flag': 'ok'},
+                 '2018-01-01 02:00:00': {'WS50m_ms': 7.5, 'Flag': 'ok'}}
+    df = bw.load.load._brightdata_node_to_df(node_data)
+    assert df.index.equals(pd.date_range('2018-01-01', periods=3, freq='H'))
+    assert list(df.columns) == ['WS50m_ms', 'WD50m_deg', 'Flag']
+    assert list(df.WS50m_ms) == [5.5, 6.5, 7.5]
+    assert df.WD50m_deg.iloc[:2].tolist() == [270.0, 280.0] and np.isnan(df.WD50m_deg.iloc[2])
+    assert list(df.Flag) == ['ok'] * 3
+
+
+def test_append_files_together(tmpdir):
+    data = _write_daily_files(tmpdir.mkdir('data'), 3)
+    file_path = bw.load.load._append_files_together(str(tmpdir.join('data')), 'assembled.txt', ['.csv'])
+    with open(file_path) as file:
+        assert sum(line.startswith('Timestamp') for line in file) == 1
+    assert np.allclose(bw.load_csv(file_path).values, data.values)
+    file_path = bw.load.load._append_files_together(str(tmpdir.join('data')), 'assembled.csv.gz', ['.csv'],
+                                                    compression='gzip')
+    assert bw.load_csv(file_path).index.equals(data.index)
+    with pytest.raises(ValueError):
+        bw.load.load._append_files_together(str(tmpdir.join('data')), 'assembled.csv.xz', ['.csv'], compression='xz')
+
+
+def test_append_files_together_day_first(tmpdir):
+    # the files are named so their path order isn't their time order
+    for file_name, start in [('a.csv', '2018-02-01'), ('b.csv', '2018-01-12')]:
+        timestamps = pd.date_range(start, periods=3, freq='10min')
+        pd.DataFrame({'Spd80mN': 1.0}, index=pd.Index(timestamps.strftime('%d/%m/%Y %H:%M'), name='Timestamp')) \
+            .to_csv(str(tmpdir.join(file_name)))
+    file_path = bw.load.load._append_files_together(str(tmpdir), 'assembled.txt', ['.csv'], dayfirst=True)
+    df = bw.load_csv(file_path, dayfirst=True)
+    assert df.index.is_monotonic_increasing and df.index[0] == pd.Timestamp('2018-01-12')
+    # a day after the 12th shows the files are day first without being told
+    pd.DataFrame({'Spd80mN': 1.0}, index=pd.Index(['13/02/2018 00:00'], name='Timestamp')).to_csv(
+        str(tmpdir.join('c.csv')))
+    file_path = bw.load.load._append_files_together(str(tmpdir), 'assembled.txt', ['.csv'])
+    assert bw.load_csv(file_path, dayfirst=True).index.is_monotonic_increasing
+
+
+def test_assemble_files_to_folder(tmpdir):
+    _write_daily_files(tmpdir.mkdir('a'), 2)
+    _write_daily_files(tmpdir.mkdir('b'), 2)
+    _write_daily_files(tmpdir.mkdir('c'), 1, start='2018-01-02')
+    with open(str(tmpdir.join('c', '2018-01-02.csv')), 'a') as file:
+        file.write('2018-01-03 00:00:00,1.0,1.0\n')
+    destination = tmpdir.mkdir('assembled')
+    summary = bw.load.load._assemble_files_to_folder(str(tmpdir), str(destination), ['.csv'], link='hard')
+    assert sorted(destination.listdir()) == [destination.join('2018-01-01.csv'), destination.join('2018-01-02.csv')]
+    assert summary.Action.value_counts().to_dict() == {'copied': 2, 'skipped': 3}
+    assert str(tmpdir.join('c', '2018-01-02.csv')) in summary[summary.Action == 'copied'].Source.tolist()
+    summary = bw.load.load._assemble_files_to_folder(str(tmpdir), str(destination), ['.csv'])
+    assert (summary.Action == 'skipped').all()
+
+    # a bad link is rejected before the file already in destination_folder is touched
+    destination.join('2018-01-01.csv').write('Timestamp,Spd80mN,Dir78mS\n2018-01-01 00:00:00,1.0,2.0\n')
+    with pytest.raises(ValueError):
+        bw.load.load._assemble_files_to_folder(str(tmpdir), str(destination), ['.csv'], link='symlink')
+    assert destination.join('2018-01-01.csv').read().startswith('Timestamp')
+    summary = bw.load.load._assemble_files_to_folder(str(tmpdir), str(destination), ['.csv'], link='hard')
+    assert (summary.Action == 'replaced').sum() == 1
+    assert sorted(destination.listdir()) == [destination.join('2018-01-01.csv'), destination.join('2018-01-02.csv')]
+
+
+def test_assemble_files_to_folder_day_first(tmpdir):
+    # read month first a.csv would cover 2 January to 2 December, longer than the whole of February in b.csv
+    for folder, timestamps in [('a', ['01/02/2018 00:00', '12/02/2018 00:00']),
+                               ('b', ['01/02/2018 00:00', '28/02/2018 00:00'])]:
+        pd.DataFrame({'Spd80mN': 1.0}, index=pd.Index(timestamps, name='Timestamp')).to_csv(
+            str(tmpdir.mkdir(folder).join('data.csv')))
+    destination = tmpdir.mkdir('assembled')
+    summary = bw.load.load._assemble_files_to_folder(str(tmpdir), str(destination), ['.csv'], dayfirst=True)
+    assert summary[summary.Action == 'copied'].Source.tolist() == [str(tmpdir.join('b', 'data.csv'))]
+
+
+def test_infer_timestamp_format():
+    assert bw.load.load._infer_timestamp_format(['2018-01-01 00:00:00', '2018-01-01 00:10:00']) == '%Y-%m-%d %H:%M:%S'
+    assert bw.load.load._infer_timestamp_format(['12/01/2018 23:50', '13/01/2018 00:00']) == '%d/%m/%Y %H:%M'
+    assert bw.load.load._infer_timestamp_format(['1514764800', '1514765400']) == 'epoch_s'
+    assert bw.load.load._infer_timestamp_format(['1514764800000']) == 'epoch_ms'
+    assert bw.load.load._infer_timestamp_format(['not a timestamp']) is None
+
+
+def test_load_csv_timestamp_format(tmpdir):
+    data = _write_daily_files(tmpdir.mkdir('iso'), 2)
+    assert bw.load_csv(str(tmpdir.join('iso'))).attrs['timestamp_format'] == '%Y-%m-%d %H:%M:%S'
+    day_first = _write_daily_files(tmpdir.mkdir('days'), 20)
+    day_first.index = day_first.index.strftime('%d/%m/%Y %H:%M')
+    day_first.to_csv(str(tmpdir.join('day_first.csv')))
+    df = bw.load_csv(str(tmpdir.join('day_first.csv')))
+    assert df.attrs['timestamp_format'] == '%d/%m/%Y %H:%M'
+    assert df.index.equals(pd.date_range('2018-01-01', periods=20 * 144, freq='10min'))
+    epoch = data.copy()
+    epoch.index = data.index.astype(np.int64) // 10 ** 9
+    epoch.to_csv(str(tmpdir.mkdir('epoch').join('epoch.csv')))
+    df = bw.load_csv(str(tmpdir.join('epoch', 'epoch.csv')))
+    assert df.attrs['timestamp_format'] == 'epoch_s'
+    assert df.index.equals(data.index)
+    # A file that doesn't match the format detected for its folder falls back to its own format.
+    epoch.to_csv(str(tmpdir.join('epoch.csv')))
+    assert bw.load_csv(str(tmpdir.join('epoch.csv'))).index.equals(data.index)
+    # Days up to 12 could be months too, so dayfirst decides.
+    ambiguous = _write_daily_files(tmpdir.mkdir('ambiguous'), 3)
+    ambiguous.index = ambiguous.index.strftime('%d/%m/%Y %H:%M')
+    ambiguous.to_csv(str(tmpdir.join('ambiguous.csv')))
+    df = bw.load_csv(str(tmpdir.join('ambiguous.csv')), dayfirst=True)
+    assert df.attrs['timestamp_format'] == '%d/%m/%Y %H:%M'
+    assert df.index.equals(pd.date_range('2018-01-01', periods=3 * 144, freq='10min'))
+
+
+def test_load_csv_date_range(tmpdir, monkeypatch):
+    data = _write_daily_files(tmpdir, 10)
+    df = bw.load_csv(str(tmpdir), date_from='2018-01-04', date_to='2018-01-05 23:50')
+    assert df.equals(bw.load_csv(str(tmpdir)).loc['2018-01-04':'2018-01-05'])
+    assert tmpdir.join('.brightwind_time_index.json').check()
+
+    files_read = []
+    read_csv = bw.load.load._pandas_read_csv
+
+    @functools.wraps(read_csv)
+    def _counting_read_csv(filepath, **kwargs):
+        files_read.append((filepath, kwargs.get('nrows')))
+        return read_csv(filepath, **kwargs)
+
+    monkeypatch.setattr(bw.load.load, '_pandas_read_csv', _counting_read_csv)
+    df = bw.load_csv(str(tmpdir), date_from='2018-01-09')
+    assert df.index.equals(data.loc['2018-01-09':].index)
+    assert sorted(files_read) == [(str(tmpdir.join('2018-01-09.csv')), None),
+                                  (str(tmpdir.join('2018-01-10.csv')), None)]
+    df = bw.load_csv(str(tmpdir.join('2018-01-09.csv')), date_to='2018-01-09 00:10')
+    assert df.index.equals(data.index[1152:1154])
@@ -62,3 +62,175 @@ def test_adjust_slope_offset_arg_wndspd_series_str():
     with pytest.raises(TypeError) as except_info:
         bw.adjust_slope_offset(pd.Series([2, 3, '4', 5]), current_slope, current_offset, new_slope, new_offset)
     assert str(except_info.value) == "some values in the Series are not of data type number"
+
+
+def test_keep_float32_dtypes():
+    data = pd.DataFrame({'Spd': np.arange(12, dtype=np.float32), 'Count': np.arange(12)},
+                        index=pd.date_range('2018-01-01', periods=12, freq='10min'))
+    averaged = data.resample('1H').mean().astype(np.float64)
+    averaged = bw.transform.transform._keep_float32_dtypes(averaged, data)
+    assert averaged.Spd.dtype == np.float32
+    assert averaged.Count.dtype == np.float64
+
+
+def test_average_data_by_period():
+    data = pd.DataFrame({'Spd': np.arange(144 * 31, dtype=float)},
+                        index=pd.date_range('2018-01-01', periods=144 * 31, freq='10min')).drop(
+        pd.date_range('2018-01-01 00:10', periods=3, freq='10min'))
+    hourly, coverage = bw.average_data_by_period(data.sample(frac=1, random_state=0), '1H', return_coverage=True)
+    assert hourly.Spd.iloc[:2].tolist() == [3.0, 8.5]
+    assert coverage.Spd_Coverage.iloc[:2].tolist() == [0.5, 1.0]
+    monthly, coverage = bw.average_data_by_period(data.Spd, '1M', return_coverage=True)
+    assert coverage.tolist() == [(144 * 31 - 3) / (144 * 31)]
+
+
+def test_average_by_period_statistics():
+    data = pd.Series(np.arange(12, dtype=float), index=pd.date_range('2018-01-01', periods=12, freq='10min'))
+    results = bw.transform.transform._average_by_period(data, '1H', ['mean', 'std', 'min', 'max', 'count', 'coverage'])
+    assert results['mean'].tolist() == [2.5, 8.5]
+    assert results['min'].tolist() == [0.0, 6.0] and results['max'].tolist() == [5.0, 11.0]
+    assert np.allclose(results['std'], data.iloc[:6].std())
+    assert results['count'].tolist() == [6, 6] and results['coverage'].tolist() == [1.0, 1.0]
+
+
+def test_get_data_resolution():
+    index = pd.date_range('2018-01-01', periods=1000, freq='10min').delete([5, 6, 100])
+    assert bw.transform.transform._get_data_resolution(index) == pd.Timedelta('10min')
+    assert bw.transform.transform._get_data_resolution(index) is bw.transform.transform._get_data_resolution(index)
+    with pytest.warns(UserWarning):
+        resolution = bw.transform.transform._get_data_resolution(pd.DatetimeIndex(
+            ['2018-01-01 00:00', '2018-01-01 00:05', '2018-01-01 00:15', '2018-01-01 00:25']))
+    assert resolution == pd.Timedelta('10min')
+
+
+def test_average_on_regular_grid():
+    index = pd.date_range('2018-01-01 03:20', periods=2000, freq='10min').delete([5, 6, 700])
+    data = pd.DataFrame({'Spd': np.random.rand(len(index)), 'Dir': np.random.rand(len(index))}, index=index)
+    data.iloc[10:40, 0] = np.nan
+    original = data.copy()
+    statistics = ['mean', 'std', 'min', 'max', 'sum', 'count']
+    for period in ['1H', '1D', '7H']:
+        results = bw.transform.transform._average_on_regular_grid(data, period, statistics + ['coverage'])
+        grouped = data.resample(period)
+        for statistic in statistics:
+            pd.testing.assert_frame_equal(results[statistic], grouped.agg(statistic), check_freq=False,
+                                          check_dtype=False)
+        k = pd.Timedelta(period) / pd.Timedelta('10min')
+        pd.testing.assert_frame_equal(results['coverage'], grouped.count() / k, check_freq=False)
+    pd.testing.assert_frame_equal(data, original)
+    # Calendar periods, irregular data and other statistics fall back to the pandas resampler.
+    assert bw.transform.transform._average_on_regular_grid(data, '1MS', ['mean']) is None
+    off_grid = data.iloc[:4].set_axis(data.index[:3].append(pd.DatetimeIndex(['2018-01-01 03:55'])))
+    assert bw.transform.transform._average_on_regular_grid(off_grid, '1H', ['mean']) is None
+    assert bw.transform.transform._average_on_regular_grid(data, '1H', ['median']) is None
+    assert bw.transform.transform._average_by_period(data, '1MS', ['mean'])['mean'].shape == (1, 2)
+
+
+def test_offset_wind_direction():
+    directions = pd.Series([350.0, 10.0, 0.0, 360.0], name='Dir')
+    assert bw.offset_wind_direction(directions, 20)['Dir'].tolist() == [10.0, 30.0, 20.0, 20.0]
+    assert bw.offset_wind_direction(directions.to_frame(), -380)['Dir'].tolist() == [330.0, 350.0, 340.0, 340.0]
+    assert bw.offset_wind_direction(350.0, 20) == 10.0
+    assert bw.utils.utils._direction_difference(pd.Series([10.0, 350.0]), pd.Series([350.0, 10.0])).tolist() == \
+        [20.0, -20.0]
+
+
+def test_average_data_by_period_vector_mean():
+    index = pd.date_range('2018-01-01', periods=6, freq='10min')
+    directions = pd.Series([350.0, 10.0, 0.0, 340.0, np.nan, 20.0], index=index, name='Dir')
+    averaged = bw.average_data_by_period(directions, '30min', aggregation_method='vector_mean')
+    assert np.allclose(np.cos(np.radians(averaged)), 1) and averaged.name == 'Dir'
+    speeds = pd.Series([10.0, 0.0, 0.0, 1.0, 1.0, 1.0], index=index)
+    weighted = bw.average_data_by_period(directions, '1H', aggregation_method='vector_mean', wind_speed=speeds)
+    radians = np.radians([350.0, 340.0, 20.0])
+    expected = np.degrees(np.arctan2(np.dot([10, 1, 1], np.sin(radians)), np.dot([10, 1, 1], np.cos(radians)))) + 360
+    assert weighted.iloc[0] == pytest.approx(expected)
+
+
+def test_streaming_averager():
+    index = pd.date_range('2018-01-30 03:20', periods=3000, freq='10min').delete(range(500, 700))
+    data = pd.DataFrame({'Spd': np.random.rand(len(index)), 'Dir': np.random.rand(len(index)) * 360}, index=index)
+    data.iloc[10:40, 0] = np.nan
+    for period, aggregation_method in [('1H', 'mean'), ('7H', 'std'), ('1MS', 'mean'), ('1D', 'vector_mean'),
+                                       ('1H', 'sum'), ('1H', 'count')]:
+        averager = bw.StreamingAverager(period, aggregation_method, return_coverage=True)
+        # The chunk of one row at 500 comes after a gap in the data, so the hours of the gap are completed empty.
+        results = [averager.add(data.iloc[start:start + size]) for start, size in [(0, 1), (1, 5), (6, 494),
+                                                                                 (500, 1), (501, 2299)]]
+        results.append(averager.flush())
+        averaged, coverage = bw.average_data_by_period(data, period, aggregation_method, return_coverage=True)
+        pd.testing.assert_frame_equal(pd.concat([result[0] for result in results]), averaged, check_freq=False)
+        pd.testing.assert_frame_equal(pd.concat([result[1] for result in results]), coverage, check_freq=False)
+    with pytest.raises(ValueError):
+        averager.add(data.iloc[:10])
+        averager.add(data.iloc[5:20])
+
+
+def test_time_pyramid():
+    index = pd.date_range('2018-01-30 03:20', periods=20000, freq='10min').delete(range(500, 700))
+    data = pd.DataFrame({'Spd': np.random.rand(len(index)), 'Dir': np.random.rand(len(index)) * 360}, index=index)
+    data.iloc[10:40, 0] = np.nan
+    pyramid = bw.TimePyramid(data, levels=['1H', '1D', '1MS', '1AS'])
+    for period, aggregation_method in [('1H', 'mean'), ('1D', 'std'), ('1MS', 'sum'), ('1MS', 'count'),
+                                       ('1AS', 'mean')]:
+        averaged, coverage = pyramid.average(period, aggregation_method, return_coverage=True)
+        expected, expected_coverage = bw.average_data_by_period(data, period, aggregation_method,
+                                                                return_coverage=True)
+        pd.testing.assert_frame_equal(averaged, expected, check_freq=False, rtol=1e-10)
+        pd.testing.assert_frame_equal(coverage, expected_coverage, check_freq=False)
+    with pytest.raises(ValueError):
+        pyramid.average('10min')
+    with pytest.raises(ValueError):
+        bw.TimePyramid(data, levels=['1D', '1W', '1MS'])
+    # The std keeps its precision for a large mean with a small spread, e.g. air pressure.
+    pressure = pd.Series(1013 + np.random.default_rng(1).normal(0, 0.01, len(index)), index=index)
+    for period in ['1H', '1D', '1MS']:
+        pd.testing.assert_series_equal(bw.TimePyramid(pressure).average(period, 'std'),
+                                       bw.average_data_by_period(pressure, period, 'std'), check_freq=False,
+                                       rtol=1e-9)
+    # The analyse functions look the monthly values up in a pyramid when one is sent.
+    pyramid = bw.TimePyramid(data)
+    assert bw.coverage(data, period='1M', pyramid=pyramid).equals(bw.coverage(data, period='1M'))
+    assert bw.momm(data, pyramid=pyramid).loc['Dir', 'MOMM'] == pytest.approx(bw.momm(data).loc['Dir', 'MOMM'])
+
+
+def test_selective_avg():
+    index = pd.date_range('2018-01-01', periods=6, freq='10min')
+    data = pd.DataFrame({'Spd1': [5, 5, 5, np.nan, 5, np.nan], 'Spd2': [7, 7, 7, 7, np.nan, np.nan],
+                         'Dir': [135, 315, 45, 315, np.nan, 135]}, index=index, dtype=float)
+    sel_avg = bw.selective_avg(data[['Spd1', 'Spd2']], data['Dir'], boom_dirs=[135, 315], exclusion_span=60)
+    assert sel_avg.equals(pd.Series([5, 7, 6, 7, 5, np.nan], index=index, dtype=float))
+    assert sel_avg.equals(bw.selective_avg([data['Spd1'], data['Spd2']], data['Dir'], [135, 315], [60, 60]))
+    # Three booms 120 degrees apart, only the anemometer at 0 degrees is in the wake of the mast at 180 degrees.
+    sel_avg = bw.selective_avg(pd.DataFrame({'Spd1': [4.0], 'Spd2': [6.0], 'Spd3': [8.0]}), pd.Series([180.0]),
+                               boom_dirs=[0, 120, 240], exclusion_span=90)
+    assert sel_avg[0] == 7
+    with pytest.raises(ValueError):
+        bw.selective_avg(data[['Spd1', 'Spd2']], data['Dir'], boom_dirs=[135])
+
+
+def test_apply_calibrations():
+    index = pd.date_range('2018-01-01', periods=10, freq='1D')
+    data = pd.DataFrame({'Spd1': np.arange(10, dtype=float), 'Spd2': np.arange(10, dtype=float) + 0.5,
+                         'Dir': np.arange(10, dtype=float)}, index=index)
+    calibrations = pd.DataFrame([['Spd1', None, '2018-01-04', current_slope, current_offset, new_slope, new_offset],
+                                 ['Spd1', '2018-01-04', None, new_slope, new_offset, current_slope, current_offset],
+                                 ['Spd2', '2018-01-03', '2018-01-06', 0.046, 0.2, 0.047, 0.3]],
+                                columns=['channel', 'valid_from', 'valid_to', 'current_slope', 'current_offset',
+                                         'new_slope', 'new_offset'])
+    adjusted = bw.apply_calibrations(data, calibrations)
+    expected = data.copy()
+    expected.iloc[:3, 0] = bw.adjust_slope_offset(data.iloc[:3, 0], current_slope, current_offset, new_slope,
+                                                  new_offset)
+    expected.iloc[3:, 0] = bw.adjust_slope_offset(data.iloc[3:, 0], new_slope, new_offset, current_slope,
+                                                  current_offset)
+    expected.iloc[2:5, 1] = bw.adjust_slope_offset(data.iloc[2:5, 1], 0.046, 0.2, 0.047, 0.3)
+    assert adjusted.equals(expected)
+    assert bw.apply_calibrations(data.iloc[::-1], calibrations).equals(expected.iloc[::-1])
+    assert bw.apply_calibrations(data['Spd2'], calibrations).equals(expected['Spd2'])
+    with pytest.raises(ValueError):
+        bw.apply_calibrations(data, calibrations.assign(valid_from='2018-01-02'))
+    with pytest.raises(ValueError):
+        bw.apply_calibrations(data, calibrations.assign(channel='Spd3'))
+    with pytest.raises(TypeError):
+        bw.apply_calibrations(data, calibrations.assign(new_slope='0.046'))
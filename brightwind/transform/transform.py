@@ -16,17 +16,10 @@
 
 import numpy as np
 import pandas as pd
-import math
 from ..utils import utils
 
-__all__ = ['average_data_by_period', 'adjust_slope_offset', 'scale_wind_speed', 'offset_wind_direction']
-
-
-def _compute_wind_vector(wspd, wdir):
-    """
-    Returns north and east component of wind-vector
-    """
-    return wspd*np.cos(wdir), wspd*np.sin(wdir)
+__all__ = ['average_data_by_period', 'StreamingAverager', 'TimePyramid', 'adjust_slope_offset', 'scale_wind_speed',
+           'offset_wind_direction', 'selective_avg', 'apply_calibrations']
 
 
 def _convert_days_to_hours(prd):
@@ -48,21 +41,52 @@ def _get_min_overlap_timestamp(df1_timestamps, df2_timestamps):
     return max(df1_timestamps.min(), df2_timestamps.min())
 
 
+# Resolutions already found, keyed by the id of the index, with a weak reference to the index so entries are removed
+# when the index is garbage collected.
+_data_resolutions = {}
+
+
 def _get_data_resolution(data_idx):
     """
     Get the frequency of data i.e. the most common time interval between timestamps. Returns a timedelta object
+
+    The intervals are found from the int64 nanosecond timestamps, and the result is remembered for the index object so
+    calling this again with the same index is free.
     """
     import warnings
-    time_diff_btw_timestamps = data_idx.to_series().diff()
-    most_freq_time_diff = time_diff_btw_timestamps.mode().values[0]
+    import weakref
+    key = id(data_idx)
+    if key in _data_resolutions and _data_resolutions[key][0]() is data_idx:
+        return _data_resolutions[key][1]
+    timestamps = data_idx.asi8
+    time_diff_btw_timestamps = np.diff(timestamps[timestamps != pd.NaT.value])
+    if len(time_diff_btw_timestamps) == 0:
+        raise IndexError('At least two timestamps are needed to find the resolution of the data.')
     minimum_time_diff = time_diff_btw_timestamps.min()
+    if minimum_time_diff == time_diff_btw_timestamps.max():
+        most_freq_time_diff = minimum_time_diff
+    elif minimum_time_diff > 0:
+        # Count the intervals in units of their greatest common divisor, e.g. 10 minutes, with np.bincount unless the
+        # largest gap would need too many bins.
+        divisor = np.gcd.reduce(time_diff_btw_timestamps)
+        steps = time_diff_btw_timestamps // divisor
+        if steps.max() <= 10 * len(steps) + 1000:
+            most_freq_time_diff = np.argmax(np.bincount(steps)) * divisor
+        else:
+            time_diffs, counts = np.unique(time_diff_btw_timestamps, return_counts=True)
+            most_freq_time_diff = time_diffs[np.argmax(counts)]
+    else:
+        time_diffs, counts = np.unique(time_diff_btw_timestamps, return_counts=True)
+        most_freq_time_diff = time_diffs[np.argmax(counts)]
     if minimum_time_diff != most_freq_time_diff:
         warnings.warn("Frequency of input data might not be determined correctly (most frequent time "
                       "difference between adjacent timestamps"
                       " does not match minimum time difference) most frequent time difference: {0}  "
                       "minimum time difference {1}. Using most frequent time difference as resolution"
-                      .format(pd.to_timedelta(most_freq_time_diff, unit='s'), minimum_time_diff))
-    return pd.to_timedelta(most_freq_time_diff, unit='s')
+                      .format(pd.Timedelta(most_freq_time_diff), pd.Timedelta(minimum_time_diff)))
+    resolution = pd.Timedelta(most_freq_time_diff)
+    _data_resolutions[key] = (weakref.ref(data_idx, lambda _: _data_resolutions.pop(key, None)), resolution)
+    return resolution
 
 
 def _round_timestamp_down_to_averaging_prd(timestamp, period):
@@ -100,22 +124,254 @@ def _get_overlapping_data(df1, df2, period):
     return df1[start:], df2[start:]
 
 
-def _max_coverage_count(data_index, averaged_data_index)->pd.Series:
+def _max_coverage_count(data_index, averaged_data_index, data_resolution=None)->pd.Series:
+    """
+    For a given resolution of data finds the maximum number of data points in the averaging period. The resolution is
+    found from data_index unless data_resolution is given.
+    """
+    if data_resolution is None:
+        data_resolution = _get_data_resolution(data_index)
+    period_ends = averaged_data_index + averaged_data_index.freq
+    return pd.Series((period_ends - averaged_data_index) / data_resolution, index=averaged_data_index)
+
+
+def _keep_float32_dtypes(result, data, by_position=False):
+    """
+    Cast float64 columns of an aggregated result back to float32 where the data they came from was float32, so data
+    loaded with compact=True is not upcast when it is averaged. With by_position the columns of the result are matched
+    to those of data by position rather than name, e.g. for the <column name>_Coverage columns of the coverage.
     """
-    For a given resolution of data finds the maximum number of data points in the averaging period
+    if isinstance(result, pd.Series) and isinstance(data, pd.Series):
+        if data.dtype == np.float32 and result.dtype == np.float64:
+            return result.astype(np.float32)
+    elif isinstance(result, pd.DataFrame) and isinstance(data, pd.DataFrame) and \
+            (result.columns.equals(data.columns) or (by_position and len(result.columns) == len(data.columns))):
+        narrow_columns = [i for i in range(len(data.columns))
+                          if data.dtypes.iloc[i] == np.float32 and result.dtypes.iloc[i] == np.float64]
+        if narrow_columns:
+            return result.astype({result.columns[i]: np.float32 for i in narrow_columns})
+    return result
+
+
+def _normalise_averaging_period(period):
     """
-    max_pts = (averaged_data_index.to_series().diff().shift(-1)) / _get_data_resolution(data_index)
-    max_pts[-1] = ((averaged_data_index[-1] + 1) - averaged_data_index[-1]) / _get_data_resolution(data_index)
-    return max_pts
+    Convert an averaging period to the frequency used to resample the data, e.g. '1D' to '24H' and '1M' to '1MS'.
+    """
+    if isinstance(period, str):
+        if period[-1] == 'D':
+            period = _convert_days_to_hours(period)
+        if period[-1] == 'W':
+            period = _convert_weeks_to_hours(period)
+        if period[-1] == 'M':
+            period = period+'S'
+        if period[-1] == 'Y':
+            raise TypeError("Please use '1AS' for annual frequency at the start of the year.")
+    return period
 
 
-def _get_coverage_series(data, grouper_obj):
-    coverage = grouper_obj.count().divide(_max_coverage_count(data.index, grouper_obj.mean().index), axis=0)
-    return coverage
+_GRID_STATISTICS = ('mean', 'std', 'min', 'max', 'sum', 'count', 'coverage')
+
+
+def _average_on_regular_grid(data, period, statistics, origin='start_day', data_resolution=None):
+    """
+    Fast path for _average_by_period when the data is on a regular grid, e.g. 10-minute data, and the period is a
+    fixed length that is a whole multiple k of the resolution, e.g. 1H or 1D. The data is placed on the full grid and
+    viewed as an (n_periods, k) array for each column, without a copy if there are no gaps, and reduced with numpy
+    with the missing values masked out. The coverage is the count divided by k.
+
+    Returns None if the fast path can't be used, e.g. for calendar periods such as 1MS, irregular data, columns that
+    aren't float or statistics other than those in _GRID_STATISTICS. origin and data_resolution are as for
+    _average_by_period.
+    """
+    from pandas.tseries.frequencies import to_offset
+    from pandas.tseries.offsets import Tick
+    if len(data) < 2 or not all(isinstance(statistic, str) and statistic in _GRID_STATISTICS
+                                for statistic in statistics):
+        return None
+    dtypes = [data.dtype] if isinstance(data, pd.Series) else list(data.dtypes)
+    if not all(dtype in (np.float32, np.float64) for dtype in dtypes):
+        return None
+    offset = to_offset(period)
+    if not isinstance(offset, Tick) or not isinstance(data.index, pd.DatetimeIndex) or data.index.tz is not None:
+        return None
+    period_ns = offset.nanos
+    resolution_ns = (_get_data_resolution(data.index) if data_resolution is None else data_resolution).value
+    timestamps = data.index.asi8
+    if resolution_ns <= 0 or period_ns % resolution_ns:
+        return None
+    # Periods are counted from midnight of the first day, as the pandas resampler does, unless an origin is given.
+    first_day = data.index[0].normalize().value if origin == 'start_day' else pd.Timestamp(origin).value
+    start = first_day + (timestamps[0] - first_day) // period_ns * period_ns
+    k = period_ns // resolution_ns
+    if (timestamps[0] - start) % resolution_ns:
+        return None
+    first_position = (timestamps[0] - start) // resolution_ns
+    intervals = np.diff(timestamps)
+    if intervals.min() == intervals.max() == resolution_ns:
+        # No gaps, so the data is a contiguous run of the grid and the positions don't need to be worked out.
+        positions = None
+        last_position = first_position + len(timestamps) - 1
+    elif np.any(intervals <= 0) or np.any(intervals % resolution_ns):
+        return None
+    else:
+        positions = (timestamps - start) // resolution_ns
+        last_position = positions[-1]
+    n_periods = int(last_position // k) + 1
+    # Each column is laid out as a contiguous (n_periods, k) block so the reductions run along contiguous memory.
+    values = data.values.reshape(len(data), -1).T
+    if positions is None and first_position == 0 and len(timestamps) == n_periods * k:
+        grid = values
+        is_copy = False
+    else:
+        is_copy = True
+        grid = np.full((values.shape[0], n_periods * k), np.nan, dtype=values.dtype)
+        if positions is None:
+            grid[:, first_position:last_position + 1] = values
+        else:
+            grid[:, positions] = values
+    grid = grid.reshape(values.shape[0], n_periods, k)
+
+    # Numpy reductions along a short last axis are slow, so when k is small the k slices of each period are combined
+    # in turn instead. Either way each period is reduced in the same order whatever the other periods in the data, so
+    # the results don't depend on how the data is split up, e.g. by StreamingAverager.
+    def _reduce_periods(ufunc, array):
+        if k > 32:
+            return ufunc.reduce(array, axis=2)
+        result = array[:, :, 0].copy()
+        for i in range(1, k):
+            ufunc(result, array[:, :, i], out=result)
+        return result
+
+    results = {}
+    is_nan = np.isnan(grid)
+    count = k - _reduce_periods(np.add, is_nan.view(np.uint8)).astype(np.int64)
+    # fmin and fmax ignore NaNs, so periods with no data are NaN. They are found before the gaps are zeroed below.
+    for statistic in ('min', 'max'):
+        if statistic in statistics:
+            results[statistic] = _reduce_periods(np.fmin if statistic == 'min' else np.fmax, grid)
+    if count.min() < k:
+        if is_copy:
+            np.copyto(grid, 0, where=is_nan)
+        else:
+            grid = np.where(is_nan, 0, grid)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total = _reduce_periods(np.add, grid.astype(np.float64, copy=False))
+        mean = total / count
+        if 'std' in statistics:
+            deviations = np.where(is_nan, 0, grid - mean[:, :, np.newaxis])
+            variance = _reduce_periods(np.add, deviations * deviations) / (count - 1)
+            results['std'] = np.where(count > 1, np.sqrt(variance), np.nan)
+    for statistic in statistics:
+        if statistic == 'count':
+            results[statistic] = count
+        elif statistic == 'coverage':
+            results[statistic] = count / k
+        elif statistic == 'sum':
+            results[statistic] = total
+        elif statistic == 'mean':
+            results[statistic] = mean
+    results = {statistic: result.T for statistic, result in results.items()}
+    index = pd.date_range(pd.Timestamp(start), periods=n_periods, freq=offset, name=data.index.name)
+    for statistic, result in results.items():
+        if isinstance(data, pd.Series):
+            result = pd.Series(result[:, 0], index=index, name=data.name)
+        else:
+            result = pd.DataFrame(result, index=index, columns=data.columns)
+        results[statistic] = result if statistic in ('count', 'coverage') else _keep_float32_dtypes(result, data)
+    return results
+
+
+def _vector_mean_by_period(data, period, wind_speed=None, origin='start_day'):
+    """
+    Average wind directions for each averaging period as vectors, so that e.g. 350 and 10 degrees average to 0 rather
+    than 180. The north and east components of each direction, weighted by wind_speed if given, are averaged together
+    in one pass and recomposed into a direction.
+
+    :param data: Wind directions in degrees.
+    :type data: pandas.Series or pandas.DataFrame
+    :param period: The averaging period, see average_data_by_period.
+    :type period: str or pandas.DateOffset
+    :param wind_speed: Optional wind speeds to weight the directions by.
+    :type wind_speed: pandas.Series
+    :param origin: The timestamp fixed length periods are counted from, see _average_by_period.
+    :type origin: str or pandas.Timestamp
+    :return: The average direction for each period.
+    :rtype: pandas.Series or pandas.DataFrame
+    """
+    north, east = utils._direction_to_vector(data)
+    if wind_speed is not None:
+        if isinstance(wind_speed, pd.DataFrame):
+            wind_speed = wind_speed.squeeze(axis=1)
+        wind_speed = wind_speed.reindex(data.index)
+        north, east = north.multiply(wind_speed, axis=0), east.multiply(wind_speed, axis=0)
+    means = _average_by_period(pd.concat([north, east], axis=1, keys=['north', 'east']), period, ['mean'],
+                               origin=origin)['mean']
+    direction = utils._vector_to_direction(means['north'], means['east'])
+    return direction.rename(data.name) if isinstance(data, pd.Series) else direction
+
+
+def _average_by_period(data, period, statistics=('mean', 'coverage'), wind_speed=None, origin='start_day',
+                       data_resolution=None):
+    """
+    Compute a set of statistics of the data for each averaging period, grouping the data only once. The data is only
+    sorted if its index isn't already in time order, and the count used for the coverage is shared with the other
+    statistics.
+
+    :param data: The data to average.
+    :type data: pandas.Series or pandas.DataFrame
+    :param period: The averaging period, see average_data_by_period.
+    :type period: str or pandas.DateOffset
+    :param statistics: The statistics to compute. 'count' is the number of valid data points and 'coverage' the count
+           divided by the maximum number of data points in the period. Anything else, e.g. 'mean', 'std', 'min',
+           'max', 'sum' or a function, is passed to the aggregate function of the pandas resampler. 'vector_mean'
+           averages wind directions as vectors, see _vector_mean_by_period.
+    :type statistics: List or tuple
+    :param wind_speed: Optional wind speeds to weight the directions by for 'vector_mean'.
+    :type wind_speed: pandas.Series
+    :param origin: The timestamp fixed length periods such as 1H are counted from. By default this is midnight of
+           the first day in the data, as for the pandas resampler. Calendar periods such as 1MS aren't affected.
+    :type origin: str or pandas.Timestamp
+    :param data_resolution: The resolution of the data, found from the data if not given.
+    :type data_resolution: pandas.Timedelta or None
+    :return: The result of each statistic, keyed by the statistic.
+    :rtype: dict
+
+    Data on a regular grid averaged to a fixed period that is a multiple of its resolution, e.g. 10-minute data to
+    1H, is averaged by _average_on_regular_grid rather than the pandas resampler.
+    """
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index()
+    period = _normalise_averaging_period(period)
+    results = {}
+    if 'vector_mean' in statistics:
+        results['vector_mean'] = _vector_mean_by_period(data, period, wind_speed, origin)
+        statistics = [statistic for statistic in statistics if statistic != 'vector_mean']
+    grid_results = _average_on_regular_grid(data, period, statistics, origin, data_resolution)
+    if grid_results is not None:
+        results.update(grid_results)
+        return results
+    # origin is only passed when it's set so older versions of pandas, which don't have it, can still be used.
+    grouper_obj = data.resample(period, axis=0, closed='left', label='left', convention='start', kind='timestamp',
+                                **({} if origin == 'start_day' else {'origin': origin}))
+    count = None
+    for statistic in statistics:
+        if statistic in results:
+            continue
+        if isinstance(statistic, str) and statistic in ('count', 'coverage'):
+            if count is None:
+                count = grouper_obj.count()
+            if statistic == 'count':
+                results[statistic] = count
+            else:
+                results[statistic] = count.divide(_max_coverage_count(data.index, count.index, data_resolution),
+                                                  axis=0)
+        else:
+            results[statistic] = _keep_float32_dtypes(grouper_obj.agg(statistic), data)
+    return results
 
 
 def average_data_by_period(data: pd.Series, period, aggregation_method='mean', filter_by_coverage_threshold=False,
-                           coverage_threshold=1, return_coverage=False) -> pd.DataFrame:
+                           coverage_threshold=1, return_coverage=False, wind_speed=None) -> pd.DataFrame:
     """
     Averages the data by the time period specified by period.
     Set period to 1D for a daily average, 3D for three hourly average, similarly 5D, 7D, 15D etc.
@@ -124,23 +380,18 @@ def average_data_by_period(data: pd.Series, period, aggregation_method='mean', f
     Set period to 1AS for annual taking start of the year as the date
     For minutes use 10min, 20 min, etc.
     Can be a DateOffset object too
+    Set aggregation_method to 'vector_mean' to average wind directions as vectors, so that 350 and 10 degrees average
+    to 0 rather than 180. The directions are weighted by wind_speed if a Series of wind speeds is passed.
     """
-    data = data.sort_index()
-    if isinstance(period, str):
-        if period[-1] == 'D':
-            period = _convert_days_to_hours(period)
-        if period[-1] == 'W':
-            period = _convert_weeks_to_hours(period)
-        if period[-1] == 'M':
-            period = period+'S'
-        if period[-1] == 'Y':
-            raise TypeError("Please use '1AS' for annual frequency at the start of the year.")
-    grouper_obj = data.resample(period, axis=0, closed='left', label='left', base=0,
-                                convention='start', kind='timestamp')
+    results = _average_by_period(data, period, [aggregation_method, 'coverage'], wind_speed=wind_speed)
+    return _filter_by_coverage(results[aggregation_method], results['coverage'], filter_by_coverage_threshold,
+                               coverage_threshold, return_coverage)
 
-    grouped_data = grouper_obj.agg(aggregation_method)
-    coverage = _get_coverage_series(data, grouper_obj)
 
+def _filter_by_coverage(grouped_data, coverage, filter_by_coverage_threshold, coverage_threshold, return_coverage):
+    """
+    Filter averaged data by its coverage and name the coverage, as returned by average_data_by_period.
+    """
     if filter_by_coverage_threshold:
         grouped_data = grouped_data[coverage >= coverage_threshold]
 
@@ -156,6 +407,306 @@ def average_data_by_period(data: pd.Series, period, aggregation_method='mean', f
         return grouped_data
 
 
+class StreamingAverager:
+    """
+    Averages data that arrives in time ordered chunks, e.g. from load_campbell_scientific with chunksize set or from
+    a logger pushing new data, without holding the full history. Periods are averaged as soon as data after their end
+    arrives and the rows of the period still open are carried over to the next chunk, so the results match those of
+    average_data_by_period on all the data.
+
+    :param period: The averaging period, see average_data_by_period.
+    :type period: str or pandas.DateOffset
+    :param aggregation_method: As for average_data_by_period, e.g. 'mean', 'max' or 'vector_mean'.
+    :type aggregation_method: str or function
+    :param filter_by_coverage_threshold: As for average_data_by_period.
+    :type filter_by_coverage_threshold: bool
+    :param coverage_threshold: As for average_data_by_period.
+    :type coverage_threshold: float
+    :param return_coverage: As for average_data_by_period.
+    :type return_coverage: bool
+    :param data_resolution: The resolution of the data used to work out the coverage, e.g. '10min'. If not given it
+           is found from the first chunk, which is the same as the resolution average_data_by_period finds if the
+           data has a regular resolution.
+    :type data_resolution: str or pandas.Timedelta or None
+
+    **Example usage**
+    ::
+        import brightwind as bw
+        averager = bw.StreamingAverager('1H', return_coverage=True)
+        for chunk in bw.load_campbell_scientific(folder, chunksize=100000):
+            hourly_means, coverage = averager.add(chunk)
+        hourly_means, coverage = averager.flush()
+
+    """
+    def __init__(self, period, aggregation_method='mean', filter_by_coverage_threshold=False, coverage_threshold=1,
+                 return_coverage=False, data_resolution=None):
+        from pandas.tseries.frequencies import to_offset
+        self.period = _normalise_averaging_period(period)
+        self.offset = to_offset(self.period)
+        self.aggregation_method = aggregation_method
+        self.filter_by_coverage_threshold = filter_by_coverage_threshold
+        self.coverage_threshold = coverage_threshold
+        self.return_coverage = return_coverage
+        self.data_resolution = None if data_resolution is None else pd.Timedelta(data_resolution)
+        self._origin = None
+        self._next_period = None
+        self._pending = None
+        self._empty = pd.Series(dtype=float)
+
+    def _period_start(self, timestamp):
+        """
+        Returns the start of the averaging period that timestamp falls in.
+        """
+        from pandas.tseries.offsets import Tick
+        if isinstance(self.offset, Tick):
+            return self._origin + (timestamp - self._origin) // self.offset.delta * self.offset.delta
+        # Calendar periods such as 3MS are counted on from the first period, as the pandas resampler does.
+        period_start = self._next_period
+        while period_start + self.offset <= timestamp:
+            period_start += self.offset
+        return period_start
+
+    def add(self, chunk):
+        """
+        Add the next chunk of data and return the periods that are now complete, i.e. those that end at or before the
+        last timestamp in the chunk.
+
+        :param chunk: The next chunk of data, with timestamps after those of all the previous chunks.
+        :type chunk: pandas.Series or pandas.DataFrame
+        :return: The averaged data of the completed periods, and their coverage if return_coverage is True, as
+                 returned by average_data_by_period. These are empty if no period has been completed.
+        """
+        self._empty = chunk.iloc[:0]
+        if chunk.empty:
+            return self._average(pd.DatetimeIndex([]), chunk)
+        if not chunk.index.is_monotonic_increasing:
+            chunk = chunk.sort_index()
+        if self._pending is None:
+            first_timestamp = chunk.index[0]
+            self._origin = first_timestamp.normalize()
+            # Calendar periods start on or before the first day, e.g. at the start of its month for 1MS.
+            self._next_period = self.offset.rollback(self._origin)
+            self._next_period = self._period_start(first_timestamp)
+            self._pending = chunk
+        elif chunk.index[0] <= self._pending.index[-1]:
+            raise ValueError('Chunks must be added in time order, with each chunk starting after the last timestamp '
+                             'of the previous one.')
+        else:
+            self._pending = pd.concat([self._pending, chunk])
+        if self.data_resolution is None and len(self._pending) > 1:
+            self.data_resolution = _get_data_resolution(self._pending.index)
+        if self.data_resolution is None:
+            return self._average(pd.DatetimeIndex([]))
+        open_period = self._period_start(self._pending.index[-1])
+        return self._average(pd.date_range(self._next_period, open_period, freq=self.offset)[:-1])
+
+    def flush(self):
+        """
+        Return the remaining periods, including the last one which may be incomplete, and reset the averager so it can
+        be used for a new stream of data.
+
+        :return: As for add.
+        """
+        if self._pending is None:
+            return self._average(pd.DatetimeIndex([]), self._empty)
+        if self.data_resolution is None:
+            self.data_resolution = _get_data_resolution(self._pending.index)
+        last_period = self._period_start(self._pending.index[-1])
+        result = self._average(pd.date_range(self._next_period, last_period, freq=self.offset))
+        self._origin = self._next_period = self._pending = None
+        return result
+
+    def _average(self, periods, data=None):
+        """
+        Average the pending data in the given periods, which are then dropped from the pending data. If there are no
+        periods, data or the pending data is used to return empty results of the right shape.
+        """
+        if len(periods):
+            period_end = periods[-1] + self.offset
+            data = self._pending[self._pending.index < period_end]
+            self._pending = self._pending[self._pending.index >= period_end]
+            self._next_period = period_end
+        else:
+            data = (self._pending if data is None else data).iloc[:0]
+        # Periods without any data are 0 for sum and count, as in average_data_by_period, and NaN otherwise.
+        empty_value = 0 if self.aggregation_method in ('sum', 'count') else np.nan
+        if data.empty:
+            if isinstance(data, pd.DataFrame):
+                count = pd.DataFrame(0.0, index=periods, columns=data.columns)
+            else:
+                count = pd.Series(0.0, index=periods, name=data.name)
+            grouped_data = count + empty_value
+            if self.aggregation_method == 'count':
+                grouped_data = grouped_data.astype(np.int64)
+            else:
+                grouped_data = _keep_float32_dtypes(grouped_data, data)
+        else:
+            results = _average_by_period(data, self.period, [self.aggregation_method, 'count'], origin=self._origin,
+                                         data_resolution=self.data_resolution)
+            grouped_data = results[self.aggregation_method].reindex(periods, fill_value=empty_value)
+            count = results['count'].reindex(periods).fillna(0)
+        if len(periods):
+            coverage = count.divide(_max_coverage_count(None, periods, self.data_resolution), axis=0)
+        else:
+            coverage = count.astype(float)
+        return _filter_by_coverage(grouped_data, coverage, self.filter_by_coverage_threshold, self.coverage_threshold,
+                                   self.return_coverage)
+
+
+_PYRAMID_STATISTICS = ('mean', 'sum', 'count', 'std')
+
+
+class TimePyramid:
+    """
+    The sums, counts and sums of squared deviations from the mean of data averaged to a set of periods, by default
+    1H, 1D and 1MS, with each level built from the one below, e.g. the daily sums from the hourly sums. The squared
+    deviations of the periods below are combined as in Chan's parallel variance algorithm, so the std keeps its
+    precision when the mean is large relative to the spread, e.g. for air pressure. Averaging the data to one of these
+    periods, e.g. for its monthly means and coverage, is then a lookup rather than resampling all the data again. Only
+    the aggregates are kept, not the data, and levels shorter than the resolution of the data are left out.
+
+    Building the pyramid costs a few resamples of the data, so it pays off when the same data is averaged again and
+    again, e.g. by sending it as the pyramid argument of coverage, monthly_means and momm.
+
+    :param data: Data with a DatetimeIndex and float columns, e.g. 10-minute wind speeds.
+    :type data: pandas.Series or pandas.DataFrame
+    :param levels: The averaging periods, shortest first. Each must be made up of whole periods of the one before.
+    :type levels: list or tuple
+
+    **Example usage**
+    ::
+        import brightwind as bw
+        data = bw.load_csv(bw.datasets.demo_data)
+        pyramid = bw.TimePyramid(data)
+        monthly_means, monthly_coverage = pyramid.average('1MS', return_coverage=True)
+        daily_std = pyramid.average('1D', aggregation_method='std')
+
+    """
+    def __init__(self, data, levels=('1H', '1D', '1MS')):
+        from pandas.tseries.frequencies import to_offset
+        from pandas.tseries.offsets import Tick, MonthBegin, QuarterBegin, YearBegin
+        self._template = data.iloc[:0]
+        self.data_resolution = _get_data_resolution(data.index)
+        frame = data.to_frame() if isinstance(data, pd.Series) else data
+        frame = frame.astype(np.float64)
+        self._levels = []
+        lower = None
+        for period in levels:
+            offset = to_offset(_normalise_averaging_period(period))
+            if isinstance(offset, Tick) and offset.delta < self.data_resolution:
+                continue
+            if lower is None:
+                results = _average_by_period(frame, offset, ['sum', 'count', 'std'])
+                counts = results['count'].astype(np.float64)
+                level = pd.concat([results['sum'], counts, (results['std'] ** 2 * (counts - 1)).fillna(0)], axis=1,
+                                  keys=['sum', 'count', 'm2'])
+            else:
+                lower_offset = self._levels[-1][0]
+                if isinstance(offset, Tick):
+                    nests = isinstance(lower_offset, Tick) and offset.nanos % lower_offset.nanos == 0
+                elif isinstance(lower_offset, Tick):
+                    nests = pd.Timedelta('1D').value % lower_offset.nanos == 0
+                else:
+                    nests = isinstance(lower_offset, MonthBegin) and lower_offset.n == 1 and \
+                        isinstance(offset, (MonthBegin, QuarterBegin, YearBegin))
+                if not nests:
+                    raise ValueError('The {0} level of the pyramid is not made up of whole periods of the {1} level.'
+                                     .format(period, lower_offset.freqstr))
+                level = self._combine(lower, offset)
+            self._levels.append((offset, level))
+            lower = level
+
+    @staticmethod
+    def _combine(lower, offset):
+        """
+        Returns the sums, counts and squared deviations of the periods of offset from those of the level below.
+        """
+        sums = _average_by_period(lower[['sum', 'count']], offset, ['sum'])['sum']
+        # The mean of each period is spread back over the periods below it, which start on or after it.
+        means = (sums['sum'] / sums['count']).reindex(lower.index, method='ffill')
+        lower_means = lower['sum'] / lower['count']
+        deviations = (lower['count'] * (lower_means - means) ** 2).fillna(0) + lower['m2']
+        m2 = _average_by_period(deviations, offset, ['sum'])['sum']
+        return pd.concat([sums['sum'], sums['count'], m2], axis=1, keys=['sum', 'count', 'm2'])
+
+    def has_level(self, period):
+        """
+        Returns True if the pyramid has the averaging period, e.g. '1D' or '1M'.
+        """
+        return self._level(period) is not None
+
+    def _level(self, period):
+        from pandas.tseries.frequencies import to_offset
+        offset = to_offset(_normalise_averaging_period(period))
+        for level_offset, level in self._levels:
+            if level_offset == offset:
+                return level
+        return None
+
+    def average(self, period, aggregation_method='mean', filter_by_coverage_threshold=False, coverage_threshold=1,
+                return_coverage=False, start=None, end=None):
+        """
+        Returns the data averaged by period as average_data_by_period does, to within floating point rounding.
+
+        :param period: One of the periods of the pyramid, e.g. '1D' or '1M'.
+        :type period: str or pandas.DateOffset
+        :param aggregation_method: 'mean', 'sum', 'count' or 'std'.
+        :type aggregation_method: str
+        :param filter_by_coverage_threshold: As for average_data_by_period.
+        :type filter_by_coverage_threshold: bool
+        :param coverage_threshold: As for average_data_by_period.
+        :type coverage_threshold: float
+        :param return_coverage: As for average_data_by_period.
+        :type return_coverage: bool
+        :param start: Optional, only return the periods from the one containing start on.
+        :type start: pandas.Timestamp or None
+        :param end: Optional, only return the periods up to the one containing end.
+        :type end: pandas.Timestamp or None
+        :return: As for average_data_by_period.
+        """
+        level = self._level(period)
+        if level is None:
+            raise ValueError("The pyramid doesn't have a {0} level, the levels are {1}.".format(
+                period, [level_offset.freqstr for level_offset, _ in self._levels]))
+        if aggregation_method not in _PYRAMID_STATISTICS:
+            raise ValueError("aggregation_method must be one of {0}.".format(_PYRAMID_STATISTICS))
+        first = 0 if start is None else max(level.index.searchsorted(start, side='right') - 1, 0)
+        last = len(level) if end is None else level.index.searchsorted(end, side='right')
+        level = level.iloc[first:last]
+        sums, counts = level['sum'], level['count']
+        if aggregation_method == 'mean':
+            result = sums / counts
+        elif aggregation_method == 'sum':
+            result = sums
+        elif aggregation_method == 'count':
+            result = counts.astype(np.int64)
+        else:
+            result = np.sqrt(level['m2'] / (counts - 1)).where(counts > 1)
+        coverage = counts.divide(_max_coverage_count(None, level.index, self.data_resolution), axis=0)
+        if isinstance(self._template, pd.Series):
+            result = result.iloc[:, 0].rename(self._template.name)
+            coverage = coverage.iloc[:, 0].rename(self._template.name)
+        else:
+            result.columns = coverage.columns = self._template.columns
+        if aggregation_method != 'count':
+            result = _keep_float32_dtypes(result, self._template)
+        return _filter_by_coverage(result, coverage, filter_by_coverage_threshold, coverage_threshold,
+                                   return_coverage)
+
+
+def _pyramid_average(data, period, aggregation_method='mean', filter_by_coverage_threshold=False,
+                     coverage_threshold=1, return_coverage=False, pyramid=None):
+    """
+    average_data_by_period of data, looked up in pyramid, a TimePyramid of the same data, if one is sent and it has
+    the period and aggregation method, and resampled otherwise.
+    """
+    kwargs = dict(aggregation_method=aggregation_method, filter_by_coverage_threshold=filter_by_coverage_threshold,
+                  coverage_threshold=coverage_threshold, return_coverage=return_coverage)
+    if pyramid is not None and aggregation_method in _PYRAMID_STATISTICS and pyramid.has_level(period):
+        return pyramid.average(period, **kwargs)
+    return average_data_by_period(data, period, **kwargs)
+
+
 def adjust_slope_offset(wspd, current_slope, current_offset, new_slope, new_offset):
     """
     Adjust a wind speed that already has a slope and offset applied with a new slope and offset.
@@ -204,6 +755,107 @@ def adjust_slope_offset(wspd, current_slope, current_offset, new_slope, new_offs
         raise error
 
 
+_CALIBRATION_COLUMNS = ['channel', 'valid_from', 'valid_to', 'current_slope', 'current_offset', 'new_slope',
+                        'new_offset']
+
+
+def _calibration_table(calibrations):
+    """
+    Returns the calibrations as a dataframe with the columns of _CALIBRATION_COLUMNS, with the validity periods as
+    timestamps, NaT for open ended, sorted by channel and valid_from. Raises an error if a slope or offset isn't a
+    number, a current slope is 0 or the validity periods of a channel overlap.
+    """
+    table = calibrations if isinstance(calibrations, pd.DataFrame) else pd.DataFrame(calibrations)
+    missing = [column for column in _CALIBRATION_COLUMNS if column not in table.columns]
+    if missing:
+        raise ValueError('The calibrations are missing the columns {0}.'.format(missing))
+    table = table[_CALIBRATION_COLUMNS].copy()
+    for column in _CALIBRATION_COLUMNS[3:]:
+        if not pd.api.types.is_numeric_dtype(table[column]) or pd.api.types.is_bool_dtype(table[column]):
+            raise TypeError("some values in the calibrations column '" + column + "' are not of data type number")
+    if (table['current_slope'] == 0).any():
+        raise ValueError('A current_slope of 0 can not be reversed.')
+    for column in ['valid_from', 'valid_to']:
+        table[column] = pd.to_datetime(table[column])
+    table = table.sort_values(['channel', 'valid_from'], na_position='first', kind='stable').reset_index(drop=True)
+    if (table['valid_to'] <= table['valid_from']).any():
+        raise ValueError('Each calibration must be valid_to a timestamp after its valid_from.')
+    # Sorted by valid_from, the periods of a channel overlap if one starts before the one preceding it ends.
+    same_channel = table['channel'].eq(table['channel'].shift())
+    previous_to = table['valid_to'].shift()
+    overlaps = same_channel & (previous_to.isna() | table['valid_from'].isna() | (table['valid_from'] < previous_to))
+    if overlaps.any():
+        raise ValueError('The calibrations of {0} have overlapping validity periods.'.format(
+            list(table.loc[overlaps, 'channel'].unique())))
+    return table
+
+
+def apply_calibrations(data, calibrations):
+    """
+    Adjust the wind speeds of many channels, each with one or more calibrations valid for different periods, from
+    their current slope and offset to a new slope and offset as adjust_slope_offset does. The whole table of
+    calibrations is applied in one pass over the data so it suits re-calibrating every anemometer on a mast, or each
+    chunk of a streamed load, see load_campbell_scientific.
+
+    :param data: Timeseries data with a DatetimeIndex and the channels as columns.
+    :type data: pandas.DataFrame or pandas.Series
+    :param calibrations: The table of calibrations with the columns 'channel', 'valid_from', 'valid_to',
+           'current_slope', 'current_offset', 'new_slope' and 'new_offset', one row per calibration period of a
+           channel. Each calibration applies from valid_from up to, but not including, valid_to. Either can be None
+           to leave that end of the period open. The periods of a channel must not overlap. Anything which can be
+           made into a DataFrame, e.g. a list of dicts, can be sent.
+    :type calibrations: pandas.DataFrame or list
+    :return: A copy of data with the calibrations applied. Data outside the validity periods is left as it is.
+    :rtype: pandas.DataFrame or pandas.Series
+
+    **Example usage**
+    ::
+        import brightwind as bw
+        df = bw.load_campbell_scientific(bw.datasets.demo_site_data)
+        calibrations = [
+            {'channel': 'Spd80mS', 'valid_from': None, 'valid_to': '2016-06-01', 'current_slope': 0.044,
+             'current_offset': 0.235, 'new_slope': 0.04365, 'new_offset': 0.236},
+            {'channel': 'Spd80mS', 'valid_from': '2016-06-01', 'valid_to': None, 'current_slope': 0.044,
+             'current_offset': 0.235, 'new_slope': 0.04371, 'new_offset': 0.238},
+            {'channel': 'Spd60mS', 'valid_from': None, 'valid_to': None, 'current_slope': 0.046,
+             'current_offset': 0.25, 'new_slope': 0.04574, 'new_offset': 0.228}]
+        df_adj = bw.apply_calibrations(df, calibrations)
+
+    """
+    table = _calibration_table(calibrations)
+    if isinstance(data, pd.Series):
+        return apply_calibrations(data.to_frame(), table[table['channel'] == data.name])[data.name]
+    channels = list(table['channel'].unique())
+    missing = [channel for channel in channels if channel not in data.columns]
+    if missing:
+        raise ValueError('The channels {0} are not in the data.'.format(missing))
+    if any(data[channel].dtype == object for channel in channels):
+        raise TypeError('some values in the DataFrame are not of data type number')
+    values = data[channels].to_numpy(dtype=np.float64, copy=True)
+    columns = table['channel'].map({channel: column for column, channel in enumerate(channels)})
+    sorted_index = data.index.is_monotonic_increasing
+    for column, valid_from, valid_to, current_slope, current_offset, new_slope, new_offset in zip(
+            columns, *(table[name] for name in _CALIBRATION_COLUMNS[1:])):
+        if sorted_index:
+            rows = slice(0 if pd.isna(valid_from) else data.index.searchsorted(valid_from),
+                         len(data) if pd.isna(valid_to) else data.index.searchsorted(valid_to))
+        else:
+            rows = np.ones(len(data), dtype=bool)
+            if not pd.isna(valid_from):
+                rows &= data.index >= valid_from
+            if not pd.isna(valid_to):
+                rows &= data.index < valid_to
+        values[rows, column] = new_slope * ((values[rows, column] - current_offset) / current_slope) + new_offset
+    calibrated = {channel: values[:, column].astype(data[channel].dtype, copy=False)
+                  if pd.api.types.is_float_dtype(data[channel]) else values[:, column]
+                  for column, channel in enumerate(channels)}
+    # Built in one go, as setting the columns of a copy of data one by one splits up its blocks.
+    adjusted = pd.DataFrame({column: calibrated[column] if column in calibrated else data[column]
+                             for column in data.columns}, index=data.index, columns=data.columns)
+    adjusted.attrs = dict(data.attrs)
+    return adjusted
+
+
 def scale_wind_speed(spd, scale_factor: float) -> pd.Series:
     """
     Scales wind speed by the scale_factor
@@ -222,49 +874,58 @@ def offset_wind_direction(wdir, offset: float) -> pd.Series:
     :param offset: Offset in degrees can be negative or positive
     :return: Series or data frame with offsetted directions
     """
-    if isinstance(wdir, float):
-        return utils._range_0_to_360(wdir + offset)
-    elif isinstance(wdir, pd.DataFrame):
-        return wdir.add(offset).applymap(utils._range_0_to_360)
-    else:
-        return wdir.to_frame().add(offset).applymap(utils._range_0_to_360)
-
-
-# def selective_avg(wspd1, wspd2, wdir, boom_dir1, boom_dir2, angular_span):
-
-#     df = pd.Series()
-#     angular_span = angular_span/2
-#     boom1_lower = (boom_dir1 - angular_span +360)%360
-#     boom1_higher = (boom_dir1 + angular_span +360)%360
-#     boom2_lower = (boom_dir2 - angular_span+360)%360
-#     boom2_higher = (boom_dir2 + angular_span +360)%360
-
-#     for i, row in wspd1.iteritems():
-#         if wdir[i] >= boom1_lower and wdir[i]<= boom1_higher:
-#             if np.isnan(row) == True:
-#                 df[i] = wspd2[i]
-#             else:
-#                 df[i] = row
-#         elif wdir[i] >= boom2_lower and wdir[i]<=boom2_higher:
-#             if np.isnan(wspd2[i])==True:
-#                 df[i] = row
-#             else:
-#                 df[i] = wspd2[i]
-#         else:
-#             if np.isnan(row) == True:
-#                 df[i] = wspd2[i]
-#             elif np.isnan(wspd2[i])==True:
-#                 df[i] = row
-#             else:
-#                 df[i] = (row +wspd2[i])/2
-
-#     return df
-
-
-# Clean_synth['Spd_120m_SelAvg'] = selective_avg(Clean_synth.Vaisala_120_avg,
-#                                                Clean_synth.FirstClass_120_avg_Synthesized,
-#                                                Clean_synth.FirstClass_120_dir,
-#                                                boom_dir1=135, boom_dir2=315, angular_span=60)
+    if isinstance(wdir, pd.Series):
+        return utils._offset_direction(wdir.to_frame(), offset)
+    return utils._offset_direction(wdir, offset)
+
+
+def selective_avg(wspds, wdir, boom_dirs, exclusion_span=60):
+    """
+    Combines the wind speeds of redundant anemometers at the same height, leaving out the ones in the wake of the
+    mast. An anemometer is in the wake of the mast when the wind direction is within half of its exclusion span of
+    the direction opposite its boom, e.g. within 150 to 210 degrees for a boom at 0 degrees with an exclusion span of
+    60 degrees. For each timestamp the wind speeds of the anemometers that aren't in the wake are averaged. If all of
+    those are NaN, or the direction is NaN, the average of the anemometers that do have data is used instead.
+
+    For two anemometers on opposite booms this picks the one upwind of the mast when the wind blows along the booms
+    and averages both otherwise.
+
+    :param wspds: Wind speeds of the anemometers, one column per anemometer, or a list of Series.
+    :type wspds: pandas.DataFrame or list
+    :param wdir: Wind direction in degrees, with the same index as the wind speeds.
+    :type wdir: pandas.Series
+    :param boom_dirs: Orientation of the boom of each anemometer in degrees, in the order of wspds.
+    :type boom_dirs: list
+    :param exclusion_span: Width in degrees of the wake of the mast, centred on the direction opposite each boom.
+           Either one span for all anemometers or a list with a span for each.
+    :type exclusion_span: float or list
+    :return: Selectively averaged wind speed.
+    :rtype: pandas.Series
+
+    **Example usage**
+    ::
+        import brightwind as bw
+        data = bw.load_csv(bw.datasets.demo_data)
+        sel_avg = bw.selective_avg(data[['Spd80mN', 'Spd80mS']], data['Dir78mS'], boom_dirs=[0, 180],
+                                   exclusion_span=60)
+
+    """
+    speeds = pd.concat(wspds, axis=1) if isinstance(wspds, (list, tuple)) else wspds
+    boom_dirs = np.asarray(boom_dirs, dtype=np.float64)
+    if speeds.shape[1] != len(boom_dirs):
+        raise ValueError('A boom direction is needed for each of the {0} anemometers.'.format(speeds.shape[1]))
+    exclusion_span = np.broadcast_to(np.asarray(exclusion_span, dtype=np.float64), boom_dirs.shape)
+    values = speeds.to_numpy(dtype=np.float64)
+    direction = wdir.reindex(speeds.index).to_numpy(dtype=np.float64)[:, np.newaxis]
+
+    # Angle between the wind direction and the boom, where 180 is the wind blowing straight through the mast onto it.
+    waked = np.abs(np.mod(direction - boom_dirs, 360) - 180) <= exclusion_span / 2
+    has_data = ~np.isnan(values)
+    selected = has_data & ~waked
+    selected |= has_data & ~selected.any(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore'):
+        averaged = np.where(selected, values, 0).sum(axis=1) / selected.sum(axis=1)
+    return pd.Series(averaged, index=speeds.index)
 
 
 def _preprocess_data_for_correlations(ref: pd.DataFrame, target: pd.DataFrame, averaging_prd, coverage_threshold,
@@ -285,7 +946,8 @@ def _preprocess_data_for_correlations(ref: pd.DataFrame, target: pd.DataFrame, a
             ref_overlap = average_data_by_period(ref_overlap, to_offset(target_resolution),
                                                  filter_by_coverage_threshold=True, coverage_threshold=1,
                                                  aggregation_method=aggregation_method_ref)
-        common_idxs, data_pts = _common_idxs(ref_overlap, target_overlap)
+        # Averaging a DataFrame leaves the periods below the coverage threshold as NaN rather than dropping them.
+        common_idxs, data_pts = _common_idxs(ref_overlap.dropna(), target_overlap.dropna())
         ref_overlap = ref_overlap.loc[common_idxs]
         target_overlap = target_overlap.loc[common_idxs]
 
@@ -311,14 +973,17 @@ def _preprocess_data_for_correlations(ref: pd.DataFrame, target: pd.DataFrame, a
 
 def _preprocess_dir_data_for_correlations(ref_spd: pd.DataFrame, ref_dir: pd.DataFrame, target_spd: pd.DataFrame,
                                           target_dir: pd.DataFrame, averaging_prd, coverage_threshold):
-    ref_N, ref_E= _compute_wind_vector(ref_spd.sort_index().dropna(), ref_dir.sort_index().dropna().map(math.radians))
-    target_N, target_E = _compute_wind_vector(target_spd.sort_index().dropna(),
-                                              target_dir.sort_index().dropna().map(math.radians))
-    ref_N_avgd, target_N_avgd = _preprocess_data_for_correlations(ref_N, target_N, averaging_prd=averaging_prd,
-                                                                  coverage_threshold=coverage_threshold)
-    ref_E_avgd, target_E_avgd = _preprocess_data_for_correlations(ref_E, target_E, averaging_prd=averaging_prd,
-                                                                  coverage_threshold=coverage_threshold)
-    ref_dir_avgd = np.arctan2(ref_E_avgd, ref_N_avgd).map(math.degrees).map(utils._range_0_to_360)
-    target_dir_avgd = np.arctan2(target_E_avgd, target_N_avgd).map(math.degrees).map(utils._range_0_to_360)
-
-    return round(ref_dir_avgd.loc[:]), round(target_dir_avgd.loc[:])
+    ref_N, ref_E = utils._direction_to_vector(ref_dir.sort_index().dropna(), ref_spd.sort_index().dropna())
+    target_N, target_E = utils._direction_to_vector(target_dir.sort_index().dropna(), target_spd.sort_index().dropna())
+    # The north and east components are averaged together, as for the 'vector_mean' aggregation_method, so the data
+    # is only preprocessed once. They are kept as components through both averaging steps so the speed weighting is
+    # exact when the reference and target are first averaged to a common resolution.
+    ref_avgd, target_avgd = _preprocess_data_for_correlations(pd.concat([ref_N, ref_E], axis=1, keys=['N', 'E']),
+                                                              pd.concat([target_N, target_E], axis=1, keys=['N', 'E']),
+                                                              averaging_prd=averaging_prd,
+                                                              coverage_threshold=coverage_threshold)
+    ref_dir_avgd = utils._vector_to_direction(ref_avgd['N'], ref_avgd['E'])
+    target_dir_avgd = utils._vector_to_direction(target_avgd['N'], target_avgd['E'])
+    # Periods below the coverage threshold are left as NaN rather than dropped when averaging a DataFrame.
+    concurrent = ref_dir_avgd.notna() & target_dir_avgd.notna()
+    return round(ref_dir_avgd[concurrent]), round(target_dir_avgd[concurrent])
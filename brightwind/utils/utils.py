@@ -18,12 +18,47 @@ import numpy as np
 
 
 def _range_0_to_360(direction):
-    if direction < 0:
-        return direction+360
-    elif direction > 360:
-        return direction % 360
-    else:
-        return direction
+    """
+    Wraps a direction, or a Series, DataFrame or array of directions, into the range 0 to 360 degrees, e.g. -370 to
+    350 and 725 to 5. A direction of 360 is left as 360.
+    """
+    return np.mod(direction, 360) + 360 * (direction == 360)
+
+
+def _offset_direction(direction, offset):
+    """
+    Adds an offset in degrees to a direction, or a Series, DataFrame or array of directions, keeping the result
+    between 0 and 360.
+    """
+    return _range_0_to_360(direction + offset)
+
+
+def _direction_difference(direction, reference_direction):
+    """
+    Returns the angle from reference_direction to direction, i.e. the veer, in the range -180 to 180 degrees. Works on
+    single values, Series, DataFrames and arrays of directions between 0 and 360.
+    """
+    difference = direction - reference_direction
+    return difference - 360 * (difference > 180) + 360 * (difference < -180)
+
+
+def _direction_to_vector(direction, speed=1):
+    """
+    Decomposes directions in degrees, optionally with speeds, into their north and east components.
+
+    :param direction: Directions in degrees as a single value, Series, DataFrame or array.
+    :param speed: Speeds to scale the unit vectors by, 1 by default.
+    :return: Tuple of the north and east components, of the same type as the inputs.
+    """
+    radians = np.deg2rad(direction)
+    return speed * np.cos(radians), speed * np.sin(radians)
+
+
+def _vector_to_direction(north, east):
+    """
+    Recomposes the north and east components of vectors into directions between 0 and 360 degrees.
+    """
+    return _range_0_to_360(np.rad2deg(np.arctan2(east, north)))
 
 
 def get_direction_bin_array(sectors):